@@ -0,0 +1,195 @@
+"""benchmark_inventario.py
+Mide el tiempo de las operaciones básicas del inventario con datos sintéticos.
+
+Para cada tamaño se genera un archivo con productos sintéticos y se mide, en
+segundos por operación, agregar_producto, buscar_por_id, buscar_por_nombre,
+el guardado del archivo completo y su carga. Este inventario no tiene métodos
+públicos para guardar y cargar: con la configuración por defecto (la de
+main.py) cada cambio reescribe el archivo completo y la carga ocurre al crear
+el Inventario, así que esas dos mediciones recorren esos caminos públicos.
+
+Con ``--json`` los resultados se guardan en un archivo, y con ``--linea-base``
+se comparan con los de un archivo guardado antes: las mediciones que empeoran
+más que ``--tolerancia`` se marcan como regresión y el programa termina con
+código 1.
+
+Uso:
+    python benchmark_inventario.py --productos 1000 10000 100000 1000000
+    python benchmark_inventario.py --json base.json
+    python benchmark_inventario.py --linea-base base.json --tolerancia 0.3
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+from inventario import Inventario
+from producto import Producto
+
+
+OPERACIONES_POR_MEDICION = 1000
+BUSQUEDAS_POR_NOMBRE = 20
+REPETICIONES = 5
+
+
+def medir(funcion, operaciones, repeticiones=REPETICIONES):
+    """Devuelve los segundos por operación de ``funcion``, que hace ``operaciones``.
+
+    Se toma la mejor de varias repeticiones para reducir el ruido.
+    """
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        transcurrido = time.perf_counter() - inicio
+        if mejor is None or transcurrido < mejor:
+            mejor = transcurrido
+    return mejor / operaciones
+
+
+def escribir_inventario_sintetico(ruta, cantidad):
+    """Escribe un archivo de inventario con ``cantidad`` productos sintéticos."""
+    datos = [
+        {
+            "id": i,
+            "nombre": f"Producto {i:07d}",
+            "cantidad": i % 500,
+            "precio": round(1 + (i % 1000) * 0.25, 2),
+        }
+        for i in range(1, cantidad + 1)
+    ]
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(datos, archivo, indent=4, ensure_ascii=False)
+
+
+def medir_operaciones(productos):
+    """Mide las operaciones básicas con un inventario de ``productos`` productos."""
+    aleatorio = random.Random(productos)
+    ids = [aleatorio.randint(1, productos) for _ in range(OPERACIONES_POR_MEDICION)]
+    nombres = [f"{aleatorio.randrange(productos):07d}" for _ in range(BUSQUEDAS_POR_NOMBRE)]
+    # Con inventarios grandes guardar y cargar tardan segundos: basta una medición.
+    repeticiones_archivo = 3 if productos <= 100_000 else 1
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "inventario.txt")
+        escribir_inventario_sintetico(ruta, productos)
+
+        # Sin fsync se mide el código y no el disco.
+        def cargar():
+            return Inventario(ruta, ventana_fsync_ms=None)
+
+        resultados = {"cargar_desde_archivo": medir(cargar, 1, repeticiones_archivo)}
+
+        # Con la configuración por defecto cada actualización reescribe el
+        # archivo completo: es el guardado que hace la aplicación.
+        inventario = cargar()
+        cantidades = [0]
+
+        def guardar():
+            cantidades[0] += 1
+            inventario.actualizar_producto(1, nueva_cantidad=cantidades[0])
+
+        resultados["guardar_en_archivo"] = medir(guardar, 1, repeticiones_archivo)
+        inventario.cerrar()
+
+        # En modo diario cada alta anexa una línea en vez de reescribir todo
+        # el archivo.
+        inventario = Inventario(
+            ruta,
+            modo_diario=True,
+            umbral_compactacion=10**9,
+            ventana_fsync_ms=None,
+        )
+        siguiente_id = [productos + 1]
+
+        def agregar():
+            for _ in range(OPERACIONES_POR_MEDICION):
+                inventario.agregar_producto(Producto(siguiente_id[0], "Producto nuevo", 1, 1.5))
+                siguiente_id[0] += 1
+
+        resultados["agregar_producto"] = medir(agregar, OPERACIONES_POR_MEDICION)
+        resultados["buscar_por_id"] = medir(
+            lambda: [inventario.buscar_por_id(producto_id) for producto_id in ids],
+            OPERACIONES_POR_MEDICION,
+        )
+        resultados["buscar_por_nombre"] = medir(
+            lambda: [inventario.buscar_por_nombre(nombre) for nombre in nombres],
+            BUSQUEDAS_POR_NOMBRE,
+        )
+        inventario.cerrar()
+
+    print("\n" + "=" * 60)
+    print(f"Operaciones básicas ({productos} productos)")
+    print("=" * 60)
+    for nombre, segundos in resultados.items():
+        print(f"{nombre:<40} {segundos * 1e6:>12.2f} µs/op")
+    return resultados
+
+
+def comparar_con_linea_base(informe, linea_base, tolerancia):
+    """Compara un informe con una línea base y devuelve las regresiones encontradas.
+
+    Una medición es una regresión si tarda más que la de la línea base
+    multiplicada por ``1 + tolerancia``.
+    """
+    regresiones = []
+    print("\n" + "=" * 60)
+    print(f"Comparación con la línea base (tolerancia {tolerancia:.0%})")
+    print("=" * 60)
+    for productos, resultados in informe["resultados"].items():
+        referencia = linea_base["resultados"].get(productos, {})
+        for nombre, segundos in resultados.items():
+            if not referencia.get(nombre):
+                continue
+            relacion = segundos / referencia[nombre]
+            empeora = relacion > 1 + tolerancia
+            marca = "REGRESIÓN" if empeora else "ok"
+            print(f"{productos + ' ' + nombre:<48} x{relacion:>6.2f}  {marca}")
+            if empeora:
+                regresiones.append(f"{nombre} con {productos} productos: x{relacion:.2f}")
+    return regresiones
+
+
+def main():
+    """Ejecuta las mediciones según los argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Benchmark del inventario")
+    parser.add_argument("--productos", type=int, nargs="+", default=[100_000],
+                        help="Número(s) de productos sintéticos, p. ej. 1000 100000 1000000")
+    parser.add_argument("--json", metavar="RUTA",
+                        help="Guarda los resultados en un archivo JSON")
+    parser.add_argument("--linea-base", metavar="RUTA",
+                        help="Archivo guardado con --json contra el que buscar regresiones")
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="Empeoramiento relativo admitido frente a la línea base")
+    argumentos = parser.parse_args()
+
+    informe = {
+        "escenario": "crud",
+        "python": platform.python_version(),
+        "resultados": {
+            str(productos): medir_operaciones(productos) for productos in argumentos.productos
+        },
+    }
+    if argumentos.json:
+        with open(argumentos.json, "w", encoding="utf-8") as archivo:
+            json.dump(informe, archivo, indent=4)
+        print(f"\nResultados guardados en {argumentos.json}")
+    if argumentos.linea_base:
+        with open(argumentos.linea_base, "r", encoding="utf-8") as archivo:
+            linea_base = json.load(archivo)
+        regresiones = comparar_con_linea_base(informe, linea_base, argumentos.tolerancia)
+        if regresiones:
+            print(f"\n{len(regresiones)} regresión(es) frente a la línea base:")
+            for regresion in regresiones:
+                print(f"  - {regresion}")
+            sys.exit(1)
+        print("\nSin regresiones frente a la línea base.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""bloqueo_archivo.py
+Define la clase BloqueoArchivo para coordinar varios procesos sobre un mismo archivo.
+"""
+
+import errno
+
+try:
+    import fcntl
+except ImportError:  # Windows no tiene fcntl; se usa msvcrt.
+    fcntl = None
+    import msvcrt
+
+
+class BloqueoArchivo:
+    """Bloqueo exclusivo entre procesos basado en un archivo de bloqueo.
+
+    Es un bloqueo consultivo: solo excluye a los procesos que tambien lo
+    piden. Se usa con ``with`` y es reentrante dentro del mismo objeto, de
+    modo que un metodo que ya tiene el bloqueo puede llamar a otro que
+    tambien lo pide.
+    """
+
+    def __init__(self, ruta):
+        """Prepara el bloqueo sobre ``ruta`` sin adquirirlo."""
+        self._ruta = ruta
+        self._archivo = None
+        self._profundidad = 0
+
+    def adquirido(self):
+        """Indica si este objeto tiene el bloqueo en este momento."""
+        return self._profundidad > 0
+
+    def __enter__(self):
+        """Espera hasta obtener el bloqueo exclusivo."""
+        if self._profundidad == 0:
+            archivo = open(self._ruta, "a+b")
+            try:
+                _bloquear(archivo)
+            except OSError:
+                archivo.close()
+                raise
+            self._archivo = archivo
+        self._profundidad += 1
+        return self
+
+    def __exit__(self, *excepcion):
+        """Libera el bloqueo al salir del bloque mas externo."""
+        self._profundidad -= 1
+        if self._profundidad == 0:
+            try:
+                _desbloquear(self._archivo)
+            finally:
+                self._archivo.close()
+                self._archivo = None
+
+
+def _bloquear(archivo):
+    """Bloquea el archivo de forma exclusiva, esperando si otro proceso lo tiene."""
+    if fcntl is not None:
+        fcntl.flock(archivo.fileno(), fcntl.LOCK_EX)
+        return
+    archivo.seek(0)
+    while True:
+        try:
+            # LK_LOCK reintenta durante unos segundos y luego falla; se insiste.
+            msvcrt.locking(archivo.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError as exc:
+            if exc.errno != errno.EDEADLOCK:
+                raise
+
+
+def _desbloquear(archivo):
+    """Libera el bloqueo tomado con _bloquear."""
+    if fcntl is not None:
+        fcntl.flock(archivo.fileno(), fcntl.LOCK_UN)
+        return
+    archivo.seek(0)
+    msvcrt.locking(archivo.fileno(), msvcrt.LK_UNLCK, 1)
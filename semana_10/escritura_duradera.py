@@ -0,0 +1,148 @@
+"""escritura_duradera.py
+Define la clase EscritorDuradero para escribir archivos sin riesgo de truncarlos.
+"""
+
+import os
+import threading
+import time
+
+
+class EscritorDuradero:
+    """Escribe archivos de forma atomica y agrupa las llamadas a fsync.
+
+    Cada reescritura completa se hace en un archivo temporal que luego se
+    renombra sobre el original con ``os.replace``; asi una caida durante la
+    escritura deja intacta la version anterior.
+
+    ``ventana_fsync_ms`` controla la durabilidad:
+    - ``0``: fsync en cada escritura (cada cambio queda en disco al retornar).
+    - ``> 0``: confirmacion en grupo. El archivo temporal siempre pasa por
+      fsync antes de renombrarlo, para que nunca reemplace a la copia
+      anterior con un contenido a medio escribir; lo que se agrupa es el
+      fsync del directorio (el renombrado) y el de los anexados al diario.
+      Los pendientes se confirman en la primera escritura posterior a la
+      ventana, con un temporizador al terminar la ventana y al llamar a
+      ``sincronizar()``, que ``Inventario.cerrar()`` siempre llama. Ante un
+      corte de energia se pueden perder como maximo los cambios de la
+      ultima ventana.
+    - ``None``: sin fsync. La escritura sigue siendo atomica ante la caida
+      del proceso, pero un corte de energia puede dejar el archivo vacio.
+    """
+
+    def __init__(self, ventana_fsync_ms=0):
+        """Inicializa el escritor con la ventana de confirmacion indicada."""
+        self._ventana = None if ventana_fsync_ms is None else ventana_fsync_ms / 1000
+        self._pendientes = set()
+        self._directorios_pendientes = set()
+        self._ultimo_fsync = time.monotonic()
+        self._temporizador = None
+        # Las escrituras y el temporizador (otro hilo) comparten este cerrojo.
+        self._cerrojo = threading.RLock()
+
+    def escribir_atomico(self, ruta, texto):
+        """Reemplaza el contenido de un archivo sin dejarlo nunca a medio escribir."""
+        ruta_temporal = f"{ruta}.tmp"
+        with self._cerrojo:
+            sincronizar_ahora = self._toca_sincronizar()
+            with open(ruta_temporal, "w", encoding="utf-8") as archivo:
+                archivo.write(texto)
+                archivo.flush()
+                if self._ventana is not None:
+                    # El contenido debe estar en disco antes de ser visible por su nombre.
+                    os.fsync(archivo.fileno())
+            os.replace(ruta_temporal, ruta)
+            self._tras_escribir(ruta, sincronizar_ahora, renombrado=True)
+
+    def anexar(self, ruta, texto):
+        """Agrega texto al final de un archivo."""
+        with self._cerrojo:
+            sincronizar_ahora = self._toca_sincronizar()
+            with open(ruta, "a", encoding="utf-8") as archivo:
+                archivo.write(texto)
+                archivo.flush()
+                if sincronizar_ahora:
+                    os.fsync(archivo.fileno())
+            self._tras_escribir(ruta, sincronizar_ahora, renombrado=False)
+
+    def hay_pendientes(self):
+        """Indica si hay escrituras que todavia no pasaron por fsync."""
+        with self._cerrojo:
+            return bool(self._pendientes or self._directorios_pendientes)
+
+    def sincronizar(self):
+        """Hace fsync de los archivos y directorios con escrituras pendientes."""
+        with self._cerrojo:
+            if self._temporizador is not None:
+                self._temporizador.cancel()
+                self._temporizador = None
+            for ruta in list(self._pendientes):
+                if os.path.exists(ruta):
+                    descriptor = os.open(ruta, os.O_RDWR)
+                    try:
+                        os.fsync(descriptor)
+                    finally:
+                        os.close(descriptor)
+                    self._directorios_pendientes.add(os.path.dirname(os.path.abspath(ruta)))
+                self._pendientes.discard(ruta)
+            for directorio in list(self._directorios_pendientes):
+                _sincronizar_directorio(directorio)
+                self._directorios_pendientes.discard(directorio)
+            self._ultimo_fsync = time.monotonic()
+
+    def _toca_sincronizar(self):
+        """Decide si la escritura actual debe hacer fsync de inmediato."""
+        if self._ventana is None:
+            return False
+        return time.monotonic() - self._ultimo_fsync >= self._ventana
+
+    def _tras_escribir(self, ruta, sincronizado, renombrado):
+        """Registra la escritura como confirmada o pendiente de fsync."""
+        if self._ventana is None:
+            return
+        directorio = os.path.dirname(os.path.abspath(ruta))
+        if not sincronizado:
+            if renombrado:
+                # El contenido ya paso por fsync; solo falta el renombrado.
+                self._directorios_pendientes.add(directorio)
+            else:
+                self._pendientes.add(ruta)
+            self._programar_sincronizacion()
+            return
+        if renombrado:
+            _sincronizar_directorio(directorio)
+            self._directorios_pendientes.discard(directorio)
+        self._pendientes.discard(ruta)
+        # Las escrituras pendientes de la ventana comparten este fsync.
+        self.sincronizar()
+
+    def _programar_sincronizacion(self):
+        """Arranca un temporizador que confirma los pendientes al cerrar la ventana."""
+        if self._temporizador is not None:
+            return
+        restante = max(self._ventana - (time.monotonic() - self._ultimo_fsync), 0)
+        self._temporizador = threading.Timer(restante, self._sincronizar_por_tiempo)
+        self._temporizador.daemon = True
+        self._temporizador.start()
+
+    def _sincronizar_por_tiempo(self):
+        """Confirma los pendientes desde el temporizador; un error se reintenta despues."""
+        with self._cerrojo:
+            if self._temporizador is threading.current_thread():
+                self._temporizador = None
+            try:
+                self.sincronizar()
+            except OSError:
+                # Siguen pendientes: los confirma la proxima escritura o sincronizar().
+                pass
+
+
+def _sincronizar_directorio(directorio):
+    """Hace fsync del directorio para que los renombrados tambien sean duraderos."""
+    if os.name == "nt":
+        # Windows no permite abrir directorios para fsync.
+        return
+    descriptor = os.open(directorio, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
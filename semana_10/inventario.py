@@ -2,26 +2,132 @@
 Define la clase Inventario con persistencia en archivo JSON.
 """
 
+import bisect
 import json
 import os
 import shutil
+import threading
 import time
+from contextlib import contextmanager
 
+from bloqueo_archivo import BloqueoArchivo
+from escritura_duradera import EscritorDuradero
 from producto import Producto
 
 
+MODO_SINCRONO = "sincrono"
+MODO_DIFERIDO = "diferido"
+
+
 class Inventario:
-    """Gestiona productos y sincroniza cambios con un archivo JSON."""
+    """Gestiona productos y sincroniza cambios con un archivo JSON.
+
+    Los productos se guardan en un diccionario ID -> producto, que conserva
+    el orden de alta: buscar, agregar y eliminar por ID cuestan O(1) y el
+    listado y el archivo mantienen el orden en que se agregaron. Un indice
+    ID -> posicion de alta permite devolver un producto a su lugar si falla
+    el guardado de su eliminacion.
+    Para listar por paginas se mantiene ademas una lista ordenada de IDs,
+    que se construye la primera vez que se pide una pagina.
+
+    En modo diario cada cambio se anexa como una linea JSON compacta al
+    archivo ``<ruta>.log`` en lugar de reescribir todo el inventario. El
+    diario se compacta en el archivo principal al alcanzar
+    ``umbral_compactacion`` registros y se reproduce al cargar.
+
+    Las escrituras pasan por un EscritorDuradero: el archivo principal se
+    reemplaza de forma atomica y ``ventana_fsync_ms`` permite que varios
+    cambios cercanos compartan un mismo fsync.
 
-    def __init__(self, ruta_archivo=None):
+    Con ``modo_escritura="diferido"`` los cambios solo marcan el inventario
+    como pendiente y un hilo en segundo plano los guarda como maximo cada
+    ``intervalo_escritura_ms`` o al acumular ``max_cambios_pendientes``. En
+    ese modo un error de escritura no deshace el cambio en memoria: queda
+    pendiente y se reintenta en la siguiente escritura. Hay que llamar a
+    ``cerrar()`` (o usar el inventario con ``with``) para no perder los
+    ultimos cambios. El modo sincrono, el predeterminado, guarda antes de
+    retornar y revierte el cambio si la escritura falla.
+
+    Con ``compartido=True`` varios procesos pueden usar el mismo archivo:
+    cada cambio se hace con el bloqueo ``<ruta>.lock`` tomado y, antes de
+    aplicarlo, se comprueba el sello (inodo, fecha de modificacion y tamano)
+    del archivo y del diario. Si otro proceso los modifico, se reproduce
+    solo la parte nueva del diario o, si cambio el archivo principal, se
+    vuelve a leer reutilizando los productos que no cambiaron.
+    """
+
+    def __init__(
+        self,
+        ruta_archivo=None,
+        modo_diario=False,
+        umbral_compactacion=1000,
+        ventana_fsync_ms=0,
+        modo_escritura=MODO_SINCRONO,
+        intervalo_escritura_ms=500,
+        max_cambios_pendientes=100,
+        compartido=False,
+    ):
         """Inicializa el inventario y carga datos desde el archivo."""
+        if modo_escritura not in (MODO_SINCRONO, MODO_DIFERIDO):
+            raise ValueError(f"Modo de escritura desconocido: {modo_escritura}")
+        if compartido and modo_escritura == MODO_DIFERIDO:
+            # Un cambio diferido se escribiria sin ver los de otros procesos.
+            raise ValueError("El modo compartido requiere escritura sincrona.")
         if ruta_archivo is None:
             ruta_archivo = os.path.join(os.path.dirname(__file__), "inventario.txt")
         self._ruta_archivo = ruta_archivo
-        self._productos = []
+        self._ruta_diario = f"{ruta_archivo}.log"
+        self._modo_diario = modo_diario
+        self._umbral_compactacion = umbral_compactacion
+        self._registros_diario = 0
+        self._desplazamiento_diario = 0
+        self._escritor = EscritorDuradero(ventana_fsync_ms)
+        self._indice = {}
+        self._posiciones = {}
+        self._siguiente_posicion = 0
+        self._ids_ordenados = None
         self._carga_ok = True
         self._mensaje_carga = "Inventario listo para usar."
-        self._cargar_desde_archivo()
+        # _cerrojo protege los productos y _cerrojo_escritura las escrituras
+        # al disco; si se toman ambos, primero el de escritura. En modo
+        # sincrono cada cambio se escribe dentro de _cerrojo, asi que ambos
+        # son el mismo cerrojo.
+        self._cerrojo = threading.RLock()
+        if modo_escritura == MODO_DIFERIDO:
+            self._cerrojo_escritura = threading.RLock()
+        else:
+            self._cerrojo_escritura = self._cerrojo
+        self._modo_escritura = modo_escritura
+        self._intervalo_escritura = intervalo_escritura_ms / 1000
+        self._max_cambios_pendientes = max_cambios_pendientes
+        self._registros_pendientes = []
+        self._cambios_pendientes = 0
+        self._despertar_escritor = threading.Event()
+        self._detener_escritor = threading.Event()
+        self._hilo_escritor = None
+        self._bloqueo = BloqueoArchivo(f"{ruta_archivo}.lock") if compartido else None
+        self._sello = None
+        if self._bloqueo is None:
+            self._cargar_desde_archivo()
+        else:
+            with self._bloqueo:
+                self._cargar_desde_archivo()
+                self._sello = self._leer_sello()
+        if modo_escritura == MODO_DIFERIDO:
+            self._hilo_escritor = threading.Thread(
+                target=self._bucle_escritura_diferida,
+                name="inventario-escritura-diferida",
+                daemon=True,
+            )
+            self._hilo_escritor.start()
+
+    def __enter__(self):
+        """Permite usar el inventario con la sentencia with."""
+        return self
+
+    def __exit__(self, *excepcion):
+        """Guarda los cambios pendientes al salir del bloque with."""
+        self.cerrar()
 
     def obtener_estado_carga(self):
         """Devuelve el resultado de la carga inicial del inventario."""
@@ -29,66 +135,314 @@ class Inventario:
 
     def agregar_producto(self, producto):
         """Agrega un producto si el ID es unico y guarda en archivo."""
-        if self._buscar_por_id(producto.get_id()) is not None:
-            return False, "Error: ya existe un producto con ese ID."
-        self._productos.append(producto)
-        exito, mensaje_archivo = self._guardar_en_archivo()
-        if not exito:
-            self._productos.pop()
-            return False, mensaje_archivo
+        with self._cerrojo, self._coordinar_procesos():
+            if self._buscar_por_id(producto.get_id()) is not None:
+                return False, "Error: ya existe un producto con ese ID."
+            self._indexar(producto)
+            exito, mensaje_archivo = self._persistir_cambio(
+                {"op": "agregar", "producto": producto.to_dict()}
+            )
+            if not exito:
+                self._desindexar(producto.get_id())
+                return False, mensaje_archivo
+        if self._modo_escritura == MODO_DIFERIDO:
+            return True, "Producto agregado; se guardara en segundo plano."
         return True, "Producto agregado y guardado en archivo."
 
     def eliminar_producto(self, producto_id):
         """Elimina un producto por ID y guarda en archivo."""
-        producto = self._buscar_por_id(producto_id)
-        if producto is None:
-            return False, "Error: no se encontro un producto con ese ID."
-        self._productos.remove(producto)
-        exito, mensaje_archivo = self._guardar_en_archivo()
-        if not exito:
-            self._productos.append(producto)
-            return False, mensaje_archivo
+        with self._cerrojo, self._coordinar_procesos():
+            producto = self._buscar_por_id(producto_id)
+            if producto is None:
+                return False, "Error: no se encontro un producto con ese ID."
+            posicion = self._desindexar(producto_id)
+            exito, mensaje_archivo = self._persistir_cambio({"op": "eliminar", "id": producto_id})
+            if not exito:
+                self._restaurar_en_posicion(producto, posicion)
+                return False, mensaje_archivo
+        if self._modo_escritura == MODO_DIFERIDO:
+            return True, "Producto eliminado; se guardara en segundo plano."
         return True, "Producto eliminado y archivo actualizado."
 
     def actualizar_producto(self, producto_id, nueva_cantidad=None, nuevo_precio=None):
         """Actualiza cantidad, precio o ambos de un producto por ID."""
-        producto = self._buscar_por_id(producto_id)
-        if producto is None:
-            return False, "Error: no se encontro un producto con ese ID."
-        cantidad_anterior = producto.get_cantidad()
-        precio_anterior = producto.get_precio()
-
-        if nueva_cantidad is not None:
-            producto.set_cantidad(nueva_cantidad)
-        if nuevo_precio is not None:
-            producto.set_precio(nuevo_precio)
-
-        exito, mensaje_archivo = self._guardar_en_archivo()
-        if not exito:
-            producto.set_cantidad(cantidad_anterior)
-            producto.set_precio(precio_anterior)
-            return False, mensaje_archivo
+        with self._cerrojo, self._coordinar_procesos():
+            producto = self._buscar_por_id(producto_id)
+            if producto is None:
+                return False, "Error: no se encontro un producto con ese ID."
+            cantidad_anterior = producto.get_cantidad()
+            precio_anterior = producto.get_precio()
+
+            if nueva_cantidad is not None:
+                producto.set_cantidad(nueva_cantidad)
+            if nuevo_precio is not None:
+                producto.set_precio(nuevo_precio)
+
+            exito, mensaje_archivo = self._persistir_cambio(
+                {
+                    "op": "actualizar",
+                    "id": producto_id,
+                    "cantidad": producto.get_cantidad(),
+                    "precio": producto.get_precio(),
+                }
+            )
+            if not exito:
+                producto.set_cantidad(cantidad_anterior)
+                producto.set_precio(precio_anterior)
+                return False, mensaje_archivo
+        if self._modo_escritura == MODO_DIFERIDO:
+            return True, "Producto actualizado; se guardara en segundo plano."
         return True, "Producto actualizado y archivo sincronizado."
 
+    def buscar_por_id(self, producto_id):
+        """Busca un producto por ID y lo devuelve o None si no existe."""
+        self._recargar_si_desactualizado()
+        with self._cerrojo:
+            return self._buscar_por_id(producto_id)
+
     def buscar_por_nombre(self, nombre):
         """Busca productos por nombre con coincidencia parcial e insensible a mayusculas."""
         nombre_normalizado = nombre.strip().lower()
-        return [
-            producto
-            for producto in self._productos
-            if nombre_normalizado in producto.get_nombre().lower()
-        ]
+        self._recargar_si_desactualizado()
+        with self._cerrojo:
+            return [
+                producto
+                for producto in self._indice.values()
+                if nombre_normalizado in producto.get_nombre().lower()
+            ]
 
     def mostrar_todos(self):
         """Devuelve una lista con todos los productos en el inventario."""
-        return list(self._productos)
+        self._recargar_si_desactualizado()
+        with self._cerrojo:
+            return list(self._indice.values())
+
+    def obtener_pagina(self, tamano=20, cursor=None):
+        """Devuelve una pagina de productos ordenados por ID.
+
+        Retorna ``(productos, siguiente_cursor)``. Para pedir la pagina
+        siguiente se pasa ``siguiente_cursor``, que es None en la ultima. El
+        cursor es el ultimo ID entregado, por lo que la pagina siguiente es
+        correcta aunque entre tanto se agreguen o eliminen productos.
+        """
+        if tamano <= 0:
+            raise ValueError("El tamano de pagina debe ser positivo.")
+        self._recargar_si_desactualizado()
+        with self._cerrojo:
+            if self._ids_ordenados is None:
+                self._ids_ordenados = sorted(self._indice)
+            ids = self._ids_ordenados
+            inicio = 0 if cursor is None else bisect.bisect_right(ids, cursor)
+            pagina = [self._indice[producto_id] for producto_id in ids[inicio:inicio + tamano]]
+            hay_mas = inicio + tamano < len(ids)
+        return pagina, (pagina[-1].get_id() if hay_mas else None)
+
+    def iterar_productos(self, tamano_pagina=100):
+        """Recorre los productos por ID de a una pagina, sin copiar la lista completa."""
+        cursor = None
+        while True:
+            pagina, cursor = self.obtener_pagina(tamano_pagina, cursor)
+            yield from pagina
+            if cursor is None:
+                return
+
+    def sincronizar(self):
+        """Fuerza el fsync de los cambios que esperan su ventana de confirmacion."""
+        try:
+            with self._cerrojo_escritura:
+                self._escritor.sincronizar()
+            return True, "Cambios sincronizados en disco."
+        except OSError as exc:
+            return False, f"Error inesperado al sincronizar el archivo: {exc}"
+
+    def esta_desactualizado(self):
+        """Indica si otro proceso modifico el archivo desde la ultima lectura o escritura.
+
+        Solo tiene sentido en modo compartido; en otro caso devuelve False.
+        """
+        if self._bloqueo is None:
+            return False
+        return self._leer_sello() != self._sello
+
+    def recargar_si_cambio(self):
+        """Incorpora los cambios que otros procesos hicieron en el archivo."""
+        if self._bloqueo is None:
+            return False, "El inventario no esta en modo compartido."
+        with self._cerrojo, self._bloqueo:
+            if self._leer_sello() == self._sello:
+                return True, "El inventario ya estaba actualizado."
+            self._recargar()
+            self._sello = self._leer_sello()
+            return True, "Inventario actualizado con los cambios del archivo."
+
+    def guardar_pendientes(self):
+        """Escribe de inmediato los cambios que esperan al hilo de escritura diferida."""
+        with self._cerrojo_escritura:
+            with self._cerrojo:
+                if not self._cambios_pendientes:
+                    return True, "No hay cambios pendientes."
+                registros = self._registros_pendientes
+                cambios = self._cambios_pendientes
+                self._registros_pendientes = []
+                self._cambios_pendientes = 0
+
+            if self._modo_diario:
+                exito, mensaje = self._anexar_registros(registros)
+            else:
+                exito, mensaje = self._guardar_en_archivo()
+
+            if not exito:
+                # Los cambios siguen en memoria; se reintentan en la proxima escritura.
+                with self._cerrojo:
+                    self._registros_pendientes[:0] = registros
+                    self._cambios_pendientes += cambios
+            return exito, mensaje
+
+    def cerrar(self):
+        """Detiene el hilo de escritura diferida y deja todos los cambios en disco."""
+        if self._hilo_escritor is not None:
+            self._detener_escritor.set()
+            self._despertar_escritor.set()
+            self._hilo_escritor.join()
+            self._hilo_escritor = None
+        exito, mensaje = self.guardar_pendientes()
+        if not exito:
+            return False, mensaje
+        return self.sincronizar()
+
+    def _bucle_escritura_diferida(self):
+        """Guarda los cambios pendientes cada intervalo o al llegar al maximo."""
+        while not self._detener_escritor.is_set():
+            self._despertar_escritor.wait(self._intervalo_escritura)
+            self._despertar_escritor.clear()
+            if self._detener_escritor.is_set():
+                # cerrar() hace la ultima escritura desde el hilo que lo llama.
+                return
+            self.guardar_pendientes()
+            if self._escritor.hay_pendientes():
+                self.sincronizar()
+
+    def compactar(self):
+        """Vuelca el inventario completo al archivo principal y vacia el diario."""
+        with self._cerrojo_escritura, self._coordinar_procesos():
+            with self._cerrojo:
+                # Los cambios aun no escritos ya estan en memoria y entran en
+                # el archivo principal.
+                registros = self._registros_pendientes
+                cambios = self._cambios_pendientes
+                self._registros_pendientes = []
+                self._cambios_pendientes = 0
+            exito, mensaje_archivo = self._guardar_en_archivo()
+            if not exito:
+                with self._cerrojo:
+                    self._registros_pendientes[:0] = registros
+                    self._cambios_pendientes += cambios
+                return False, mensaje_archivo
+            try:
+                # El archivo principal ya contiene todos los cambios del diario.
+                with open(self._ruta_diario, "w", encoding="utf-8"):
+                    pass
+                self._registros_diario = 0
+                self._desplazamiento_diario = 0
+                return True, "Diario compactado en el archivo de inventario."
+            except PermissionError:
+                return False, "Error: permiso denegado al vaciar el diario."
+            except OSError as exc:
+                return False, f"Error inesperado al vaciar el diario: {exc}"
+
+    @contextmanager
+    def _coordinar_procesos(self):
+        """En modo compartido, toma el bloqueo entre procesos y recarga si hace falta.
+
+        Si el bloqueo ya estaba tomado (llamada anidada) no hace nada.
+        """
+        if self._bloqueo is None or self._bloqueo.adquirido():
+            yield
+            return
+        with self._bloqueo:
+            if self._leer_sello() != self._sello:
+                self._recargar()
+            try:
+                yield
+            finally:
+                # Los cambios propios no deben verse como ajenos.
+                self._sello = self._leer_sello()
+
+    def _recargar_si_desactualizado(self):
+        """Antes de una consulta, recarga solo si el sello del archivo cambio."""
+        if self.esta_desactualizado():
+            self.recargar_si_cambio()
+
+    def _leer_sello(self):
+        """Devuelve el sello del archivo principal y del diario."""
+        return _sello_de(self._ruta_archivo), _sello_de(self._ruta_diario)
+
+    def _recargar(self):
+        """Recarga desde disco la parte que cambio: la cola del diario o todo el archivo."""
+        sello_archivo, sello_diario = self._leer_sello()
+        if (
+            self._sello is not None
+            and sello_archivo == self._sello[0]
+            and sello_diario is not None
+            and sello_diario[2] >= self._desplazamiento_diario
+        ):
+            # El archivo principal es el mismo: otro proceso solo anexo al diario.
+            self._reproducir_diario(self._desplazamiento_diario)
+        else:
+            self._cargar_desde_archivo()
 
     def _buscar_por_id(self, producto_id):
         """Busca un producto por ID y lo devuelve o None si no existe."""
-        for producto in self._productos:
-            if producto.get_id() == producto_id:
-                return producto
-        return None
+        return self._indice.get(producto_id)
+
+    def _indexar(self, producto):
+        """Agrega el producto al final y registra su posicion de alta."""
+        producto_id = producto.get_id()
+        self._posiciones[producto_id] = self._siguiente_posicion
+        self._siguiente_posicion += 1
+        self._indice[producto_id] = producto
+        self._agregar_id_ordenado(producto_id)
+
+    def _desindexar(self, producto_id):
+        """Quita un producto por ID en O(1) y devuelve su posicion de alta."""
+        posicion = self._posiciones.pop(producto_id)
+        del self._indice[producto_id]
+        if self._ids_ordenados is not None:
+            del self._ids_ordenados[bisect.bisect_left(self._ids_ordenados, producto_id)]
+        return posicion
+
+    def _restaurar_en_posicion(self, producto, posicion):
+        """Deshace un _desindexar devolviendo el producto a su posicion original."""
+        self._posiciones[producto.get_id()] = posicion
+        self._indice[producto.get_id()] = producto
+        # Solo ocurre si fallo el guardado: reordenar cuesta O(n), pero el
+        # diccionario ya esta casi en orden.
+        posiciones = self._posiciones
+        self._indice = dict(sorted(self._indice.items(), key=lambda par: posiciones[par[0]]))
+        self._agregar_id_ordenado(producto.get_id())
+
+    def _agregar_id_ordenado(self, producto_id):
+        """Inserta un ID en la lista ordenada, si ya fue construida."""
+        ids = self._ids_ordenados
+        if ids is None:
+            return
+        if not ids or producto_id > ids[-1]:
+            # Caso habitual: los IDs nuevos suelen ser mayores que los existentes.
+            ids.append(producto_id)
+        else:
+            bisect.insort(ids, producto_id)
+
+    def _reconstruir_indices(self, productos):
+        """Reemplaza los productos y reconstruye los indices en tiempo lineal."""
+        self._indice = {}
+        self._posiciones = {}
+        self._siguiente_posicion = 0
+        self._ids_ordenados = None
+        for producto in productos:
+            if producto.get_id() in self._indice:
+                # Si el archivo repite un ID prevalece la ultima aparicion.
+                self._desindexar(producto.get_id())
+            self._indexar(producto)
 
     def _cargar_desde_archivo(self):
         """Carga datos del archivo, manejando errores de lectura o formato."""
@@ -98,6 +452,7 @@ class Inventario:
                 self._escribir_datos([])
                 self._carga_ok = True
                 self._mensaje_carga = "Archivo de inventario creado." 
+                self._reproducir_diario()
                 return
 
             with open(self._ruta_archivo, "r", encoding="utf-8") as archivo:
@@ -105,36 +460,38 @@ class Inventario:
 
             if not contenido:
                 # Un archivo vacio representa un inventario sin productos.
-                self._productos = []
+                self._reconstruir_indices([])
                 self._carga_ok = True
                 self._mensaje_carga = "Archivo vacio cargado correctamente." 
+                self._reproducir_diario()
                 return
 
             datos = json.loads(contenido)
             if not isinstance(datos, list):
                 raise ValueError("El archivo no contiene una lista de productos.")
 
-            self._productos = [Producto.from_dict(item) for item in datos]
+            self._reconstruir_indices(self._reutilizar_productos(datos))
             self._carga_ok = True
             self._mensaje_carga = "Inventario cargado desde archivo." 
+            self._reproducir_diario()
 
         except FileNotFoundError:
             # Si el archivo se elimina entre la verificacion y la lectura,
             # se crea uno nuevo para continuar.
-            self._productos = []
+            self._reconstruir_indices([])
             self._carga_ok = False
             self._mensaje_carga = "Archivo no encontrado. Se creara uno nuevo."
             self._escribir_datos([])
 
         except PermissionError:
             # Falta de permisos de lectura: se informa y se mantiene inventario vacio.
-            self._productos = []
+            self._reconstruir_indices([])
             self._carga_ok = False
             self._mensaje_carga = "Permiso denegado al leer el archivo de inventario."
 
         except (json.JSONDecodeError, ValueError):
             # Un JSON invalido o estructura inesperada se considera archivo corrupto.
-            self._productos = []
+            self._reconstruir_indices([])
             self._carga_ok = False
             # Se respalda el archivo corrupto antes de reiniciar la data.
             self._respaldar_archivo_corrupto()
@@ -143,11 +500,146 @@ class Inventario:
                 "Archivo corrupto detectado. Se respaldo y se creo un nuevo archivo."
             )
 
+    def _reutilizar_productos(self, datos):
+        """Convierte los datos leidos en productos, reutilizando los ya cargados.
+
+        Al recargar, los productos que siguen en el archivo conservan su
+        objeto y solo se actualizan los atributos que cambiaron.
+        """
+        productos = []
+        for item in datos:
+            existente = self._indice.get(item["id"])
+            if existente is None:
+                productos.append(Producto.from_dict(item))
+                continue
+            if existente.get_nombre() != item["nombre"]:
+                existente.set_nombre(item["nombre"])
+            if existente.get_cantidad() != item["cantidad"]:
+                existente.set_cantidad(item["cantidad"])
+            if existente.get_precio() != item["precio"]:
+                existente.set_precio(item["precio"])
+            productos.append(existente)
+        return productos
+
+    def _reproducir_diario(self, desde=0):
+        """Aplica sobre los productos cargados los cambios del diario desde ``desde``."""
+        if not os.path.exists(self._ruta_diario):
+            self._desplazamiento_diario = 0
+            return
+        with open(self._ruta_diario, "rb") as archivo:
+            archivo.seek(desde)
+            contenido = archivo.read()
+
+        aplicados = 0
+        longitud_valida = 0
+        for linea in contenido.splitlines(keepends=True):
+            if not linea.endswith(b"\n"):
+                # Linea final incompleta: la escritura se interrumpio.
+                break
+            try:
+                registro = json.loads(linea)
+            except ValueError:
+                break
+            if not isinstance(registro, dict):
+                break
+            self._aplicar_registro(registro)
+            aplicados += 1
+            longitud_valida += len(linea)
+
+        if longitud_valida < len(contenido):
+            # Se descarta la cola danada para que los nuevos registros
+            # no queden detras de una linea invalida.
+            with open(self._ruta_diario, "r+b") as archivo:
+                archivo.truncate(desde + longitud_valida)
+
+        self._desplazamiento_diario = desde + longitud_valida
+        self._registros_diario = (self._registros_diario if desde else 0) + aplicados
+        if aplicados:
+            if not desde:
+                self._mensaje_carga += f" Se reprodujeron {aplicados} cambios del diario."
+            if not self._modo_diario or self._registros_diario >= self._umbral_compactacion:
+                # Fuera del modo diario el archivo principal debe quedar completo.
+                self.compactar()
+
+    def _aplicar_registro(self, registro):
+        """Aplica un registro del diario; reaplicar un registro no altera el resultado."""
+        operacion = registro.get("op")
+        if operacion == "agregar":
+            producto = Producto.from_dict(registro["producto"])
+            if self._buscar_por_id(producto.get_id()) is not None:
+                self._desindexar(producto.get_id())
+            self._indexar(producto)
+        elif operacion == "eliminar":
+            if self._buscar_por_id(registro["id"]) is not None:
+                self._desindexar(registro["id"])
+        elif operacion == "actualizar":
+            existente = self._buscar_por_id(registro["id"])
+            if existente is not None:
+                existente.set_cantidad(registro["cantidad"])
+                existente.set_precio(registro["precio"])
+
+    def _persistir_cambio(self, registro):
+        """Guarda un cambio en el diario o reescribe el archivo segun el modo."""
+        if self._modo_escritura == MODO_DIFERIDO:
+            if self._modo_diario:
+                self._registros_pendientes.append(registro)
+            self._cambios_pendientes += 1
+            if self._cambios_pendientes >= self._max_cambios_pendientes:
+                self._despertar_escritor.set()
+            return True, "Cambio pendiente de guardar."
+        if not self._modo_diario:
+            return self._guardar_en_archivo()
+        return self._anexar_registros([registro])
+
+    def _anexar_registros(self, registros):
+        """Anexa los registros al diario y compacta si se alcanzo el umbral."""
+        try:
+            self._desplazamiento_diario += self._anexar_al_diario(registros)
+        except FileNotFoundError:
+            return False, "Error: archivo de diario no encontrado."
+        except PermissionError:
+            return False, "Error: permiso denegado al escribir en el diario."
+        except OSError as exc:
+            return False, f"Error inesperado al escribir el diario: {exc}"
+
+        self._registros_diario += len(registros)
+        if self._registros_diario >= self._umbral_compactacion:
+            # Si la compactacion falla el cambio sigue seguro en el diario.
+            self.compactar()
+        return True, "Cambio registrado en el diario."
+
+    def _anexar_al_diario(self, registros):
+        """Anexa cada registro como una linea JSON compacta y devuelve los bytes escritos."""
+        lineas = "".join(
+            json.dumps(registro, separators=(",", ":"), ensure_ascii=True) + "\n"
+            for registro in registros
+        )
+        try:
+            self._escritor.anexar(self._ruta_diario, lineas)
+        except BaseException:
+            # Una linea a medio escribir dejaria pegado al siguiente registro.
+            self._recortar_diario()
+            raise
+        # Con ensure_ascii cada caracter ocupa un byte.
+        return len(lineas)
+
+    def _recortar_diario(self):
+        """Descarta lo escrito en el diario despues del ultimo registro completo."""
+        try:
+            if os.path.getsize(self._ruta_diario) > self._desplazamiento_diario:
+                with open(self._ruta_diario, "r+b") as archivo:
+                    archivo.truncate(self._desplazamiento_diario)
+        except OSError:
+            # Si no se puede recortar, la carga descarta la linea incompleta.
+            pass
+
     def _guardar_en_archivo(self):
         """Serializa productos y los guarda en el archivo."""
         try:
-            datos = [producto.to_dict() for producto in self._productos]
-            # Escritura atomica simple al sobrescribir el archivo completo.
+            with self._cerrojo:
+                datos = [producto.to_dict() for producto in self._indice.values()]
+            # Se escribe en un temporal y se renombra: una caida a mitad de
+            # la escritura conserva la version anterior del archivo.
             self._escribir_datos(datos)
             return True, "Archivo actualizado correctamente."
         except FileNotFoundError:
@@ -159,8 +651,9 @@ class Inventario:
 
     def _escribir_datos(self, datos):
         """Escribe la lista de datos en el archivo de inventario en formato JSON."""
-        with open(self._ruta_archivo, "w", encoding="utf-8") as archivo:
-            json.dump(datos, archivo, indent=4, ensure_ascii=True)
+        self._escritor.escribir_atomico(
+            self._ruta_archivo, json.dumps(datos, indent=4, ensure_ascii=True)
+        )
 
     def _respaldar_archivo_corrupto(self):
         """Respalda el archivo corrupto para permitir inspeccion posterior."""
@@ -172,3 +665,12 @@ class Inventario:
             shutil.copy2(self._ruta_archivo, destino)
         except (OSError, PermissionError):
             pass
+
+
+def _sello_de(ruta):
+    """Devuelve (inodo, fecha de modificacion en ns, tamano) de un archivo o None."""
+    try:
+        estado = os.stat(ruta)
+    except FileNotFoundError:
+        return None
+    return estado.st_ino, estado.st_mtime_ns, estado.st_size
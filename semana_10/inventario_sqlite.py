@@ -0,0 +1,247 @@
+"""inventario_sqlite.py
+Define la clase InventarioSQLite, un inventario guardado en una base de datos SQLite.
+"""
+
+import json
+import os
+import sqlite3
+
+from producto import Producto
+
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS productos (
+    id INTEGER PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    cantidad INTEGER NOT NULL,
+    precio REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_productos_nombre ON productos(nombre);
+"""
+
+# Indice de trigramas de FTS5 (SQLite 3.34+) para buscar subcadenas del nombre.
+_ESQUEMA_TRIGRAMAS = """
+CREATE VIRTUAL TABLE IF NOT EXISTS productos_fts USING fts5(
+    nombre, content='productos', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS fts_insertar AFTER INSERT ON productos BEGIN
+    INSERT INTO productos_fts(rowid, nombre) VALUES (NEW.id, NEW.nombre);
+END;
+CREATE TRIGGER IF NOT EXISTS fts_eliminar AFTER DELETE ON productos BEGIN
+    INSERT INTO productos_fts(productos_fts, rowid, nombre) VALUES ('delete', OLD.id, OLD.nombre);
+END;
+"""
+
+
+class InventarioSQLite:
+    """Inventario con la misma interfaz que Inventario, guardado en SQLite.
+
+    Los productos no se cargan en memoria al iniciar: cada operacion es una
+    consulta sobre la tabla ``productos``, cuya clave primaria es el ID y
+    que tiene un indice sobre el nombre. Cada cambio se confirma en su propia
+    transaccion, por lo que no hace falta reescribir ningun archivo.
+    """
+
+    def __init__(self, ruta_bd=None):
+        """Abre (o crea) la base de datos del inventario."""
+        if ruta_bd is None:
+            ruta_bd = os.path.join(os.path.dirname(__file__), "inventario.db")
+        self._carga_ok = True
+        self._mensaje_carga = "Base de datos de inventario abierta."
+        self._usa_trigramas = False
+        try:
+            self._conexion = sqlite3.connect(ruta_bd)
+            self._conexion.create_function("minusculas", 1, _minusculas, deterministic=True)
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+            # Asi INSERT OR REPLACE tambien dispara el trigger de borrado del indice.
+            self._conexion.execute("PRAGMA recursive_triggers=ON")
+            with self._conexion:
+                self._conexion.executescript(_ESQUEMA)
+        except sqlite3.Error as exc:
+            # Se sigue con una base en memoria para que el programa no se detenga.
+            self._conexion = sqlite3.connect(":memory:")
+            self._conexion.create_function("minusculas", 1, _minusculas, deterministic=True)
+            self._conexion.executescript(_ESQUEMA)
+            self._carga_ok = False
+            self._mensaje_carga = f"No se pudo abrir la base de datos: {exc}"
+        try:
+            with self._conexion:
+                self._conexion.executescript(_ESQUEMA_TRIGRAMAS)
+            self._usa_trigramas = True
+        except sqlite3.OperationalError:
+            pass
+
+    def __enter__(self):
+        """Permite usar el inventario con la sentencia with."""
+        return self
+
+    def __exit__(self, *excepcion):
+        """Cierra la base de datos al salir del bloque with."""
+        self.cerrar()
+
+    def cerrar(self):
+        """Cierra la conexion con la base de datos."""
+        self._conexion.close()
+
+    def obtener_estado_carga(self):
+        """Devuelve el resultado de abrir la base de datos."""
+        return self._carga_ok, self._mensaje_carga
+
+    def agregar_producto(self, producto):
+        """Agrega un producto si el ID es unico."""
+        try:
+            with self._conexion:
+                self._conexion.execute(
+                    "INSERT INTO productos (id, nombre, cantidad, precio) VALUES (?, ?, ?, ?)",
+                    (producto.get_id(), producto.get_nombre(),
+                     producto.get_cantidad(), producto.get_precio()),
+                )
+        except sqlite3.IntegrityError:
+            return False, "Error: ya existe un producto con ese ID."
+        except sqlite3.Error as exc:
+            return False, f"Error inesperado al guardar en la base de datos: {exc}"
+        return True, "Producto agregado y guardado en la base de datos."
+
+    def eliminar_producto(self, producto_id):
+        """Elimina un producto por ID."""
+        try:
+            with self._conexion:
+                cursor = self._conexion.execute("DELETE FROM productos WHERE id = ?", (producto_id,))
+        except sqlite3.Error as exc:
+            return False, f"Error inesperado al guardar en la base de datos: {exc}"
+        if cursor.rowcount == 0:
+            return False, "Error: no se encontro un producto con ese ID."
+        return True, "Producto eliminado de la base de datos."
+
+    def actualizar_producto(self, producto_id, nueva_cantidad=None, nuevo_precio=None):
+        """Actualiza cantidad, precio o ambos de un producto por ID."""
+        try:
+            with self._conexion:
+                cursor = self._conexion.execute(
+                    "UPDATE productos SET cantidad = coalesce(?, cantidad), "
+                    "precio = coalesce(?, precio) WHERE id = ?",
+                    (nueva_cantidad, nuevo_precio, producto_id),
+                )
+        except sqlite3.Error as exc:
+            return False, f"Error inesperado al guardar en la base de datos: {exc}"
+        if cursor.rowcount == 0:
+            return False, "Error: no se encontro un producto con ese ID."
+        return True, "Producto actualizado en la base de datos."
+
+    def reemplazar_productos(self, productos):
+        """Reemplaza todo el contenido por ``productos`` en una sola transaccion.
+
+        Si algo falla, la base queda como estaba.
+        """
+        try:
+            with self._conexion:
+                self._conexion.execute("DELETE FROM productos")
+                self._conexion.executemany(
+                    "INSERT INTO productos (id, nombre, cantidad, precio) VALUES (?, ?, ?, ?)",
+                    (
+                        (p.get_id(), p.get_nombre(), p.get_cantidad(), p.get_precio())
+                        for p in productos
+                    ),
+                )
+        except sqlite3.IntegrityError:
+            return False, "Error: hay productos con el mismo ID."
+        except sqlite3.Error as exc:
+            return False, f"Error inesperado al guardar en la base de datos: {exc}"
+        return True, "Productos reemplazados en la base de datos."
+
+    def buscar_por_id(self, producto_id):
+        """Busca un producto por ID y lo devuelve o None si no existe."""
+        fila = self._conexion.execute(
+            "SELECT id, nombre, cantidad, precio FROM productos WHERE id = ?", (producto_id,)
+        ).fetchone()
+        return Producto(*fila) if fila else None
+
+    def buscar_por_nombre(self, nombre):
+        """Busca productos por nombre con coincidencia parcial e insensible a mayusculas."""
+        nombre = nombre.strip()
+        if self._usa_trigramas and len(nombre) >= 3:
+            # La frase va entre comillas para que no se interpreten operadores.
+            consulta = (
+                "SELECT id, nombre, cantidad, precio FROM productos WHERE id IN "
+                "(SELECT rowid FROM productos_fts WHERE productos_fts MATCH ?) ORDER BY id"
+            )
+            parametros = ('"' + nombre.replace('"', '""') + '"',)
+        else:
+            consulta = (
+                "SELECT id, nombre, cantidad, precio FROM productos "
+                "WHERE instr(minusculas(nombre), ?) > 0 ORDER BY id"
+            )
+            parametros = (nombre.lower(),)
+        return [Producto(*fila) for fila in self._conexion.execute(consulta, parametros)]
+
+    def mostrar_todos(self):
+        """Devuelve una lista con todos los productos, ordenados por ID."""
+        return [
+            Producto(*fila)
+            for fila in self._conexion.execute(
+                "SELECT id, nombre, cantidad, precio FROM productos ORDER BY id"
+            )
+        ]
+
+    def obtener_pagina(self, tamano=20, cursor=None):
+        """Devuelve ``(productos, siguiente_cursor)`` igual que Inventario.obtener_pagina.
+
+        La consulta recorre la clave primaria desde el cursor, asi que cada
+        pagina cuesta lo mismo sin importar cuantas se hayan leido antes.
+        """
+        if tamano <= 0:
+            raise ValueError("El tamano de pagina debe ser positivo.")
+        filas = self._conexion.execute(
+            "SELECT id, nombre, cantidad, precio FROM productos WHERE id > ? ORDER BY id LIMIT ?",
+            (cursor if cursor is not None else -2**63, tamano + 1),
+        ).fetchall()
+        pagina = [Producto(*fila) for fila in filas[:tamano]]
+        return pagina, (pagina[-1].get_id() if len(filas) > tamano else None)
+
+    def iterar_productos(self, tamano_pagina=100):
+        """Recorre los productos por ID de a una pagina."""
+        cursor = None
+        while True:
+            pagina, cursor = self.obtener_pagina(tamano_pagina, cursor)
+            yield from pagina
+            if cursor is None:
+                return
+
+
+def _minusculas(texto):
+    """Version de lower() con soporte Unicode para usar dentro de SQLite."""
+    return texto.lower() if texto is not None else None
+
+
+def migrar_desde_json(ruta_json, ruta_bd):
+    """Copia los productos de un archivo de inventario JSON a la base de datos.
+
+    El contenido anterior de la base se reemplaza en la misma transaccion.
+    Si el archivo repite un ID prevalece la ultima aparicion, igual que al
+    cargarlo con Inventario. Devuelve la cantidad de productos migrados.
+    """
+    with open(ruta_json, "r", encoding="utf-8") as archivo:
+        contenido = archivo.read().strip()
+    datos = json.loads(contenido) if contenido else []
+    if not isinstance(datos, list):
+        raise ValueError("El archivo no contiene una lista de productos.")
+    productos = {}
+    for item in datos:
+        producto = Producto.from_dict(item)
+        productos[producto.get_id()] = producto
+
+    with InventarioSQLite(ruta_bd) as inventario:
+        exito, mensaje = inventario.reemplazar_productos(productos.values())
+    if not exito:
+        raise RuntimeError(mensaje)
+    return len(productos)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 3:
+        print("Uso: python inventario_sqlite.py inventario.txt inventario.db")
+        sys.exit(1)
+    total = migrar_desde_json(sys.argv[1], sys.argv[2])
+    print(f"{total} productos migrados a {sys.argv[2]}.")
@@ -6,6 +6,9 @@ from inventario import Inventario
 from producto import Producto
 
 
+TAMANO_PAGINA = 20
+
+
 def mostrar_menu():
     """Muestra las opciones del menu principal."""
     print("\nSistema de Gestion de Inventarios")
@@ -128,13 +131,19 @@ def ejecutar_menu():
                 print("No se encontraron productos con ese nombre.")
 
         elif opcion == "5":
-            productos = inventario.mostrar_todos()
-            if productos:
-                print("Listado de productos:")
+            productos, cursor = inventario.obtener_pagina(TAMANO_PAGINA)
+            if not productos:
+                print("El inventario esta vacio.")
+                continue
+            print("Listado de productos:")
+            while True:
                 for producto in productos:
                     imprimir_producto(producto)
-            else:
-                print("El inventario esta vacio.")
+                if cursor is None:
+                    break
+                if input("Enter para ver mas, 'q' para volver: ").strip().lower() == "q":
+                    break
+                productos, cursor = inventario.obtener_pagina(TAMANO_PAGINA, cursor)
 
         elif opcion == "6":
             print("Saliendo del sistema.")
@@ -2,11 +2,15 @@
 
 import json
 import os
+import subprocess
+import sys
 import tempfile
+import time
 import unittest
 from unittest import mock
 
 from inventario import Inventario
+from inventario_sqlite import InventarioSQLite, migrar_desde_json
 from producto import Producto
 
 
@@ -41,6 +45,8 @@ class InventarioTests(unittest.TestCase):
             productos = inventario.mostrar_todos()
             self.assertEqual(len(productos), 2)
             self.assertEqual(productos[0].get_nombre(), "Lapiz")
+            self.assertEqual(inventario.buscar_por_id(2).get_nombre(), "Borrador")
+            self.assertIsNone(inventario.buscar_por_id(3))
 
     def test_agregar_guarda_en_archivo(self):
         """Agregar productos debe persistirlos en el archivo."""
@@ -133,6 +139,385 @@ class InventarioTests(unittest.TestCase):
             self.assertFalse(ok)
             self.assertIn("permiso", mensaje.lower())
 
+    def test_modo_diario_anexa_sin_reescribir(self):
+        """En modo diario los cambios van al log y el archivo principal no cambia."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ruta = self._ruta_tmp(tmp_dir)
+            inventario = Inventario(ruta, modo_diario=True)
+            inventario.agregar_producto(Producto(1, "Lapiz", 5, 1.0))
+            inventario.actualizar_producto(1, nueva_cantidad=7)
+
+            with open(ruta, "r", encoding="utf-8") as archivo:
+                self.assertEqual(json.load(archivo), [])
+            with open(f"{ruta}.log", "r", encoding="utf-8") as archivo:
+                lineas = archivo.read().splitlines()
+            self.assertEqual(len(lineas), 2)
+            self.assertEqual(json.loads(lineas[1])["op"], "actualizar")
+
+    def test_modo_diario_reproduce_al_cargar(self):
+        """El diario se reproduce al cargar e ignora una linea final incompleta."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ruta = self._ruta_tmp(tmp_dir)
+            inventario = Inventario(ruta, modo_diario=True)
+            inventario.agregar_producto(Producto(1, "Lapiz", 5, 1.0))
+            inventario.agregar_producto(Producto(2, "Goma", 3, 0.5))
+            inventario.eliminar_producto(1)
+            inventario.actualizar_producto(2, nuevo_precio=0.75)
+            with open(f"{ruta}.log", "a", encoding="utf-8") as archivo:
+                archivo.write('{"op":"eliminar","id"')
+
+            recargado = Inventario(ruta, modo_diario=True)
+            productos = recargado.mostrar_todos()
+            self.assertEqual(len(productos), 1)
+            self.assertEqual(productos[0].get_id(), 2)
+            self.assertEqual(productos[0].get_precio(), 0.75)
+
+    def test_modo_diario_recorta_anexado_fallido(self):
+        """Un anexado que falla a medias no arrastra a los registros siguientes."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ruta = self._ruta_tmp(tmp_dir)
+            inventario = Inventario(ruta, modo_diario=True)
+            inventario.agregar_producto(Producto(1, "Lapiz", 5, 1.0))
+
+            def anexar_a_medias(ruta_diario, texto):
+                with open(ruta_diario, "a", encoding="utf-8") as archivo:
+                    archivo.write(texto[:10])
+                raise OSError("disco lleno")
+
+            with mock.patch.object(inventario._escritor, "anexar", side_effect=anexar_a_medias):
+                exito, _ = inventario.agregar_producto(Producto(2, "Goma", 3, 0.5))
+            self.assertFalse(exito)
+            exito, _ = inventario.agregar_producto(Producto(3, "Regla", 2, 2.0))
+            self.assertTrue(exito)
+
+            recargado = Inventario(ruta, modo_diario=True)
+            self.assertEqual([p.get_id() for p in recargado.mostrar_todos()], [1, 3])
+
+    def test_modo_diario_compacta_al_alcanzar_umbral(self):
+        """Al llegar al umbral el diario se vuelca al archivo y se vacia."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ruta = self._ruta_tmp(tmp_dir)
+            inventario = Inventario(ruta, modo_diario=True, umbral_compactacion=3)
+            for producto_id in range(1, 4):
+                inventario.agregar_producto(Producto(producto_id, "Item", 1, 1.0))
+
+            with open(ruta, "r", encoding="utf-8") as archivo:
+                self.assertEqual(len(json.load(archivo)), 3)
+            self.assertEqual(os.path.getsize(f"{ruta}.log"), 0)
+
+    def test_diario_pendiente_se_compacta_fuera_de_modo_diario(self):
+        """Un diario existente se integra al archivo si se abre sin modo diario."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ruta = self._ruta_tmp(tmp_dir)
+            inventario = Inventario(ruta, modo_diario=True)
+            inventario.agregar_producto(Producto(1, "Lapiz", 5, 1.0))
+
+            Inventario(ruta)
+            with open(ruta, "r", encoding="utf-8") as archivo:
+                datos = json.load(archivo)
+            self.assertEqual(datos[0]["nombre"], "Lapiz")
+            self.assertEqual(os.path.getsize(f"{ruta}.log"), 0)
+
+    def test_indice_consistente_tras_eliminar(self):
+        """Eliminar mantiene los indices y el orden de alta en el listado y el archivo."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ruta = self._ruta_tmp(tmp_dir)
+            inventario = Inventario(ruta)
+            for producto_id in (4, 1, 5, 2, 3):
+                inventario.agregar_producto(Producto(producto_id, f"P{producto_id}", 1, 1.0))
+
+            inventario.eliminar_producto(1)
+            inventario.eliminar_producto(3)
+            inventario.agregar_producto(Producto(6, "P6", 1, 1.0))
+            ids = [p.get_id() for p in inventario.mostrar_todos()]
+            self.assertEqual(ids, [4, 5, 2, 6])
+            with open(ruta, "r", encoding="utf-8") as archivo:
+                self.assertEqual([item["id"] for item in json.load(archivo)], ids)
+            for producto in inventario.mostrar_todos():
+                self.assertIs(inventario._buscar_por_id(producto.get_id()), producto)
+            exito, _ = inventario.agregar_producto(Producto(5, "Duplicado", 1, 1.0))
+            self.assertFalse(exito)
+
+    def test_eliminar_revierte_posicion_si_falla_guardado(self):
+        """Si el guardado falla, el producto vuelve a su posicion original."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            inventario = Inventario(self._ruta_tmp(tmp_dir))
+            for producto_id in range(1, 4):
+                inventario.agregar_producto(Producto(producto_id, f"P{producto_id}", 1, 1.0))
+            orden_original = [p.get_id() for p in inventario.mostrar_todos()]
+
+            with mock.patch("builtins.open", side_effect=PermissionError):
+                exito, _ = inventario.eliminar_producto(1)
+
+            self.assertFalse(exito)
+            self.assertEqual([p.get_id() for p in inventario.mostrar_todos()], orden_original)
+            self.assertEqual(inventario._posiciones, {1: 0, 2: 1, 3: 2})
+
+    def test_escritura_atomica_conserva_archivo_si_falla(self):
+        """Un fallo al escribir no debe truncar el archivo existente."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ruta = self._ruta_tmp(tmp_dir)
+            inventario = Inventario(ruta)
+            inventario.agregar_producto(Producto(1, "Lapiz", 5, 1.0))
+
+            with mock.patch("inventario.json.dumps", side_effect=OSError("disco lleno")):
+                exito, _ = inventario.agregar_producto(Producto(2, "Goma", 1, 0.5))
+            self.assertFalse(exito)
+
+            with mock.patch("escritura_duradera.os.replace", side_effect=OSError("caida")):
+                exito, _ = inventario.agregar_producto(Producto(3, "Regla", 1, 0.5))
+            self.assertFalse(exito)
+
+            with open(ruta, "r", encoding="utf-8") as archivo:
+                datos = json.load(archivo)
+            self.assertEqual([item["id"] for item in datos], [1])
+
+    def test_confirmacion_en_grupo_comparte_fsync(self):
+        """Dentro de la ventana los cambios quedan pendientes de un unico fsync."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ruta = self._ruta_tmp(tmp_dir)
+            inventario = Inventario(ruta, modo_diario=True, ventana_fsync_ms=60_000)
+            with mock.patch("escritura_duradera.os.fsync") as fsync:
+                for producto_id in range(1, 6):
+                    inventario.agregar_producto(Producto(producto_id, "Item", 1, 1.0))
+                self.assertEqual(fsync.call_count, 0)
+                self.assertTrue(inventario._escritor.hay_pendientes())
+
+                exito, _ = inventario.sincronizar()
+            self.assertTrue(exito)
+            self.assertFalse(inventario._escritor.hay_pendientes())
+            # Diario y directorio comun; el archivo principal paso por fsync
+            # antes de renombrarlo al crearse.
+            self.assertEqual(fsync.call_count, 2)
+
+    def test_reescritura_en_ventana_sincroniza_antes_de_renombrar(self):
+        """Dentro de la ventana el temporal igual pasa por fsync antes de os.replace."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ruta = self._ruta_tmp(tmp_dir)
+            inventario = Inventario(ruta, ventana_fsync_ms=60_000)
+            llamadas = []
+            with mock.patch("escritura_duradera.os.fsync", side_effect=lambda fd: llamadas.append("fsync")), \
+                    mock.patch("escritura_duradera.os.replace",
+                               side_effect=lambda *args: llamadas.append("replace") or os.rename(*args)):
+                inventario.agregar_producto(Producto(1, "Lapiz", 5, 1.0))
+            self.assertEqual(llamadas, ["fsync", "replace"])
+            self.assertTrue(inventario._escritor.hay_pendientes())
+            inventario.cerrar()
+            self.assertFalse(inventario._escritor.hay_pendientes())
+
+    def test_temporizador_confirma_la_ultima_ventana(self):
+        """Los cambios de la ultima ventana se confirman solos al terminar la ventana."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ruta = self._ruta_tmp(tmp_dir)
+            inventario = Inventario(ruta, modo_diario=True, ventana_fsync_ms=50)
+            inventario.agregar_producto(Producto(1, "Lapiz", 5, 1.0))
+            inventario.agregar_producto(Producto(2, "Goma", 1, 0.5))
+            for _ in range(100):
+                if not inventario._escritor.hay_pendientes():
+                    break
+                time.sleep(0.01)
+            self.assertFalse(inventario._escritor.hay_pendientes())
+
+    def test_modo_diferido_guarda_al_cerrar(self):
+        """En modo diferido el archivo se actualiza al cerrar el inventario."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ruta = self._ruta_tmp(tmp_dir)
+            with Inventario(
+                ruta, modo_escritura="diferido", intervalo_escritura_ms=60_000
+            ) as inventario:
+                for producto_id in range(1, 4):
+                    exito, _ = inventario.agregar_producto(Producto(producto_id, "Item", 1, 1.0))
+                    self.assertTrue(exito)
+                with open(ruta, "r", encoding="utf-8") as archivo:
+                    self.assertEqual(json.load(archivo), [])
+
+            with open(ruta, "r", encoding="utf-8") as archivo:
+                self.assertEqual([item["id"] for item in json.load(archivo)], [1, 2, 3])
+
+    def test_modo_diferido_escribe_al_acumular_cambios(self):
+        """El hilo de escritura guarda al llegar al maximo de cambios pendientes."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ruta = self._ruta_tmp(tmp_dir)
+            inventario = Inventario(
+                ruta,
+                modo_diario=True,
+                modo_escritura="diferido",
+                intervalo_escritura_ms=60_000,
+                max_cambios_pendientes=3,
+            )
+            for producto_id in range(1, 4):
+                inventario.agregar_producto(Producto(producto_id, "Item", 1, 1.0))
+            for _ in range(100):
+                if os.path.exists(f"{ruta}.log") and os.path.getsize(f"{ruta}.log"):
+                    break
+                time.sleep(0.01)
+            with open(f"{ruta}.log", "r", encoding="utf-8") as archivo:
+                self.assertEqual(len(archivo.read().splitlines()), 3)
+            inventario.cerrar()
+
+            recargado = Inventario(ruta, modo_diario=True)
+            self.assertEqual(len(recargado.mostrar_todos()), 3)
+
+    def test_modo_diferido_reintenta_si_falla_guardado(self):
+        """Un fallo en modo diferido conserva el cambio y lo guarda despues."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ruta = self._ruta_tmp(tmp_dir)
+            inventario = Inventario(
+                ruta, modo_escritura="diferido", intervalo_escritura_ms=60_000
+            )
+            inventario.agregar_producto(Producto(1, "Lapiz", 5, 1.0))
+            with mock.patch("escritura_duradera.os.replace", side_effect=OSError("caida")):
+                exito, _ = inventario.guardar_pendientes()
+            self.assertFalse(exito)
+            self.assertEqual(len(inventario.mostrar_todos()), 1)
+
+            exito, _ = inventario.cerrar()
+            self.assertTrue(exito)
+            with open(ruta, "r", encoding="utf-8") as archivo:
+                self.assertEqual(json.load(archivo)[0]["nombre"], "Lapiz")
+
+    def test_modo_compartido_no_pierde_cambios_de_otro_proceso(self):
+        """Dos inventarios compartidos sobre el mismo archivo conservan ambos cambios."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ruta = self._ruta_tmp(tmp_dir)
+            primero = Inventario(ruta, compartido=True)
+            segundo = Inventario(ruta, compartido=True)
+            primero.agregar_producto(Producto(1, "Lapiz", 5, 1.0))
+            self.assertTrue(segundo.esta_desactualizado())
+
+            exito, _ = segundo.agregar_producto(Producto(1, "Repetido", 1, 1.0))
+            self.assertFalse(exito)
+            segundo.agregar_producto(Producto(2, "Goma", 3, 0.5))
+
+            with open(ruta, "r", encoding="utf-8") as archivo:
+                self.assertEqual([item["id"] for item in json.load(archivo)], [1, 2])
+            self.assertEqual(len(primero.mostrar_todos()), 2)
+            self.assertFalse(primero.esta_desactualizado())
+
+    def test_modo_compartido_recarga_reutiliza_productos(self):
+        """Al recargar, los productos sin cambios conservan su objeto."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ruta = self._ruta_tmp(tmp_dir)
+            primero = Inventario(ruta, compartido=True)
+            primero.agregar_producto(Producto(1, "Lapiz", 5, 1.0))
+            primero.agregar_producto(Producto(2, "Goma", 3, 0.5))
+            segundo = Inventario(ruta, compartido=True)
+            goma = segundo._buscar_por_id(2)
+
+            primero.actualizar_producto(2, nueva_cantidad=9)
+            exito, _ = segundo.recargar_si_cambio()
+            self.assertTrue(exito)
+            self.assertIs(segundo._buscar_por_id(2), goma)
+            self.assertEqual(goma.get_cantidad(), 9)
+
+    def test_modo_compartido_diario_reproduce_solo_lo_nuevo(self):
+        """Si solo crecio el diario, se reproduce su parte nueva sin releer el archivo."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ruta = self._ruta_tmp(tmp_dir)
+            primero = Inventario(ruta, modo_diario=True, compartido=True)
+            segundo = Inventario(ruta, modo_diario=True, compartido=True)
+            primero.agregar_producto(Producto(1, "Lapiz", 5, 1.0))
+            primero.agregar_producto(Producto(2, "Goma", 3, 0.5))
+
+            with mock.patch.object(segundo, "_cargar_desde_archivo") as cargar:
+                nombres = [p.get_nombre() for p in segundo.mostrar_todos()]
+            cargar.assert_not_called()
+            self.assertEqual(nombres, ["Lapiz", "Goma"])
+            self.assertEqual(segundo._desplazamiento_diario, os.path.getsize(f"{ruta}.log"))
+
+    def test_modo_compartido_entre_procesos(self):
+        """Varios procesos que agregan a la vez no se sobrescriben entre si."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ruta = self._ruta_tmp(tmp_dir)
+            codigo = (
+                "import sys\n"
+                "from inventario import Inventario\n"
+                "from producto import Producto\n"
+                "inventario = Inventario(sys.argv[1], compartido=True)\n"
+                "base = int(sys.argv[2])\n"
+                "for i in range(20):\n"
+                "    inventario.agregar_producto(Producto(base + i, 'Item', 1, 1.0))\n"
+            )
+            directorio = os.path.dirname(os.path.abspath(__file__))
+            procesos = [
+                subprocess.Popen([sys.executable, "-c", codigo, ruta, str(base)], cwd=directorio)
+                for base in (100, 200, 300)
+            ]
+            for proceso in procesos:
+                self.assertEqual(proceso.wait(timeout=60), 0)
+
+            with open(ruta, "r", encoding="utf-8") as archivo:
+                self.assertEqual(len(json.load(archivo)), 60)
+
+    def test_paginas_por_id_continuan_tras_cambios(self):
+        """Las paginas salen ordenadas por ID y el cursor sobrevive a altas y bajas."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ruta = self._ruta_tmp(tmp_dir)
+            inventario = Inventario(ruta)
+            for producto_id in (5, 1, 4, 2, 3):
+                inventario.agregar_producto(Producto(producto_id, f"P{producto_id}", 1, 1.0))
+
+            pagina, cursor = inventario.obtener_pagina(2)
+            self.assertEqual([p.get_id() for p in pagina], [1, 2])
+            self.assertEqual(cursor, 2)
+            inventario.eliminar_producto(3)
+            inventario.agregar_producto(Producto(0, "P0", 1, 1.0))
+            inventario.agregar_producto(Producto(6, "P6", 1, 1.0))
+            pagina, cursor = inventario.obtener_pagina(2, cursor)
+            self.assertEqual([p.get_id() for p in pagina], [4, 5])
+            pagina, cursor = inventario.obtener_pagina(2, cursor)
+            self.assertEqual([p.get_id() for p in pagina], [6])
+            self.assertIsNone(cursor)
+            self.assertEqual([p.get_id() for p in inventario.iterar_productos(4)], [0, 1, 2, 4, 5, 6])
+
+            with InventarioSQLite(os.path.join(tmp_dir, "inventario.db")) as inventario_sql:
+                for producto_id in (3, 1, 2):
+                    inventario_sql.agregar_producto(Producto(producto_id, "P", 1, 1.0))
+                pagina, cursor = inventario_sql.obtener_pagina(2)
+                self.assertEqual(([p.get_id() for p in pagina], cursor), ([1, 2], 2))
+                self.assertEqual([p.get_id() for p in inventario_sql.iterar_productos(1)], [1, 2, 3])
+
+    def test_inventario_sqlite_operaciones(self):
+        """El inventario sobre SQLite agrega, actualiza, busca y elimina por ID."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ruta_bd = os.path.join(tmp_dir, "inventario.db")
+            with InventarioSQLite(ruta_bd) as inventario:
+                inventario.agregar_producto(Producto(1, "Lapiz azul", 5, 1.0))
+                inventario.agregar_producto(Producto(2, "Goma", 3, 0.5))
+                exito, _ = inventario.agregar_producto(Producto(1, "Repetido", 1, 1.0))
+                self.assertFalse(exito)
+                inventario.actualizar_producto(2, nuevo_precio=0.75)
+                exito, _ = inventario.eliminar_producto(9)
+                self.assertFalse(exito)
+
+            with InventarioSQLite(ruta_bd) as inventario:
+                self.assertEqual([p.get_id() for p in inventario.buscar_por_nombre("LAPIZ")], [1])
+                self.assertEqual([p.get_id() for p in inventario.buscar_por_nombre("go")], [2])
+                self.assertEqual(inventario.buscar_por_id(2).get_precio(), 0.75)
+                inventario.eliminar_producto(1)
+                self.assertEqual(inventario.buscar_por_nombre("lapiz"), [])
+
+    def test_migracion_desde_json_a_sqlite(self):
+        """La migracion reemplaza el contenido de la base por el del archivo JSON."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ruta = self._ruta_tmp(tmp_dir)
+            inventario = Inventario(ruta)
+            inventario.agregar_producto(Producto(1, "Lapiz", 5, 1.0))
+            inventario.agregar_producto(Producto(2, "Cuaderno", 3, 2.5))
+            ruta_bd = os.path.join(tmp_dir, "inventario.db")
+
+            with InventarioSQLite(ruta_bd) as previo:
+                previo.agregar_producto(Producto(9, "Obsoleto", 1, 1.0))
+            self.assertEqual(migrar_desde_json(ruta, ruta_bd), 2)
+            self.assertEqual(migrar_desde_json(ruta, ruta_bd), 2)
+            with InventarioSQLite(ruta_bd) as migrado:
+                self.assertEqual(
+                    [p.to_dict() for p in migrado.mostrar_todos()],
+                    [p.to_dict() for p in inventario.mostrar_todos()],
+                )
+                self.assertEqual(len(migrado.buscar_por_nombre("cuaderno")), 1)
+                self.assertEqual(migrado.buscar_por_nombre("obsoleto"), [])
+
 
 if __name__ == "__main__":
     unittest.main()
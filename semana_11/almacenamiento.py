@@ -0,0 +1,560 @@
+"""
+Módulo Almacenamiento: Interfaz de almacenamiento del inventario e implementación SQLite.
+
+Este módulo contiene la clase abstracta AlmacenamientoInventario, que define
+las operaciones que necesita InventarioAlmacenado, y AlmacenamientoSQLite, que
+las implementa con `sqlite3` de la biblioteca estándar. Los datos viven en la
+base de datos: abrir el inventario no depende de su tamaño y cada consulta o
+cambio usa los índices de la tabla en lugar de recorrer todos los productos.
+
+Incluye un migrador desde el archivo JSON de `Inventario`:
+    python almacenamiento.py inventario.json inventario.db
+"""
+
+import sqlite3
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from producto import Producto
+from lector_json import LectorJSONIncremental
+
+
+Cambio = Tuple[int, Optional[str], Optional[int], Optional[float]]
+Totales = Tuple[int, float, float]
+CAMPOS_ORDENABLES = ('precio', 'cantidad')
+
+
+class AlmacenamientoInventario(ABC):
+    """
+    Operaciones de almacenamiento que usa InventarioAlmacenado.
+
+    Cada método que modifica datos es atómico: o se aplica completo o no se
+    aplica. Los productos retornados son copias; modificarlos no cambia el
+    almacenamiento.
+    """
+
+    @abstractmethod
+    def obtener(self, id_producto: int) -> Optional[Producto]:
+        """Retorna el producto con ese ID o None."""
+
+    @abstractmethod
+    def existe(self, id_producto: int) -> bool:
+        """Indica si hay un producto con ese ID."""
+
+    @abstractmethod
+    def insertar(self, productos: List[Producto]) -> None:
+        """
+        Inserta productos nuevos y ajusta el siguiente ID si hace falta.
+
+        Raises:
+            ValueError: Si algún ID ya existe (no se inserta ninguno)
+        """
+
+    @abstractmethod
+    def eliminar(self, id_producto: int) -> bool:
+        """Elimina un producto; retorna False si no existía."""
+
+    @abstractmethod
+    def actualizar(self, cambios: Iterable[Cambio]) -> int:
+        """
+        Aplica cambios (id, nombre, cantidad, precio); None deja el campo igual.
+
+        Returns:
+            int: Número de productos modificados
+        """
+
+    @abstractmethod
+    def buscar_por_nombre(self, texto: str) -> List[Producto]:
+        """Productos cuyo nombre contiene `texto` (sin distinguir mayúsculas), por ID."""
+
+    @abstractmethod
+    def todos(self) -> Iterator[Producto]:
+        """Recorre todos los productos (AlmacenamientoSQLite, en orden de ID)."""
+
+    @abstractmethod
+    def pagina(self, despues_de: Optional[int], tamano: int) -> Tuple[List[Producto], bool]:
+        """
+        Los primeros `tamano` productos con ID mayor que `despues_de` (None:
+        desde el principio), por ID, e indicador de si quedan más.
+        """
+
+    @abstractmethod
+    def con_cantidad_menor(self, umbral: int) -> List[Producto]:
+        """Productos con cantidad < umbral, ordenados por ID."""
+
+    @abstractmethod
+    def mayor_valor(self, k: int) -> List[Producto]:
+        """Los k productos de mayor cantidad * precio, de mayor a menor."""
+
+    @abstractmethod
+    def en_rango(self, campo: str, minimo: Optional[float],
+                 maximo: Optional[float]) -> List[Producto]:
+        """
+        Productos con `campo` ('precio' o 'cantidad') entre `minimo` y
+        `maximo` inclusive (None: sin límite), ordenados por ese campo y por ID.
+        """
+
+    @abstractmethod
+    def extremos(self, campo: str, k: int, mayores: bool = True) -> List[Producto]:
+        """Los k productos con mayor (o menor) `campo`, empezando por el extremo."""
+
+    @abstractmethod
+    def contar(self) -> int:
+        """Número de productos."""
+
+    @abstractmethod
+    def totales(self) -> Totales:
+        """Retorna (items, valor total, suma de precios) acumulados."""
+
+    @abstractmethod
+    def recalcular_totales(self, corregir: bool = False) -> Totales:
+        """Recalcula los totales recorriendo los productos; opcionalmente los guarda."""
+
+    @abstractmethod
+    def leer_siguiente_id(self) -> int:
+        """Retorna el siguiente ID disponible."""
+
+    @abstractmethod
+    def escribir_siguiente_id(self, siguiente_id: int) -> None:
+        """Guarda el siguiente ID disponible."""
+
+    @abstractmethod
+    def vaciar(self) -> None:
+        """Elimina todos los productos y reinicia el siguiente ID."""
+
+    def reemplazar(self, lotes: Iterable[List[Producto]]) -> int:
+        """
+        Reemplaza todo el contenido por los productos de los lotes.
+
+        Un ID repetido se queda con su última aparición. Esta implementación
+        reúne primero los lotes, para que un error al producirlos deje el
+        almacenamiento como estaba, y luego vacía e inserta; las subclases
+        pueden hacerlo en una sola transacción sin reunirlos.
+
+        Returns:
+            int: Cantidad de productos que quedaron en el almacenamiento
+        """
+        productos: Dict[int, Producto] = {}
+        for lote in lotes:
+            productos.update((producto.id, producto) for producto in lote)
+        self.vaciar()
+        self.insertar(list(productos.values()))
+        return len(productos)
+
+    def cerrar(self) -> None:
+        """Libera los recursos del almacenamiento."""
+
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS productos (
+    id INTEGER PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    cantidad INTEGER NOT NULL CHECK (cantidad >= 0),
+    precio REAL NOT NULL CHECK (precio >= 0)
+);
+CREATE INDEX IF NOT EXISTS idx_productos_nombre ON productos(nombre);
+CREATE INDEX IF NOT EXISTS idx_productos_cantidad ON productos(cantidad);
+CREATE INDEX IF NOT EXISTS idx_productos_precio ON productos(precio);
+CREATE INDEX IF NOT EXISTS idx_productos_valor ON productos(cantidad * precio);
+
+CREATE TABLE IF NOT EXISTS totales (
+    fila INTEGER PRIMARY KEY CHECK (fila = 1),
+    productos INTEGER NOT NULL,
+    items INTEGER NOT NULL,
+    valor REAL NOT NULL,
+    suma_precios REAL NOT NULL
+);
+INSERT OR IGNORE INTO totales VALUES (1, 0, 0, 0.0, 0.0);
+
+CREATE TABLE IF NOT EXISTS metadatos (clave TEXT PRIMARY KEY, valor INTEGER NOT NULL);
+INSERT OR IGNORE INTO metadatos VALUES ('siguiente_id', 1);
+
+CREATE TRIGGER IF NOT EXISTS totales_insertar AFTER INSERT ON productos BEGIN
+    UPDATE totales SET productos = productos + 1,
+                       items = items + NEW.cantidad,
+                       valor = valor + NEW.cantidad * NEW.precio,
+                       suma_precios = suma_precios + NEW.precio;
+END;
+CREATE TRIGGER IF NOT EXISTS totales_eliminar AFTER DELETE ON productos BEGIN
+    UPDATE totales SET productos = productos - 1,
+                       items = items - OLD.cantidad,
+                       valor = valor - OLD.cantidad * OLD.precio,
+                       suma_precios = suma_precios - OLD.precio;
+END;
+CREATE TRIGGER IF NOT EXISTS totales_actualizar AFTER UPDATE OF cantidad, precio ON productos BEGIN
+    UPDATE totales SET items = items + NEW.cantidad - OLD.cantidad,
+                       valor = valor + NEW.cantidad * NEW.precio - OLD.cantidad * OLD.precio,
+                       suma_precios = suma_precios + NEW.precio - OLD.precio;
+END;
+"""
+
+# Índice de trigramas de FTS5 (SQLite 3.34+) para buscar subcadenas del nombre.
+_ESQUEMA_TRIGRAMAS = """
+CREATE VIRTUAL TABLE IF NOT EXISTS productos_fts USING fts5(
+    nombre, content='productos', content_rowid='id', tokenize='trigram'
+);
+"""
+
+# Triggers que mantienen el índice de trigramas; importar los quita mientras
+# inserta y reconstruye el índice una sola vez al final.
+_TRIGGERS_FTS = {
+    'fts_insertar': """
+CREATE TRIGGER IF NOT EXISTS fts_insertar AFTER INSERT ON productos BEGIN
+    INSERT INTO productos_fts(rowid, nombre) VALUES (NEW.id, NEW.nombre);
+END""",
+    'fts_eliminar': """
+CREATE TRIGGER IF NOT EXISTS fts_eliminar AFTER DELETE ON productos BEGIN
+    INSERT INTO productos_fts(productos_fts, rowid, nombre) VALUES ('delete', OLD.id, OLD.nombre);
+END""",
+    'fts_actualizar': """
+CREATE TRIGGER IF NOT EXISTS fts_actualizar AFTER UPDATE OF nombre ON productos BEGIN
+    INSERT INTO productos_fts(productos_fts, rowid, nombre) VALUES ('delete', OLD.id, OLD.nombre);
+    INSERT INTO productos_fts(rowid, nombre) VALUES (NEW.id, NEW.nombre);
+END""",
+}
+
+_COLUMNAS = "id, nombre, cantidad, precio"
+_INSERTAR = "INSERT INTO productos (id, nombre, cantidad, precio) VALUES (?, ?, ?, ?)"
+# Al reemplazar el contenido, un ID repetido en el origen se queda con su
+# última aparición, igual que al cargar el JSON en un Inventario.
+_INSERTAR_O_ACTUALIZAR = _INSERTAR + (
+    " ON CONFLICT(id) DO UPDATE SET nombre = excluded.nombre,"
+    " cantidad = excluded.cantidad, precio = excluded.precio"
+)
+
+# A partir de este tamaño conviene reconstruir el índice de trigramas de una
+# vez en lugar de actualizarlo fila por fila.
+MINIMO_RECONSTRUCCION = 1_000
+
+
+class AlmacenamientoSQLite(AlmacenamientoInventario):
+    """
+    Almacenamiento del inventario en una base de datos SQLite.
+
+    La tabla `productos` tiene como clave primaria el ID e índices sobre el
+    nombre, la cantidad y el valor (cantidad * precio). Los totales se
+    mantienen en la tabla `totales` mediante triggers, por lo que las
+    estadísticas cuestan O(1). Si SQLite incluye el tokenizador de trigramas
+    de FTS5, la búsqueda por nombre usa ese índice; si no, recorre la tabla.
+
+    Atributos:
+        usa_trigramas (bool): True si la búsqueda por nombre usa FTS5
+    """
+
+    def __init__(self, ruta: str = "inventario.db"):
+        """
+        Abre (o crea) la base de datos y su esquema.
+
+        Args:
+            ruta (str): Archivo de la base de datos (':memory:' para una en memoria)
+        """
+        self._conexion = sqlite3.connect(ruta)
+        self._conexion.create_function('minusculas', 1, _minusculas, deterministic=True)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("PRAGMA synchronous=NORMAL")
+        with self._conexion:
+            self._conexion.executescript(_ESQUEMA)
+        try:
+            with self._conexion:
+                self._conexion.executescript(
+                    _ESQUEMA_TRIGRAMAS + ";".join(_TRIGGERS_FTS.values()) + ";"
+                )
+            self.usa_trigramas = True
+        except sqlite3.OperationalError:
+            self.usa_trigramas = False
+
+    def obtener(self, id_producto: int) -> Optional[Producto]:
+        """Retorna el producto con ese ID (búsqueda por clave primaria)."""
+        fila = self._conexion.execute(
+            f"SELECT {_COLUMNAS} FROM productos WHERE id = ?", (id_producto,)
+        ).fetchone()
+        return Producto(*fila) if fila else None
+
+    def existe(self, id_producto: int) -> bool:
+        """Indica si hay un producto con ese ID."""
+        return self._conexion.execute(
+            "SELECT 1 FROM productos WHERE id = ?", (id_producto,)
+        ).fetchone() is not None
+
+    def insertar(self, productos: List[Producto]) -> None:
+        """Inserta los productos en una sola transacción."""
+        if not productos:
+            return
+        if self.usa_trigramas and len(productos) >= max(MINIMO_RECONSTRUCCION, self.contar()):
+            self.importar([productos])
+            return
+        try:
+            with self._conexion:
+                self._insertar_lote(productos)
+        except sqlite3.IntegrityError as e:
+            raise ValueError(f"No se pudieron insertar los productos: {e}") from e
+
+    def importar(self, lotes: Iterable[List[Producto]], reemplazar: bool = False) -> int:
+        """
+        Inserta muchos productos, en lotes, dentro de una única transacción.
+
+        El índice de trigramas no se actualiza fila por fila sino que se
+        reconstruye una vez al final, lo que es varias veces más rápido para
+        cargas grandes. Si algo falla, incluso al producir los lotes, la
+        transacción se revierte y la base de datos queda como estaba.
+
+        Args:
+            lotes (Iterable[List[Producto]]): Productos a insertar, por lotes
+            reemplazar (bool): Si es True, el contenido anterior se borra en
+                la misma transacción y un ID repetido en los lotes se queda
+                con su última aparición
+
+        Returns:
+            int: Cantidad de productos leídos de los lotes
+
+        Raises:
+            ValueError: Si algún ID ya existe (no se inserta ninguno)
+        """
+        total = 0
+        consulta = _INSERTAR_O_ACTUALIZAR if reemplazar else _INSERTAR
+        # Al reemplazar también se borran y actualizan filas: sin sus
+        # triggers, el índice no recibe bajas de filas que nunca indexó.
+        triggers = list(_TRIGGERS_FTS) if reemplazar else ['fts_insertar']
+        try:
+            with self._conexion:
+                # BEGIN explícito: así el DROP TRIGGER también se revierte si falla.
+                self._conexion.execute("BEGIN")
+                if self.usa_trigramas:
+                    for trigger in triggers:
+                        self._conexion.execute(f"DROP TRIGGER {trigger}")
+                if reemplazar:
+                    self._vaciar_tablas()
+                for lote in lotes:
+                    self._insertar_lote(lote, consulta)
+                    total += len(lote)
+                if self.usa_trigramas:
+                    self._conexion.execute("INSERT INTO productos_fts(productos_fts) VALUES ('rebuild')")
+                    for trigger in triggers:
+                        self._conexion.execute(_TRIGGERS_FTS[trigger])
+        except sqlite3.IntegrityError as e:
+            raise ValueError(f"No se pudieron insertar los productos: {e}") from e
+        return total
+
+    def reemplazar(self, lotes: Iterable[List[Producto]]) -> int:
+        """Reemplaza todo el contenido en una única transacción (ver importar)."""
+        self.importar(lotes, reemplazar=True)
+        return self.contar()
+
+    def _insertar_lote(self, productos: List[Producto], consulta: str = _INSERTAR) -> None:
+        """Inserta filas y ajusta el siguiente ID (dentro de una transacción abierta)."""
+        if not productos:
+            return
+        self._conexion.executemany(
+            consulta, ((p.id, p.nombre, p.cantidad, p.precio) for p in productos)
+        )
+        self._conexion.execute(
+            "UPDATE metadatos SET valor = max(valor, ?) WHERE clave = 'siguiente_id'",
+            (max(p.id for p in productos) + 1,)
+        )
+
+    def eliminar(self, id_producto: int) -> bool:
+        """Elimina un producto por ID."""
+        with self._conexion:
+            cursor = self._conexion.execute("DELETE FROM productos WHERE id = ?", (id_producto,))
+        return cursor.rowcount > 0
+
+    def actualizar(self, cambios: Iterable[Cambio]) -> int:
+        """Aplica los cambios en una sola transacción."""
+        modificados = 0
+        with self._conexion:
+            for id_producto, nombre, cantidad, precio in cambios:
+                cursor = self._conexion.execute(
+                    "UPDATE productos SET nombre = coalesce(?, nombre), "
+                    "cantidad = coalesce(?, cantidad), precio = coalesce(?, precio) "
+                    "WHERE id = ?",
+                    (nombre, cantidad, precio, id_producto)
+                )
+                modificados += cursor.rowcount
+        return modificados
+
+    def buscar_por_nombre(self, texto: str) -> List[Producto]:
+        """Busca por subcadena del nombre con el índice de trigramas si está disponible.
+
+        Igual que el motor de diccionario, la consulta no se recorta: los
+        espacios al principio o al final forman parte de la subcadena.
+        """
+        if self.usa_trigramas and len(texto) >= 3:
+            # Una frase entre comillas: los caracteres especiales no se interpretan.
+            frase = '"' + texto.replace('"', '""') + '"'
+            consulta = (
+                f"SELECT {_COLUMNAS} FROM productos WHERE id IN "
+                "(SELECT rowid FROM productos_fts WHERE productos_fts MATCH ?) ORDER BY id"
+            )
+            parametros = (frase,)
+        else:
+            consulta = (
+                f"SELECT {_COLUMNAS} FROM productos "
+                "WHERE instr(minusculas(nombre), ?) > 0 ORDER BY id"
+            )
+            parametros = (texto.lower(),)
+        return [Producto(*fila) for fila in self._conexion.execute(consulta, parametros)]
+
+    def todos(self) -> Iterator[Producto]:
+        """Recorre los productos en orden de ID sin cargarlos todos a la vez."""
+        for fila in self._conexion.execute(f"SELECT {_COLUMNAS} FROM productos ORDER BY id"):
+            yield Producto(*fila)
+
+    def pagina(self, despues_de: Optional[int], tamano: int) -> Tuple[List[Producto], bool]:
+        """Recorre la clave primaria desde `despues_de`, sin contar las filas anteriores."""
+        filas = self._conexion.execute(
+            f"SELECT {_COLUMNAS} FROM productos WHERE id > ? ORDER BY id LIMIT ?",
+            (despues_de if despues_de is not None else -2**63, tamano + 1),
+        ).fetchall()
+        return [Producto(*fila) for fila in filas[:tamano]], len(filas) > tamano
+
+    def con_cantidad_menor(self, umbral: int) -> List[Producto]:
+        """Usa el índice de cantidad para encontrar los productos con poco stock."""
+        filas = self._conexion.execute(
+            f"SELECT {_COLUMNAS} FROM productos WHERE cantidad < ? ORDER BY id", (umbral,)
+        )
+        return [Producto(*fila) for fila in filas]
+
+    def mayor_valor(self, k: int) -> List[Producto]:
+        """Recorre el índice de valor desde el mayor y se detiene tras k filas."""
+        if k <= 0:
+            return []
+        filas = self._conexion.execute(
+            f"SELECT {_COLUMNAS} FROM productos ORDER BY cantidad * precio DESC LIMIT ?", (k,)
+        )
+        return [Producto(*fila) for fila in filas]
+
+    def en_rango(self, campo: str, minimo: Optional[float],
+                 maximo: Optional[float]) -> List[Producto]:
+        """Recorre el índice del campo solo entre los dos límites."""
+        _validar_campo(campo)
+        filas = self._conexion.execute(
+            f"SELECT {_COLUMNAS} FROM productos WHERE {campo} BETWEEN ? AND ? "
+            f"ORDER BY {campo}, id",
+            (minimo if minimo is not None else float('-inf'),
+             maximo if maximo is not None else float('inf')),
+        )
+        return [Producto(*fila) for fila in filas]
+
+    def extremos(self, campo: str, k: int, mayores: bool = True) -> List[Producto]:
+        """Recorre el índice del campo desde un extremo y se detiene tras k filas."""
+        _validar_campo(campo)
+        if k <= 0:
+            return []
+        orden = "DESC" if mayores else "ASC"
+        filas = self._conexion.execute(
+            f"SELECT {_COLUMNAS} FROM productos ORDER BY {campo} {orden}, id {orden} LIMIT ?", (k,)
+        )
+        return [Producto(*fila) for fila in filas]
+
+    def contar(self) -> int:
+        """Lee el número de productos de la tabla de totales."""
+        return self._conexion.execute("SELECT productos FROM totales").fetchone()[0]
+
+    def totales(self) -> Totales:
+        """Lee los totales mantenidos por los triggers."""
+        return self._conexion.execute(
+            "SELECT items, valor, suma_precios FROM totales"
+        ).fetchone()
+
+    def recalcular_totales(self, corregir: bool = False) -> Totales:
+        """Recalcula los totales con una agregación sobre toda la tabla."""
+        cantidad, items, valor, suma_precios = self._conexion.execute(
+            "SELECT count(*), coalesce(sum(cantidad), 0), "
+            "coalesce(sum(cantidad * precio), 0.0), coalesce(sum(precio), 0.0) FROM productos"
+        ).fetchone()
+        if corregir:
+            with self._conexion:
+                self._conexion.execute(
+                    "UPDATE totales SET productos = ?, items = ?, valor = ?, suma_precios = ?",
+                    (cantidad, items, valor, suma_precios)
+                )
+        return items, float(valor), float(suma_precios)
+
+    def leer_siguiente_id(self) -> int:
+        """Lee el siguiente ID de la tabla de metadatos."""
+        return self._conexion.execute(
+            "SELECT valor FROM metadatos WHERE clave = 'siguiente_id'"
+        ).fetchone()[0]
+
+    def escribir_siguiente_id(self, siguiente_id: int) -> None:
+        """Guarda el siguiente ID en la tabla de metadatos."""
+        with self._conexion:
+            self._conexion.execute(
+                "UPDATE metadatos SET valor = ? WHERE clave = 'siguiente_id'", (siguiente_id,)
+            )
+
+    def vaciar(self) -> None:
+        """Elimina todos los productos y reinicia los totales y el siguiente ID."""
+        with self._conexion:
+            self._vaciar_tablas()
+
+    def _vaciar_tablas(self) -> None:
+        """Borra productos, totales y siguiente ID (dentro de una transacción abierta)."""
+        self._conexion.execute("DELETE FROM productos")
+        self._conexion.execute(
+            "UPDATE totales SET productos = 0, items = 0, valor = 0.0, suma_precios = 0.0"
+        )
+        self._conexion.execute("UPDATE metadatos SET valor = 1 WHERE clave = 'siguiente_id'")
+
+    def cerrar(self) -> None:
+        """Cierra la conexión con la base de datos."""
+        self._conexion.close()
+
+
+def _minusculas(texto: Optional[str]) -> Optional[str]:
+    """Versión de lower() con soporte Unicode para usar dentro de SQLite."""
+    return texto.lower() if texto is not None else None
+
+
+def _validar_campo(campo: str) -> None:
+    """Verifica que se pueda consultar por rango sobre el campo indicado."""
+    if campo not in CAMPOS_ORDENABLES:
+        raise ValueError(f"Campo no ordenable: {campo!r}")
+
+
+def lotes_desde_json(lector: LectorJSONIncremental,
+                     tamano_lote: int = 10_000) -> Iterator[List[Producto]]:
+    """Construye los productos que entrega un LectorJSONIncremental, en lotes."""
+    lote: List[Producto] = []
+    for datos in lector.valores():
+        lote.append(Producto.desde_diccionario(datos))
+        if len(lote) >= tamano_lote:
+            yield lote
+            lote = []
+    yield lote
+
+
+def migrar_json_a_sqlite(ruta_json: str, ruta_db: str, tamano_lote: int = 10_000) -> int:
+    """
+    Copia el inventario de un archivo JSON a una base de datos SQLite.
+
+    El JSON se lee con LectorJSONIncremental.valores() (por bloques si es
+    grande) y los productos se insertan en lotes dentro de una sola
+    transacción, por lo que un archivo grande nunca se carga completo. El
+    contenido anterior de la base de datos se borra en esa misma
+    transacción: si el JSON tiene una fila inválida, la base de datos queda
+    como estaba. Un ID repetido se queda con su última aparición.
+
+    Returns:
+        int: Cantidad de productos migrados
+    """
+    almacenamiento = AlmacenamientoSQLite(ruta_db)
+    try:
+        lector = LectorJSONIncremental(ruta_json)
+        total = almacenamiento.reemplazar(lotes_desde_json(lector, tamano_lote))
+        siguiente_id = lector.metadatos.get('siguiente_id', 1)
+        almacenamiento.escribir_siguiente_id(max(siguiente_id, almacenamiento.leer_siguiente_id()))
+        return total
+    finally:
+        almacenamiento.cerrar()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Migra un inventario JSON a SQLite")
+    parser.add_argument('origen', help="Archivo JSON del inventario")
+    parser.add_argument('destino', help="Base de datos SQLite a crear o reemplazar")
+    argumentos = parser.parse_args()
+    total = migrar_json_a_sqlite(argumentos.origen, argumentos.destino)
+    print(f"✓ {total} productos migrados a '{argumentos.destino}'")
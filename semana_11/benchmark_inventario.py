@@ -0,0 +1,601 @@
+"""
+Módulo Benchmark: Mide el rendimiento de operaciones del sistema de inventario.
+
+Este módulo contiene escenarios de medición que comparan distintas formas de
+realizar la misma tarea sobre el Inventario. Cada escenario imprime una tabla
+con los tiempos y retorna un diccionario con los resultados.
+
+Con `--json` los resultados se guardan en un archivo, y con `--linea-base` se
+comparan con los de un archivo guardado antes: las mediciones que empeoran más
+que `--tolerancia` se marcan como regresión y el programa termina con código 1.
+
+Uso:
+    python benchmark_inventario.py crud --productos 1000 10000 100000 1000000
+    python benchmark_inventario.py crud --json base.json
+    python benchmark_inventario.py crud --linea-base base.json --tolerancia 0.3
+    python benchmark_inventario.py lotes --productos 100000
+    python benchmark_inventario.py snapshot --productos 10000 100000 1000000
+    python benchmark_inventario.py lectura_json --productos 10000 200000 1000000
+    python benchmark_inventario.py concurrencia --productos 100000
+    python benchmark_inventario.py notificaciones --productos 100000
+    python benchmark_inventario.py sqlite --productos 10000 100000 1000000
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from inventario import Inventario
+from lector_json import LectorJSONIncremental
+from producto import Producto
+
+
+class _ProductoConDiccionario:
+    """
+    Copia de la disposición original de Producto, antes de `__slots__`.
+    
+    No hereda de Producto: una subclase de una clase con `__slots__` seguiría
+    guardando los atributos en las posiciones heredadas y su `__dict__`
+    quedaría vacío, así que no mediría la versión original.
+    """
+    
+    def __init__(self, id_producto: int, nombre: str, cantidad: int, precio: float):
+        """Guarda los mismos atributos que el Producto original."""
+        if cantidad < 0 or precio < 0:
+            raise ValueError("La cantidad y el precio no pueden ser negativos")
+        self._id = id_producto
+        self._nombre = nombre
+        self._cantidad = cantidad
+        self._precio = precio
+
+
+def medir(funcion: Callable, *args, **kwargs) -> float:
+    """Ejecuta una función y retorna el tiempo transcurrido en segundos."""
+    inicio = time.perf_counter()
+    funcion(*args, **kwargs)
+    return time.perf_counter() - inicio
+
+
+def generar_filas(cantidad: int) -> List[tuple]:
+    """Genera filas sintéticas (nombre, cantidad, precio) para las pruebas."""
+    return [
+        (f"Producto {i:07d}", i % 500, round(1 + (i % 1000) * 0.25, 2))
+        for i in range(cantidad)
+    ]
+
+
+def medir_por_operacion(funcion: Callable, operaciones: int,
+                        repeticiones: int = 5) -> float:
+    """
+    Retorna los segundos por operación de `funcion`, que realiza `operaciones`.
+    
+    Se toma la mejor de varias repeticiones para reducir el ruido de las
+    mediciones cortas.
+    """
+    return min(medir(funcion) for _ in range(repeticiones)) / operaciones
+
+
+def imprimir_tabla(titulo: str, resultados: Dict[str, float]) -> None:
+    """Imprime los tiempos de un escenario en forma de tabla."""
+    print("\n" + "="*60)
+    print(titulo)
+    print("="*60)
+    for nombre, segundos in resultados.items():
+        print(f"{nombre:<40} {segundos * 1000:>12.2f} ms")
+
+
+def benchmark_lotes(productos: int) -> Dict[str, float]:
+    """Compara las operaciones por lote con el bucle de operaciones individuales."""
+    filas = generar_filas(productos)
+
+    inv_individual = Inventario(":memory:")
+
+    def añadir_uno_a_uno():
+        for nombre, cantidad, precio in filas:
+            inv_individual.añadir_producto(nombre, cantidad, precio)
+
+    inv_lote = Inventario(":memory:")
+    resultados = {
+        'añadir_producto (bucle)': medir(añadir_uno_a_uno),
+        'añadir_productos (lote)': medir(inv_lote.añadir_productos, filas),
+    }
+
+    cambios = [(i + 1, i % 300, 2.5) for i in range(productos)]
+
+    def actualizar_uno_a_uno():
+        for id_producto, cantidad, precio in cambios:
+            inv_individual.actualizar_cantidad(id_producto, cantidad)
+            inv_individual.actualizar_precio(id_producto, precio)
+
+    resultados['actualizar_* (bucle)'] = medir(actualizar_uno_a_uno)
+    resultados['actualizar_productos (lote)'] = medir(inv_lote.actualizar_productos, cambios)
+
+    imprimir_tabla(f"OPERACIONES POR LOTE ({productos} productos)", resultados)
+    return resultados
+
+
+def medir_memoria(crear: Callable[[], object], productos: int) -> float:
+    """
+    Retorna los bytes asignados por producto al ejecutar `crear`.
+    
+    Lo que `crear` retorna se conserva hasta terminar la medición, para que
+    tracemalloc cuente todo lo que sigue vivo.
+    """
+    tracemalloc.start()
+    antes, _ = tracemalloc.get_traced_memory()
+    resultado = crear()
+    despues, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del resultado
+    return (despues - antes) / productos
+
+
+def benchmark_memoria(productos: int) -> Dict[str, float]:
+    """
+    Compara los bytes por producto con y sin `__slots__`, y dentro de un Inventario.
+    
+    Los nombres se crean antes de medir, así que las cifras no incluyen el
+    texto del nombre (que es igual en todas las variantes).
+    """
+    filas = generar_filas(productos)
+    
+    def instancias(clase: type) -> Callable[[], list]:
+        return lambda: [clase(i, nombre, cantidad, precio)
+                        for i, (nombre, cantidad, precio) in enumerate(filas, 1)]
+    
+    def suscritos() -> list:
+        creados = instancias(Producto)()
+        observador = Inventario(":memory:")._observador
+        for producto in creados:
+            producto.suscribir(observador)
+        return creados
+    
+    def inventario(con_indices_ordenados: bool) -> Callable[[], Inventario]:
+        def crear() -> Inventario:
+            inv = Inventario(":memory:")
+            inv.añadir_productos(filas)
+            if con_indices_ordenados:
+                # Las consultas por rango arman los índices ordenados.
+                inv.productos_en_rango_cantidad(0, 0)
+                inv.productos_en_rango_precio(0, 0)
+            return inv
+        return crear
+    
+    resultados = {
+        'Producto original (__dict__)': medir_memoria(instancias(_ProductoConDiccionario), productos),
+        'Producto con __slots__': medir_memoria(instancias(Producto), productos),
+        'Producto con __slots__ suscrito': medir_memoria(suscritos, productos),
+        'Inventario (productos + índices)': medir_memoria(inventario(False), productos),
+        'Inventario con índices ordenados': medir_memoria(inventario(True), productos),
+    }
+    print("\n" + "="*60)
+    print(f"MEMORIA POR PRODUCTO ({productos} productos)")
+    print("="*60)
+    for nombre, bytes_por_producto in resultados.items():
+        print(f"{nombre:<40} {bytes_por_producto:>12.1f} bytes")
+    original = resultados['Producto original (__dict__)']
+    for etiqueta, nombre in (('Ahorro con __slots__', 'Producto con __slots__'),
+                             ('Ahorro con __slots__ suscrito', 'Producto con __slots__ suscrito')):
+        print(f"{etiqueta:<40} {1 - resultados[nombre] / original:>12.1%}")
+    return resultados
+
+
+def benchmark_analitica(productos: int) -> Dict[str, float]:
+    """Compara consultas analíticas del inventario por diccionario y columnar."""
+    from inventario_columnar import InventarioColumnar
+
+    filas = generar_filas(productos)
+    resultados = {}
+    for etiqueta, inventario in (('diccionario', Inventario(":memory:")),
+                                 ('columnar', InventarioColumnar(":memory:"))):
+        inventario.añadir_productos(filas)
+        resultados[f'recalcular totales ({etiqueta})'] = medir(inventario.verificar_estadisticas)
+        resultados[f'cantidad < 10 ({etiqueta})'] = medir(inventario.productos_con_cantidad_menor, 10)
+        resultados[f'top 100 por valor ({etiqueta})'] = medir(inventario.productos_mayor_valor, 100)
+
+    imprimir_tabla(f"CONSULTAS ANALÍTICAS ({productos} productos)", resultados)
+    return resultados
+
+
+def benchmark_snapshot(productos: int) -> Dict[str, float]:
+    """Compara guardado, carga y tamaño del JSON frente al snapshot binario."""
+    inventario = Inventario(":memory:")
+    inventario.añadir_productos(generar_filas(productos))
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta_json = os.path.join(directorio, "inventario.json")
+        ruta_binaria = os.path.join(directorio, "inventario.bin")
+        inventario._ruta_archivo = ruta_json
+        resultados = {
+            'guardar JSON': medir(inventario.guardar_en_archivo),
+            'guardar binario': medir(inventario.guardar_snapshot_binario, ruta_binaria),
+            'cargar JSON': medir(inventario.cargar_desde_archivo),
+            'cargar binario (mmap)': medir(inventario.cargar_snapshot_binario, ruta_binaria),
+        }
+        tamanos = {
+            'JSON': os.path.getsize(ruta_json),
+            'binario': os.path.getsize(ruta_binaria),
+        }
+
+    imprimir_tabla(f"SNAPSHOT JSON VS BINARIO ({productos} productos)", resultados)
+    for formato, tamano in tamanos.items():
+        print(f"{'tamaño ' + formato:<40} {tamano / 1024:>12.1f} KiB")
+    resultados.update({f'bytes {formato}': tamano for formato, tamano in tamanos.items()})
+    return resultados
+
+
+def medir_lectura_json(ruta: str, umbral_carga_completa: int):
+    """
+    Construye los productos de un archivo JSON con LectorJSONIncremental.valores().
+    
+    Returns:
+        tuple: (segundos, pico de memoria en bytes durante la lectura)
+    """
+    def construir():
+        lector = LectorJSONIncremental(ruta, umbral_carga_completa=umbral_carga_completa)
+        return [Producto.desde_diccionario(datos) for datos in lector.valores()]
+    
+    segundos = min(medir(construir) for _ in range(3))
+    tracemalloc.start()
+    productos = construir()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del productos
+    return segundos, pico
+
+
+def benchmark_lectura_json(productos: int) -> Dict[str, float]:
+    """Compara leer el JSON completo con json.load frente a leerlo por bloques."""
+    inventario = Inventario(":memory:")
+    inventario.añadir_productos(generar_filas(productos))
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "inventario.json")
+        inventario._ruta_archivo = ruta
+        inventario.guardar_en_archivo()
+        tamano = os.path.getsize(ruta)
+        tiempo_completo, pico_completo = medir_lectura_json(ruta, tamano + 1)
+        tiempo_bloques, pico_bloques = medir_lectura_json(ruta, 0)
+    
+    resultados = {
+        'json.load + construir': tiempo_completo,
+        'por bloques + construir': tiempo_bloques,
+    }
+    imprimir_tabla(f"LECTURA DEL JSON ({productos} productos)", resultados)
+    print(f"{'pico memoria json.load':<40} {pico_completo / 2**20:>12.1f} MiB")
+    print(f"{'pico memoria por bloques':<40} {pico_bloques / 2**20:>12.1f} MiB")
+    print(f"{'por bloques / json.load':<40} {tiempo_bloques / tiempo_completo:>12.2f} x")
+    umbral = LectorJSONIncremental.UMBRAL_CARGA_COMPLETA
+    modo = "por bloques" if tamano >= umbral else "json.load"
+    print(f"Archivo de {tamano / 2**20:.1f} MiB: cargar_desde_archivo usa {modo} "
+          f"(umbral {umbral / 2**20:.0f} MiB)")
+    resultados.update({
+        'bytes pico json.load': pico_completo,
+        'bytes pico por bloques': pico_bloques,
+    })
+    return resultados
+
+
+CONSULTAS_POR_PRUEBA = 1_000
+
+
+def benchmark_sqlite(productos: int) -> Dict[str, float]:
+    """Compara el inventario JSON en memoria con el inventario sobre SQLite."""
+    from almacenamiento import AlmacenamientoSQLite, migrar_json_a_sqlite
+    from inventario_almacenado import InventarioAlmacenado
+
+    inventario = Inventario(":memory:")
+    inventario.añadir_productos(generar_filas(productos))
+    ids = [(i * 7919) % productos + 1 for i in range(CONSULTAS_POR_PRUEBA)]
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta_json = os.path.join(directorio, "inventario.json")
+        ruta_db = os.path.join(directorio, "inventario.db")
+        inventario._ruta_archivo = ruta_json
+        inventario.guardar_en_archivo()
+        resultados = {'migrar JSON a SQLite': medir(migrar_json_a_sqlite, ruta_json, ruta_db)}
+
+        inicio = time.perf_counter()
+        motor_json = Inventario(ruta_json)
+        resultados['inicio (JSON)'] = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        motor_sql = InventarioAlmacenado(AlmacenamientoSQLite(ruta_db))
+        resultados['inicio (SQLite)'] = time.perf_counter() - inicio
+
+        for etiqueta, motor in (('JSON', motor_json), ('SQLite', motor_sql)):
+            resultados[f'{CONSULTAS_POR_PRUEBA} buscar_por_id ({etiqueta})'] = medir(
+                lambda: [motor.buscar_por_id(id_producto) for id_producto in ids]
+            )
+            resultados[f'buscar_por_nombre ({etiqueta})'] = medir(motor.buscar_por_nombre, "0001234")
+            resultados[f'{CONSULTAS_POR_PRUEBA} actualizar_cantidad ({etiqueta})'] = medir(
+                lambda: [motor.actualizar_cantidad(id_producto, 7) for id_producto in ids]
+            )
+            resultados[f'obtener_estadisticas ({etiqueta})'] = medir(motor.obtener_estadisticas)
+        # Con JSON los cambios solo quedan en disco al reescribir el archivo.
+        resultados['guardar cambios (JSON)'] = medir(motor_json.guardar_en_archivo)
+        motor_sql.cerrar()
+
+    imprimir_tabla(f"JSON EN MEMORIA VS SQLITE ({productos} productos)", resultados)
+    return resultados
+
+
+OPERACIONES_POR_MEDICION = 1_000
+BUSQUEDAS_POR_NOMBRE = 20
+
+
+def benchmark_crud(productos: int) -> Dict[str, float]:
+    """Mide las operaciones básicas del Inventario, en segundos por operación."""
+    aleatorio = random.Random(productos)
+    ids = [aleatorio.randint(1, productos) for _ in range(OPERACIONES_POR_MEDICION)]
+    nombres = [f"{aleatorio.randrange(productos):07d}" for _ in range(BUSQUEDAS_POR_NOMBRE)]
+    # Con inventarios grandes guardar y cargar tardan segundos: basta una medición.
+    repeticiones_archivo = 3 if productos <= 100_000 else 1
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "inventario.json")
+        inventario = Inventario(ruta)
+        inventario.añadir_productos(generar_filas(productos))
+        resultados = {
+            'añadir_producto': medir_por_operacion(
+                lambda: [inventario.añadir_producto("Producto nuevo", 1, 1.5)
+                         for _ in range(OPERACIONES_POR_MEDICION)],
+                OPERACIONES_POR_MEDICION
+            ),
+            'buscar_por_id': medir_por_operacion(
+                lambda: [inventario.buscar_por_id(id_producto) for id_producto in ids],
+                OPERACIONES_POR_MEDICION
+            ),
+            'buscar_por_nombre': medir_por_operacion(
+                lambda: [inventario.buscar_por_nombre(nombre) for nombre in nombres],
+                BUSQUEDAS_POR_NOMBRE
+            ),
+            'obtener_estadisticas': medir_por_operacion(
+                lambda: [inventario.obtener_estadisticas()
+                         for _ in range(OPERACIONES_POR_MEDICION)],
+                OPERACIONES_POR_MEDICION
+            ),
+            'guardar_en_archivo': medir_por_operacion(
+                inventario.guardar_en_archivo, 1, repeticiones_archivo
+            ),
+            'cargar_desde_archivo': medir_por_operacion(
+                inventario.cargar_desde_archivo, 1, repeticiones_archivo
+            ),
+        }
+
+    print("\n" + "="*60)
+    print(f"OPERACIONES BÁSICAS ({productos} productos)")
+    print("="*60)
+    for nombre, segundos in resultados.items():
+        print(f"{nombre:<40} {segundos * 1e6:>12.2f} µs/op")
+    return resultados
+
+
+HILOS_CONCURRENCIA = (1, 4, 16)
+LECTURAS_POR_PRUEBA = 40_000
+
+
+def medir_lecturas_concurrentes(inventario, hilos: int, con_escritor: bool) -> float:
+    """
+    Reparte LECTURAS_POR_PRUEBA consultas entre `hilos` hilos y retorna lecturas/s.
+
+    Si `con_escritor` es True, un hilo adicional actualiza cantidades
+    mientras duran las lecturas.
+    """
+    total_productos = inventario.obtener_cantidad_productos()
+    lecturas_por_hilo = LECTURAS_POR_PRUEBA // hilos
+    barrera = threading.Barrier(hilos + 1)
+    terminado = threading.Event()
+
+    def leer(semilla: int):
+        barrera.wait()
+        for i in range(lecturas_por_hilo):
+            id_producto = (semilla * 7919 + i) % total_productos + 1
+            if i % 10 == 0:
+                inventario.obtener_estadisticas()
+            else:
+                inventario.buscar_por_id(id_producto)
+
+    def escribir():
+        i = 0
+        while not terminado.is_set():
+            inventario.actualizar_cantidad(i % total_productos + 1, i % 500)
+            i += 1
+
+    lectores = [threading.Thread(target=leer, args=(n,)) for n in range(hilos)]
+    escritor = threading.Thread(target=escribir) if con_escritor else None
+    for hilo in lectores:
+        hilo.start()
+    if escritor is not None:
+        escritor.start()
+    inicio = time.perf_counter()
+    barrera.wait()
+    for hilo in lectores:
+        hilo.join()
+    segundos = time.perf_counter() - inicio
+    terminado.set()
+    if escritor is not None:
+        escritor.join()
+    return lecturas_por_hilo * hilos / segundos
+
+
+def benchmark_concurrencia(productos: int) -> Dict[str, float]:
+    """Mide lecturas por segundo del InventarioConcurrente con 1, 4 y 16 hilos."""
+    from concurrencia import InventarioConcurrente
+
+    inventario = InventarioConcurrente(":memory:")
+    inventario.añadir_productos(generar_filas(productos))
+    resultados = {}
+    for hilos in HILOS_CONCURRENCIA:
+        resultados[f'{hilos} hilos'] = medir_lecturas_concurrentes(inventario, hilos, False)
+        resultados[f'{hilos} hilos + 1 escritor'] = medir_lecturas_concurrentes(
+            inventario, hilos, True
+        )
+
+    print("\n" + "="*60)
+    print(f"LECTURAS CONCURRENTES ({productos} productos)")
+    print("="*60)
+    for nombre, lecturas in resultados.items():
+        print(f"{nombre:<40} {lecturas:>12,.0f} lect/s")
+    return resultados
+
+
+def medir_asignaciones(productos: List[Producto]) -> float:
+    """Retorna los nanosegundos por asignación de `cantidad` sobre los productos."""
+    def asignar():
+        for producto in productos:
+            producto.cantidad = 1
+            producto.cantidad = 2
+    return medir(asignar) * 1e9 / (2 * len(productos))
+
+
+def benchmark_notificaciones(productos: int) -> Dict[str, float]:
+    """Mide el costo de un setter según quién esté suscrito al producto."""
+    def nuevos():
+        return [Producto(i, f"Producto {i:07d}", 0, 1.5) for i in range(productos)]
+
+    def observador_vacio(producto, atributo, valor_anterior, valor_nuevo):
+        pass
+
+    resultados = {'sin observadores': medir_asignaciones(nuevos())}
+    for cantidad in (1, 4):
+        sueltos = nuevos()
+        observadores = [
+            lambda producto, atributo, anterior, nuevo: None for _ in range(cantidad)
+        ]
+        for producto in sueltos:
+            for observador in observadores:
+                producto.suscribir(observador)
+        resultados[f'{cantidad} observador(es) vacío(s)'] = medir_asignaciones(sueltos)
+
+    inventario = Inventario(":memory:")
+    inventario.añadir_productos(generar_filas(productos))
+    contenidos = inventario.obtener_todos_productos()
+    resultados['Inventario (totales)'] = medir_asignaciones(contenidos)
+    inventario.productos_en_rango_cantidad(0, 0)
+    resultados['Inventario (totales + índice ordenado)'] = medir_asignaciones(contenidos)
+
+    tracemalloc.start()
+    sueltos = nuevos()
+    antes, _ = tracemalloc.get_traced_memory()
+    for producto in sueltos:
+        producto.suscribir(observador_vacio)
+    despues, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    resultados['memoria por suscripción (bytes)'] = (despues - antes) / productos
+
+    print("\n" + "="*60)
+    print(f"COSTO DE LOS AVISOS DE CAMBIO ({productos} productos)")
+    print("="*60)
+    for nombre, valor in resultados.items():
+        unidad = "bytes" if 'bytes' in nombre else "ns/asig"
+        print(f"{nombre:<40} {valor:>12.1f} {unidad}")
+    return resultados
+
+
+ESCENARIOS = {
+    'analitica': benchmark_analitica,
+    'concurrencia': benchmark_concurrencia,
+    'crud': benchmark_crud,
+    'lectura_json': benchmark_lectura_json,
+    'lotes': benchmark_lotes,
+    'memoria': benchmark_memoria,
+    'notificaciones': benchmark_notificaciones,
+    'snapshot': benchmark_snapshot,
+    'sqlite': benchmark_sqlite,
+}
+
+
+# Escenarios que miden un rendimiento (más es mejor); el resto mide tiempos o bytes.
+ESCENARIOS_MAYOR_ES_MEJOR = {'concurrencia'}
+
+
+def comparar_con_linea_base(informe: Dict, linea_base: Dict,
+                            tolerancia: float) -> List[str]:
+    """
+    Compara un informe con otro guardado antes del mismo escenario.
+    
+    Args:
+        informe (Dict): Resultados actuales, con el formato de `--json`
+        linea_base (Dict): Resultados de referencia, con el mismo formato
+        tolerancia (float): Empeoramiento relativo admitido (0.25 = 25%)
+        
+    Returns:
+        List[str]: Descripción de cada medición que empeoró más de lo admitido
+        
+    Raises:
+        ValueError: Si la línea base es de otro escenario
+    """
+    if linea_base.get('escenario') != informe['escenario']:
+        raise ValueError(
+            f"La línea base es del escenario '{linea_base.get('escenario')}', "
+            f"no de '{informe['escenario']}'"
+        )
+    mayor_es_mejor = informe['escenario'] in ESCENARIOS_MAYOR_ES_MEJOR
+    regresiones = []
+    print("\n" + "="*60)
+    print(f"COMPARACIÓN CON LA LÍNEA BASE (tolerancia {tolerancia:.0%})")
+    print("="*60)
+    for productos, resultados in informe['resultados'].items():
+        referencia = linea_base['resultados'].get(productos, {})
+        for nombre, valor in resultados.items():
+            if nombre not in referencia or not referencia[nombre]:
+                continue
+            relacion = valor / referencia[nombre]
+            if mayor_es_mejor:
+                empeora = relacion < 1 / (1 + tolerancia)
+            else:
+                empeora = relacion > 1 + tolerancia
+            marca = "REGRESIÓN" if empeora else "ok"
+            print(f"{productos + ' ' + nombre:<48} x{relacion:>6.2f}  {marca}")
+            if empeora:
+                regresiones.append(f"{nombre} con {productos} productos: x{relacion:.2f}")
+    return regresiones
+
+
+def main() -> None:
+    """Función principal: ejecuta el escenario indicado en la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Benchmarks del inventario")
+    parser.add_argument('escenario', choices=sorted(ESCENARIOS))
+    parser.add_argument('--productos', type=int, nargs='+', default=[100_000],
+                        help="Número(s) de productos sintéticos, p. ej. 10000 100000 1000000")
+    parser.add_argument('--json', metavar='RUTA',
+                        help="Guarda los resultados en un archivo JSON")
+    parser.add_argument('--linea-base', metavar='RUTA',
+                        help="Archivo guardado con --json contra el que buscar regresiones")
+    parser.add_argument('--tolerancia', type=float, default=0.25,
+                        help="Empeoramiento relativo admitido frente a la línea base")
+    argumentos = parser.parse_args()
+    informe = {
+        'escenario': argumentos.escenario,
+        'python': platform.python_version(),
+        'resultados': {
+            str(productos): ESCENARIOS[argumentos.escenario](productos)
+            for productos in argumentos.productos
+        },
+    }
+    if argumentos.json:
+        with open(argumentos.json, 'w', encoding='utf-8') as archivo:
+            json.dump(informe, archivo, indent=4, ensure_ascii=False)
+        print(f"\n✓ Resultados guardados en '{argumentos.json}'")
+    if argumentos.linea_base:
+        with open(argumentos.linea_base, 'r', encoding='utf-8') as archivo:
+            linea_base = json.load(archivo)
+        regresiones = comparar_con_linea_base(informe, linea_base, argumentos.tolerancia)
+        if regresiones:
+            print(f"\n✗ {len(regresiones)} regresión(es) frente a la línea base:")
+            for regresion in regresiones:
+                print(f"  - {regresion}")
+            sys.exit(1)
+        print("\n✓ Sin regresiones frente a la línea base")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Módulo Concurrencia: Acceso seguro al inventario desde varios hilos.
+
+Este módulo contiene el cerrojo de lectura/escritura CerrojoLecturaEscritura y
+la clase InventarioConcurrente, que protege cada método público de Inventario
+con ese cerrojo: las búsquedas y estadísticas se ejecutan en paralelo, los
+guardados se ejecutan de a uno (escriben el mismo archivo) pero junto con las
+consultas, y las altas, bajas, actualizaciones y cargas se ejecutan de a una y
+sin lecturas simultáneas.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from inventario import Inventario
+
+
+class CerrojoLecturaEscritura:
+    """
+    Cerrojo que admite varios lectores o un único escritor a la vez.
+
+    Da preferencia a los escritores: cuando uno espera, los nuevos lectores
+    aguardan a que termine, para que un flujo continuo de lecturas no deje
+    sin turno a las escrituras.
+
+    Es reentrante dentro de un mismo hilo: quien tiene el cerrojo de lectura
+    puede volver a leer, y quien tiene el de escritura puede leer y volver a
+    escribir. Pasar de lectura a escritura no está permitido.
+    """
+
+    def __init__(self):
+        """Inicializa el cerrojo libre."""
+        self._condicion = threading.Condition(threading.Lock())
+        self._lectores = 0
+        self._escritores_esperando = 0
+        self._escritor = None
+        self._profundidad_escritura = 0
+        self._local = threading.local()
+
+    def adquirir_lectura(self) -> None:
+        """Espera hasta poder leer (sin escritor activo ni en espera)."""
+        lecturas = getattr(self._local, 'lecturas', 0)
+        if lecturas or self._escritor == threading.get_ident():
+            # Lectura anidada: el hilo ya tiene acceso.
+            self._local.lecturas = lecturas + 1
+            return
+        with self._condicion:
+            while self._escritor is not None or self._escritores_esperando:
+                self._condicion.wait()
+            self._lectores += 1
+        self._local.lecturas = 1
+
+    def liberar_lectura(self) -> None:
+        """Libera una lectura adquirida por el hilo actual."""
+        self._local.lecturas -= 1
+        if self._local.lecturas or self._escritor == threading.get_ident():
+            return
+        with self._condicion:
+            self._lectores -= 1
+            if not self._lectores:
+                self._condicion.notify_all()
+
+    def adquirir_escritura(self) -> None:
+        """
+        Espera hasta tener acceso exclusivo.
+
+        Raises:
+            RuntimeError: Si el hilo tiene el cerrojo de lectura
+        """
+        identificador = threading.get_ident()
+        if self._escritor == identificador:
+            self._profundidad_escritura += 1
+            return
+        if getattr(self._local, 'lecturas', 0):
+            raise RuntimeError("No se puede pasar de lectura a escritura")
+        with self._condicion:
+            self._escritores_esperando += 1
+            while self._escritor is not None or self._lectores:
+                self._condicion.wait()
+            self._escritores_esperando -= 1
+            self._escritor = identificador
+            self._profundidad_escritura = 1
+
+    def liberar_escritura(self) -> None:
+        """Libera una escritura adquirida por el hilo actual."""
+        with self._condicion:
+            self._profundidad_escritura -= 1
+            if not self._profundidad_escritura:
+                self._escritor = None
+                self._condicion.notify_all()
+
+    @contextmanager
+    def lectura(self) -> Iterator[None]:
+        """Mantiene el cerrojo de lectura dentro de un bloque with."""
+        self.adquirir_lectura()
+        try:
+            yield
+        finally:
+            self.liberar_lectura()
+
+    @contextmanager
+    def escritura(self) -> Iterator[None]:
+        """Mantiene el cerrojo de escritura dentro de un bloque with."""
+        self.adquirir_escritura()
+        try:
+            yield
+        finally:
+            self.liberar_escritura()
+
+
+def _en_lectura(nombre: str):
+    """Crea un método que llama al método `nombre` de la clase base bajo lectura."""
+    def metodo(self, *args, **kwargs):
+        with self._cerrojo.lectura():
+            return getattr(super(AccesoConcurrente, self), nombre)(*args, **kwargs)
+    metodo.__name__ = nombre
+    metodo.__doc__ = f"Ejecuta `{nombre}` con el cerrojo de lectura."
+    return metodo
+
+
+def _en_escritura(nombre: str):
+    """Crea un método que llama al método `nombre` de la clase base bajo escritura."""
+    def metodo(self, *args, **kwargs):
+        with self._cerrojo.escritura():
+            return getattr(super(AccesoConcurrente, self), nombre)(*args, **kwargs)
+    metodo.__name__ = nombre
+    metodo.__doc__ = f"Ejecuta `{nombre}` con el cerrojo de escritura."
+    return metodo
+
+
+def _en_guardado(nombre: str):
+    """
+    Crea un método que llama al método `nombre` de la clase base bajo lectura
+    y con el cerrojo de guardado, para que dos guardados no escriban a la vez
+    el mismo archivo.
+    """
+    def metodo(self, *args, **kwargs):
+        with self._cerrojo.lectura(), self._cerrojo_guardado:
+            return getattr(super(AccesoConcurrente, self), nombre)(*args, **kwargs)
+    metodo.__name__ = nombre
+    metodo.__doc__ = f"Ejecuta `{nombre}` con el cerrojo de lectura, de a un guardado por vez."
+    return metodo
+
+
+class AccesoConcurrente:
+    """
+    Mezcla que protege los métodos públicos de un inventario con un
+    CerrojoLecturaEscritura.
+
+    Se combina con Inventario o con cualquiera de sus subclases, por ejemplo
+    ``class ColumnarConcurrente(AccesoConcurrente, InventarioColumnar)``.
+
+    Los productos retornados siguen siendo los objetos del inventario: para
+    modificarlos desde varios hilos hay que usar los métodos del inventario
+    y no los setters de Producto.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Crea el cerrojo antes de que el inventario cargue su archivo."""
+        self._cerrojo = CerrojoLecturaEscritura()
+        self._cerrojo_guardado = threading.RLock()
+        super().__init__(*args, **kwargs)
+
+    # Consultas: varias a la vez
+    obtener_siguiente_id = _en_lectura('obtener_siguiente_id')
+    buscar_por_id = _en_lectura('buscar_por_id')
+    buscar_por_nombre = _en_lectura('buscar_por_nombre')
+    obtener_todos_productos = _en_lectura('obtener_todos_productos')
+    # iterar_productos no se envuelve: cada página que pide toma el cerrojo.
+    obtener_pagina = _en_lectura('obtener_pagina')
+    obtener_cantidad_productos = _en_lectura('obtener_cantidad_productos')
+    obtener_cantidad_items = _en_lectura('obtener_cantidad_items')
+    obtener_valor_total_inventario = _en_lectura('obtener_valor_total_inventario')
+    productos_con_cantidad_menor = _en_lectura('productos_con_cantidad_menor')
+    productos_mayor_valor = _en_lectura('productos_mayor_valor')
+    productos_en_rango_precio = _en_lectura('productos_en_rango_precio')
+    productos_en_rango_cantidad = _en_lectura('productos_en_rango_cantidad')
+    productos_mayor_precio = _en_lectura('productos_mayor_precio')
+    productos_menor_cantidad = _en_lectura('productos_menor_cantidad')
+    producto_existe = _en_lectura('producto_existe')
+    obtener_estadisticas = _en_lectura('obtener_estadisticas')
+    __str__ = _en_lectura('__str__')
+
+    # Guardados: de a uno, en paralelo con las consultas
+    guardar_en_archivo = _en_guardado('guardar_en_archivo')
+    guardar_snapshot_binario = _en_guardado('guardar_snapshot_binario')
+
+    # Modificaciones: de a una
+    reservar_ids = _en_escritura('reservar_ids')
+    añadir_producto = _en_escritura('añadir_producto')
+    eliminar_producto = _en_escritura('eliminar_producto')
+    actualizar_cantidad = _en_escritura('actualizar_cantidad')
+    actualizar_precio = _en_escritura('actualizar_precio')
+    añadir_productos = _en_escritura('añadir_productos')
+    actualizar_productos = _en_escritura('actualizar_productos')
+    cargar_desde_archivo = _en_escritura('cargar_desde_archivo')
+    cargar_snapshot_binario = _en_escritura('cargar_snapshot_binario')
+
+    def verificar_estadisticas(self, corregir: bool = False) -> bool:
+        """Verifica los totales; solo toma el cerrojo de escritura si va a corregirlos."""
+        cerrojo = self._cerrojo.escritura() if corregir else self._cerrojo.lectura()
+        with cerrojo:
+            return super().verificar_estadisticas(corregir)
+
+
+class InventarioConcurrente(AccesoConcurrente, Inventario):
+    """
+    Inventario seguro para usar desde varios hilos.
+
+    Ofrece la misma interfaz que Inventario. Las lecturas se ejecutan en
+    paralelo y cada modificación es atómica respecto de las demás: por
+    ejemplo, dos llamadas simultáneas a `añadir_producto` nunca reciben el
+    mismo ID y `guardar_en_archivo` nunca ve el inventario a medio modificar.
+    """
+
+    def __repr__(self) -> str:
+        """Retorna una representación técnica del inventario."""
+        return f"InventarioConcurrente(productos={len(self._productos)})"
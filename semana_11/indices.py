@@ -0,0 +1,332 @@
+"""
+Módulo Indices: Define estructuras auxiliares para acelerar las búsquedas del inventario.
+
+Este módulo contiene índices que el Inventario mantiene actualizados de forma
+incremental al añadir, eliminar o modificar productos, evitando recorrer toda
+la colección en cada consulta: trigramas de nombres, IDs ordenados para
+paginar y valores ordenados (precio, cantidad) para consultas por rango.
+"""
+
+import bisect
+import math
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+class IndiceTrigramas:
+    """
+    Índice invertido de trigramas para búsquedas parciales por nombre.
+    
+    Cada nombre se normaliza a minúsculas y se descompone en todas sus
+    subcadenas de tres caracteres. Una consulta de tres o más caracteres solo
+    puede coincidir con nombres que contengan todos sus trigramas, por lo que
+    basta intersectar las listas de IDs de cada trigrama y verificar los pocos
+    candidatos resultantes.
+    
+    Atributos:
+        _publicaciones (Dict[str, Set[int]]): Trigrama -> IDs que lo contienen
+        _nombres (Dict[int, str]): ID -> nombre normalizado en minúsculas
+    """
+    
+    TAMANO = 3
+    
+    def __init__(self):
+        """Inicializa un índice vacío."""
+        self._publicaciones: Dict[str, Set[int]] = {}
+        self._nombres: Dict[int, str] = {}
+    
+    @classmethod
+    def _trigramas(cls, texto: str) -> Set[str]:
+        """Retorna el conjunto de trigramas de un texto ya normalizado."""
+        return {texto[i:i + cls.TAMANO] for i in range(len(texto) - cls.TAMANO + 1)}
+    
+    def agregar(self, id_producto: int, nombre: str) -> None:
+        """Indexa el nombre de un producto."""
+        nombre_lower = nombre.lower()
+        self._nombres[id_producto] = nombre_lower
+        for trigrama in self._trigramas(nombre_lower):
+            self._publicaciones.setdefault(trigrama, set()).add(id_producto)
+    
+    def agregar_varios(self, pares: Iterable[Tuple[int, str]]) -> None:
+        """Indexa varios pares (ID, nombre) con menos sobrecarga por elemento."""
+        nombres = self._nombres
+        publicaciones = self._publicaciones
+        tamano = self.TAMANO
+        for id_producto, nombre in pares:
+            nombre_lower = nombre.lower()
+            nombres[id_producto] = nombre_lower
+            for i in range(len(nombre_lower) - tamano + 1):
+                trigrama = nombre_lower[i:i + tamano]
+                ids = publicaciones.get(trigrama)
+                if ids is None:
+                    publicaciones[trigrama] = {id_producto}
+                else:
+                    ids.add(id_producto)
+    
+    def quitar(self, id_producto: int) -> None:
+        """Elimina un producto del índice si estaba indexado."""
+        nombre_lower = self._nombres.pop(id_producto, None)
+        if nombre_lower is None:
+            return
+        for trigrama in self._trigramas(nombre_lower):
+            ids = self._publicaciones[trigrama]
+            ids.discard(id_producto)
+            if not ids:
+                del self._publicaciones[trigrama]
+    
+    def actualizar(self, id_producto: int, nuevo_nombre: str) -> None:
+        """Reindexa un producto cuyo nombre cambió."""
+        self.quitar(id_producto)
+        self.agregar(id_producto, nuevo_nombre)
+    
+    def limpiar(self) -> None:
+        """Vacía el índice."""
+        self._publicaciones.clear()
+        self._nombres.clear()
+    
+    def buscar(self, consulta: str) -> List[int]:
+        """
+        Busca los IDs cuyo nombre contiene la consulta (sin importar mayúsculas).
+        
+        Args:
+            consulta (str): Texto a buscar
+            
+        Returns:
+            List[int]: IDs coincidentes ordenados de menor a mayor
+        """
+        consulta_lower = consulta.lower()
+        if len(consulta_lower) < self.TAMANO:
+            # Las consultas cortas no tienen trigramas: se recorren los
+            # nombres ya normalizados, sin volver a convertirlos.
+            return sorted(
+                id_producto for id_producto, nombre in self._nombres.items()
+                if consulta_lower in nombre
+            )
+        
+        publicaciones = []
+        for trigrama in self._trigramas(consulta_lower):
+            ids = self._publicaciones.get(trigrama)
+            if not ids:
+                return []
+            publicaciones.append(ids)
+        
+        publicaciones.sort(key=len)
+        candidatos = publicaciones[0].intersection(*publicaciones[1:])
+        # Tener todos los trigramas no garantiza que aparezcan contiguos.
+        return sorted(
+            id_producto for id_producto in candidatos
+            if consulta_lower in self._nombres[id_producto]
+        )
+
+
+class IdsOrdenados:
+    """
+    Lista ordenada de IDs para recorrer el inventario por páginas.
+    
+    Una página se ubica con búsqueda binaria a partir del último ID de la
+    página anterior, por lo que cuesta O(log n + tamaño) y no depende de
+    cuántas páginas se hayan leído antes. Los IDs nuevos suelen ser mayores
+    que todos los existentes y en ese caso agregarlos es O(1).
+    
+    Atributos:
+        _ids (List[int]): IDs ordenados de menor a mayor
+    """
+    
+    def __init__(self, ids: Iterable[int] = ()):
+        """Inicializa la lista con los IDs indicados."""
+        self._ids: List[int] = sorted(ids)
+    
+    def __len__(self) -> int:
+        """Retorna la cantidad de IDs."""
+        return len(self._ids)
+    
+    def agregar(self, id_producto: int) -> None:
+        """Inserta un ID manteniendo el orden."""
+        if not self._ids or id_producto > self._ids[-1]:
+            self._ids.append(id_producto)
+        else:
+            bisect.insort(self._ids, id_producto)
+    
+    def agregar_varios(self, ids: Iterable[int]) -> None:
+        """Inserta varios IDs y reordena una sola vez si hace falta."""
+        inicio = max(len(self._ids) - 1, 0)
+        self._ids.extend(ids)
+        cola = self._ids[inicio:]
+        if any(a > b for a, b in zip(cola, cola[1:])):
+            self._ids.sort()
+    
+    def quitar(self, id_producto: int) -> None:
+        """Elimina un ID si está en la lista."""
+        posicion = bisect.bisect_left(self._ids, id_producto)
+        if posicion < len(self._ids) and self._ids[posicion] == id_producto:
+            del self._ids[posicion]
+    
+    def limpiar(self) -> None:
+        """Vacía la lista."""
+        self._ids.clear()
+    
+    def pagina(self, despues_de: Optional[int], tamano: int) -> Tuple[List[int], bool]:
+        """
+        Retorna los primeros `tamano` IDs mayores que `despues_de`.
+        
+        Args:
+            despues_de (int, opcional): Último ID de la página anterior, o
+                None para empezar desde el principio
+            tamano (int): Cantidad máxima de IDs
+            
+        Returns:
+            Tuple[List[int], bool]: IDs de la página e indicador de si quedan
+                más IDs después de ella
+        """
+        inicio = 0 if despues_de is None else bisect.bisect_right(self._ids, despues_de)
+        return self._ids[inicio:inicio + tamano], inicio + tamano < len(self._ids)
+
+
+class IndiceOrdenado:
+    """
+    Índice secundario que mantiene los productos ordenados por un valor.
+    
+    Guarda pares (valor, ID), por lo que los empates se resuelven por ID y
+    cada par es único. Los pares se reparten en sublistas ordenadas de unos
+    CARGA elementos (una lista ordenada por bloques): agregar o quitar un par
+    ubica su sublista con búsqueda binaria sobre los máximos y solo desplaza
+    esa sublista, en O(log n + CARGA) en lugar de O(n) como en una lista
+    única. Las consultas por rango y los k extremos cuestan O(log n + k).
+    
+    Atributos:
+        _sublistas (List[List[Tuple[float, int]]]): Pares ordenados, por bloques
+        _maximos (List[Tuple[float, int]]): Último par de cada sublista
+        _valores (Dict[int, float]): ID -> valor indexado
+    """
+    
+    CARGA = 512
+    
+    def __init__(self):
+        """Inicializa un índice vacío."""
+        self._sublistas: List[List[Tuple[float, int]]] = []
+        self._maximos: List[Tuple[float, int]] = []
+        self._valores: Dict[int, float] = {}
+    
+    def __len__(self) -> int:
+        """Retorna la cantidad de productos indexados."""
+        return len(self._valores)
+    
+    def agregar(self, id_producto: int, valor: float) -> None:
+        """Indexa un producto con su valor."""
+        entrada = (valor, id_producto)
+        self._valores[id_producto] = valor
+        if not self._sublistas:
+            self._sublistas.append([entrada])
+            self._maximos.append(entrada)
+            return
+        posicion = bisect.bisect_left(self._maximos, entrada)
+        if posicion == len(self._maximos):
+            # Mayor que todos: va al final de la última sublista.
+            posicion -= 1
+            sublista = self._sublistas[posicion]
+            sublista.append(entrada)
+            self._maximos[posicion] = entrada
+        else:
+            sublista = self._sublistas[posicion]
+            bisect.insort(sublista, entrada)
+        if len(sublista) > 2 * self.CARGA:
+            mitad = sublista[self.CARGA:]
+            del sublista[self.CARGA:]
+            self._sublistas.insert(posicion + 1, mitad)
+            self._maximos[posicion] = sublista[-1]
+            self._maximos.insert(posicion + 1, mitad[-1])
+    
+    def agregar_varios(self, pares: Iterable[Tuple[int, float]]) -> None:
+        """Indexa varios pares (ID, valor) reconstruyendo las sublistas una sola vez."""
+        nuevos = [(valor, id_producto) for id_producto, valor in pares]
+        self._valores.update((id_producto, valor) for valor, id_producto in nuevos)
+        entradas = [entrada for sublista in self._sublistas for entrada in sublista]
+        entradas.extend(nuevos)
+        entradas.sort()
+        self._sublistas = [
+            entradas[inicio:inicio + self.CARGA] for inicio in range(0, len(entradas), self.CARGA)
+        ]
+        self._maximos = [sublista[-1] for sublista in self._sublistas]
+    
+    def quitar(self, id_producto: int) -> None:
+        """Elimina un producto del índice si estaba indexado."""
+        valor = self._valores.pop(id_producto, None)
+        if valor is None:
+            return
+        entrada = (valor, id_producto)
+        posicion = bisect.bisect_left(self._maximos, entrada)
+        sublista = self._sublistas[posicion]
+        indice = bisect.bisect_left(sublista, entrada)
+        del sublista[indice]
+        if not sublista:
+            del self._sublistas[posicion]
+            del self._maximos[posicion]
+        elif indice == len(sublista):
+            self._maximos[posicion] = sublista[-1]
+    
+    def actualizar(self, id_producto: int, nuevo_valor: float) -> None:
+        """Reindexa un producto cuyo valor cambió."""
+        self.quitar(id_producto)
+        self.agregar(id_producto, nuevo_valor)
+    
+    def limpiar(self) -> None:
+        """Vacía el índice."""
+        self._sublistas.clear()
+        self._maximos.clear()
+        self._valores.clear()
+    
+    def rango(self, minimo: Optional[float] = None,
+              maximo: Optional[float] = None) -> List[int]:
+        """
+        Busca los IDs cuyo valor está entre `minimo` y `maximo` (inclusive).
+        
+        Args:
+            minimo (float, opcional): Límite inferior; None para no limitar
+            maximo (float, opcional): Límite superior; None para no limitar
+            
+        Returns:
+            List[int]: IDs ordenados por valor (y por ID en los empates)
+        """
+        inicio = (0, 0) if minimo is None else self._primera_posicion((minimo,))
+        fin = ((len(self._sublistas), 0) if maximo is None
+               else self._primera_posicion((maximo, math.inf)))
+        return self._ids_entre(inicio, fin)
+    
+    def menores_que(self, umbral: float) -> List[int]:
+        """Retorna los IDs con valor < umbral, ordenados por valor."""
+        return self._ids_entre((0, 0), self._primera_posicion((umbral,)))
+    
+    def menores(self, k: int) -> List[int]:
+        """Retorna los IDs de los k menores valores, de menor a mayor."""
+        ids: List[int] = []
+        for sublista in self._sublistas:
+            if len(ids) >= k:
+                break
+            ids.extend(id_producto for _, id_producto in sublista[:k - len(ids)])
+        return ids
+    
+    def mayores(self, k: int) -> List[int]:
+        """Retorna los IDs de los k mayores valores, de mayor a menor."""
+        ids: List[int] = []
+        for sublista in reversed(self._sublistas):
+            if len(ids) >= k:
+                break
+            faltan = k - len(ids)
+            ids.extend(id_producto for _, id_producto in reversed(sublista[-faltan:]))
+        return ids
+    
+    def _primera_posicion(self, clave: tuple) -> Tuple[int, int]:
+        """Retorna (sublista, índice) del primer par >= clave."""
+        posicion = bisect.bisect_left(self._maximos, clave)
+        if posicion == len(self._sublistas):
+            return posicion, 0
+        return posicion, bisect.bisect_left(self._sublistas[posicion], clave)
+    
+    def _ids_entre(self, inicio: Tuple[int, int], fin: Tuple[int, int]) -> List[int]:
+        """Retorna los IDs de los pares desde la posición `inicio` hasta `fin` (excluida)."""
+        ids: List[int] = []
+        for posicion in range(inicio[0], min(fin[0] + 1, len(self._sublistas))):
+            sublista = self._sublistas[posicion]
+            desde = inicio[1] if posicion == inicio[0] else 0
+            hasta = fin[1] if posicion == fin[0] else len(sublista)
+            ids.extend(id_producto for _, id_producto in sublista[desde:hasta])
+        return ids
@@ -6,10 +6,16 @@ almacenar y gestionar productos, con métodos para operaciones CRUD (Create, Rea
 y almacenamiento persistente en archivos JSON.
 """
 
+import heapq
 import json
+import math
 import os
-from typing import Dict, List, Optional
+import struct
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from producto import Producto
+from indices import IdsOrdenados, IndiceOrdenado, IndiceTrigramas
+from lector_json import LectorJSONIncremental
+from snapshot_binario import SnapshotBinario, guardar_snapshot
 
 
 class Inventario:
@@ -19,30 +25,87 @@ class Inventario:
     Utiliza un diccionario para almacenar productos con su ID como clave,
     permitiendo búsquedas rápidas y eficientes. Soporta serialización a JSON
     para almacenamiento persistente.
+    
+    Los nombres se mantienen en un índice de trigramas que se actualiza al
+    añadir o eliminar productos y cuando cambia el nombre de un producto
+    (el inventario se suscribe a cada Producto que contiene). Del mismo modo,
+    asignar directamente `producto.cantidad` o `producto.precio` mantiene al
+    día los índices ordenados y los totales.
+    
+    Los IDs se mantienen además en una lista ordenada (IdsOrdenados) para
+    listar el inventario por páginas con un cursor estable. El precio y la
+    cantidad tienen índices ordenados (IndiceOrdenado) para consultas por
+    rango, top-k y stock bajo en O(log n + k); cada uno se construye la
+    primera vez que se consulta y desde ahí se mantiene con cada cambio.
+    
+    Los totales usados por las estadísticas (items, valor total y suma de
+    precios) se mantienen acumulados y se ajustan en cada operación, por lo
+    que consultarlos cuesta O(1).
     """
     
-    def __init__(self, ruta_archivo: str = "inventario.json"):
+    def __init__(self, ruta_archivo: str = "inventario.json",
+                 verificar_agregados: bool = False):
         """
         Inicializa el inventario.
         
         Args:
             ruta_archivo (str): Ruta del archivo JSON para almacenar/cargar el inventario
+            verificar_agregados (bool): Si es True, cada llamada a
+                obtener_estadisticas compara los totales acumulados con un
+                recálculo completo y lanza RuntimeError si no coinciden
         """
         self._productos: Dict[int, Producto] = {}
+        self._indice_nombres = IndiceTrigramas()
+        self._ids_ordenados = IdsOrdenados()
+        # Campo ('precio' o 'cantidad') -> índice ordenado, creado al consultarlo.
+        self._indices_ordenados: Dict[str, IndiceOrdenado] = {}
+        self._verificar_agregados = verificar_agregados
+        self._total_items = 0
+        self._valor_total = 0.0
+        self._suma_precios = 0.0
         self._ruta_archivo = ruta_archivo
         self._siguiente_id = 1
+        # Un único método enlazado compartido por todos los productos: crear
+        # uno nuevo en cada suscripción costaría memoria por producto.
+        self._observador = self._al_cambiar_producto
         
         # Cargar inventario existente si el archivo existe
         if os.path.exists(ruta_archivo):
             self.cargar_desde_archivo()
     
     def obtener_siguiente_id(self) -> int:
-        """Obtiene el siguiente ID disponible para un nuevo producto."""
-        max_id = max(self._productos.keys()) if self._productos else 0
-        self._siguiente_id = max(self._siguiente_id, max_id + 1)
+        """
+        Obtiene el siguiente ID disponible para un nuevo producto.
+        
+        El inventario mantiene el mayor ID asignado (más uno) en
+        `_siguiente_id`, por lo que la consulta es O(1).
+        """
         return self._siguiente_id
     
-    def añadir_producto(self, nombre: str, cantidad: int, precio: float) -> int:
+    def reservar_ids(self, cantidad: int) -> range:
+        """
+        Reserva un bloque de IDs consecutivos en una sola llamada.
+        
+        Los IDs reservados no se asignarán a otros productos y pueden usarse
+        luego con `añadir_producto(..., id_producto=...)`.
+        
+        Args:
+            cantidad (int): Número de IDs a reservar
+            
+        Returns:
+            range: Rango con los IDs reservados
+            
+        Raises:
+            ValueError: Si la cantidad es negativa
+        """
+        if cantidad < 0:
+            raise ValueError("La cantidad de IDs a reservar no puede ser negativa")
+        inicio = self._siguiente_id
+        self._siguiente_id += cantidad
+        return range(inicio, self._siguiente_id)
+    
+    def añadir_producto(self, nombre: str, cantidad: int, precio: float,
+                        id_producto: Optional[int] = None) -> int:
         """
         Añade un nuevo producto al inventario.
         
@@ -50,17 +113,21 @@ class Inventario:
             nombre (str): Nombre del producto
             cantidad (int): Cantidad inicial
             precio (float): Precio unitario
+            id_producto (int, opcional): ID previamente reservado con
+                `reservar_ids`; si se omite se asigna el siguiente disponible
             
         Returns:
             int: ID del producto creado
             
         Raises:
-            ValueError: Si los parámetros no son válidos
+            ValueError: Si los parámetros no son válidos o el ID ya existe
         """
-        id_producto = self.obtener_siguiente_id()
+        if id_producto is None:
+            id_producto = self._siguiente_id
+        elif id_producto in self._productos:
+            raise ValueError(f"Ya existe un producto con ID {id_producto}")
         producto = Producto(id_producto, nombre, cantidad, precio)
-        self._productos[id_producto] = producto
-        self._siguiente_id += 1
+        self._indexar(producto)
         return id_producto
     
     def eliminar_producto(self, id_producto: int) -> bool:
@@ -74,7 +141,7 @@ class Inventario:
             bool: True si se eliminó, False si no existía
         """
         if id_producto in self._productos:
-            del self._productos[id_producto]
+            self._desindexar(self._productos[id_producto])
             return True
         return False
     
@@ -116,6 +183,86 @@ class Inventario:
             return True
         return False
     
+    def añadir_productos(self, filas: Iterable) -> List[int]:
+        """
+        Añade varios productos en una sola operación (todo o nada).
+        
+        Todas las filas se validan antes de modificar el inventario; si alguna
+        es inválida no se añade ninguna. Los IDs se reservan en un solo bloque.
+        
+        Args:
+            filas (Iterable): Tuplas (nombre, cantidad, precio) o diccionarios
+                con las claves 'nombre', 'cantidad' y 'precio'
+            
+        Returns:
+            List[int]: IDs asignados, en el mismo orden que las filas
+            
+        Raises:
+            ValueError: Si alguna fila es inválida (se indica su posición)
+        """
+        primer_id = self._siguiente_id
+        productos = []
+        for posicion, fila in enumerate(filas):
+            try:
+                if isinstance(fila, dict):
+                    nombre, cantidad, precio = fila['nombre'], fila['cantidad'], fila['precio']
+                else:
+                    nombre, cantidad, precio = fila
+                productos.append(Producto(primer_id + posicion, nombre, cantidad, precio))
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"Fila {posicion} inválida: {e!r}") from e
+        
+        # _indexar_lote deja _siguiente_id después del último ID del lote, así
+        # que los IDs solo quedan reservados si el lote se registró completo.
+        self._indexar_lote(productos)
+        return [producto.id for producto in productos]
+    
+    def actualizar_productos(self, cambios: Iterable) -> int:
+        """
+        Actualiza cantidad y/o precio de varios productos (todo o nada).
+        
+        Args:
+            cambios (Iterable): Tuplas (id, cantidad, precio) o diccionarios
+                con la clave 'id' y, opcionalmente, 'cantidad' y 'precio'.
+                Un valor None (o una clave ausente) deja el campo sin cambios.
+            
+        Returns:
+            int: Número de cambios aplicados
+            
+        Raises:
+            ValueError: Si algún ID no existe o algún valor es negativo; en
+                ese caso no se aplica ningún cambio
+        """
+        validados = []
+        for posicion, cambio in enumerate(cambios):
+            try:
+                if isinstance(cambio, dict):
+                    id_producto = cambio['id']
+                    cantidad = cambio.get('cantidad')
+                    precio = cambio.get('precio')
+                else:
+                    id_producto, cantidad, precio = cambio
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"Cambio {posicion} inválido: {e!r}") from e
+            producto = self._productos.get(id_producto)
+            if producto is None:
+                raise ValueError(f"Cambio {posicion}: no existe un producto con ID {id_producto}")
+            if (cantidad is not None and cantidad < 0) or (precio is not None and precio < 0):
+                raise ValueError(f"Cambio {posicion}: la cantidad y el precio no pueden ser negativos")
+            if cantidad is not None:
+                try:
+                    self._validar_cantidad(cantidad)
+                except ValueError as e:
+                    raise ValueError(f"Cambio {posicion}: {e}") from e
+            validados.append((producto, cantidad, precio))
+        
+        for producto, cantidad, precio in validados:
+            if cantidad is not None:
+                producto.cantidad = cantidad
+            if precio is not None:
+                producto.precio = precio
+        return len(validados)
+    
     def buscar_por_id(self, id_producto: int) -> Optional[Producto]:
         """
         Busca un producto por su ID.
@@ -138,10 +285,9 @@ class Inventario:
         Returns:
             List[Producto]: Lista de productos que coinciden con la búsqueda
         """
-        nombre_lower = nombre.lower()
         return [
-            producto for producto in self._productos.values()
-            if nombre_lower in producto.nombre.lower()
+            self._productos[id_producto]
+            for id_producto in self._indice_nombres.buscar(nombre)
         ]
     
     def obtener_todos_productos(self) -> List[Producto]:
@@ -153,20 +299,114 @@ class Inventario:
         """
         return list(self._productos.values())
     
+    def obtener_pagina(self, tamano: int = 20,
+                       cursor: Optional[int] = None) -> Tuple[List[Producto], Optional[int]]:
+        """
+        Obtiene una página de productos ordenados por ID.
+        
+        El cursor es el último ID entregado, de modo que la página siguiente
+        es correcta aunque entre tanto se añadan o eliminen productos.
+        
+        Args:
+            tamano (int): Cantidad máxima de productos de la página
+            cursor (int, opcional): Cursor retornado por la página anterior;
+                None para la primera
+            
+        Returns:
+            Tuple[List[Producto], Optional[int]]: Productos de la página y
+                cursor de la siguiente (None si es la última)
+            
+        Raises:
+            ValueError: Si el tamaño no es positivo
+        """
+        if tamano <= 0:
+            raise ValueError("El tamaño de página debe ser positivo")
+        ids, hay_mas = self._ids_ordenados.pagina(cursor, tamano)
+        productos = [self._productos[id_producto] for id_producto in ids]
+        return productos, (ids[-1] if hay_mas else None)
+    
+    def iterar_productos(self, tamano_pagina: int = 1000) -> Iterator[Producto]:
+        """
+        Recorre todos los productos por ID, de a una página por vez.
+        
+        A diferencia de obtener_todos_productos no copia la colección
+        completa, y se puede modificar el inventario durante el recorrido.
+        """
+        cursor = None
+        while True:
+            productos, cursor = self.obtener_pagina(tamano_pagina, cursor)
+            yield from productos
+            if cursor is None:
+                return
+    
     def obtener_cantidad_productos(self) -> int:
         """Retorna la cantidad total de productos diferentes en el inventario."""
         return len(self._productos)
     
     def obtener_cantidad_items(self) -> int:
         """Retorna la cantidad total de items (suma de todas las cantidades)."""
-        return sum(producto.cantidad for producto in self._productos.values())
+        return self._total_items
     
     def obtener_valor_total_inventario(self) -> float:
-        """Calcula el valor total del inventario."""
-        return sum(
-            producto.obtener_valor_total()
-            for producto in self._productos.values()
-        )
+        """Retorna el valor total del inventario (acumulado)."""
+        return self._valor_total
+    
+    def productos_con_cantidad_menor(self, umbral: int) -> List[Producto]:
+        """
+        Obtiene los productos cuya cantidad es menor que un umbral.
+        
+        Args:
+            umbral (int): Cantidad mínima deseada (punto de reposición)
+            
+        Returns:
+            List[Producto]: Productos con cantidad < umbral, ordenados por ID
+        """
+        ids = self._indice_ordenado('cantidad').menores_que(umbral)
+        return [self._productos[id_producto] for id_producto in sorted(ids)]
+    
+    def productos_mayor_valor(self, k: int) -> List[Producto]:
+        """
+        Obtiene los k productos con mayor valor total (cantidad * precio).
+        
+        Args:
+            k (int): Número de productos a retornar
+            
+        Returns:
+            List[Producto]: Productos ordenados de mayor a menor valor
+        """
+        return heapq.nlargest(k, self._productos.values(), key=Producto.obtener_valor_total)
+    
+    def productos_en_rango_precio(self, minimo: Optional[float] = None,
+                                  maximo: Optional[float] = None) -> List[Producto]:
+        """
+        Obtiene los productos con precio entre `minimo` y `maximo` (inclusive).
+        
+        Args:
+            minimo (float, opcional): Precio mínimo; None para no limitar
+            maximo (float, opcional): Precio máximo; None para no limitar
+            
+        Returns:
+            List[Producto]: Productos ordenados de menor a mayor precio
+        """
+        return self._productos_por_id(self._indice_ordenado('precio').rango(minimo, maximo))
+    
+    def productos_en_rango_cantidad(self, minimo: Optional[int] = None,
+                                    maximo: Optional[int] = None) -> List[Producto]:
+        """
+        Obtiene los productos con cantidad entre `minimo` y `maximo` (inclusive).
+        
+        Returns:
+            List[Producto]: Productos ordenados de menor a mayor cantidad
+        """
+        return self._productos_por_id(self._indice_ordenado('cantidad').rango(minimo, maximo))
+    
+    def productos_mayor_precio(self, k: int) -> List[Producto]:
+        """Obtiene los k productos más caros, de mayor a menor precio."""
+        return self._productos_por_id(self._indice_ordenado('precio').mayores(k))
+    
+    def productos_menor_cantidad(self, k: int) -> List[Producto]:
+        """Obtiene los k productos con menos stock, de menor a mayor cantidad."""
+        return self._productos_por_id(self._indice_ordenado('cantidad').menores(k))
     
     def producto_existe(self, id_producto: int) -> bool:
         """Verifica si un producto existe en el inventario."""
@@ -178,18 +418,49 @@ class Inventario:
         
         Returns:
             Dict: Diccionario con estadísticas del inventario
+            
+        Raises:
+            RuntimeError: Si está activa la verificación y los totales
+                acumulados no coinciden con un recálculo completo
         """
-        productos = self.obtener_todos_productos()
+        if self._verificar_agregados and not self.verificar_estadisticas():
+            raise RuntimeError(
+                "Los totales acumulados del inventario no coinciden con el recálculo"
+            )
+        cantidad_productos = len(self._productos)
         return {
-            'cantidad_productos': self.obtener_cantidad_productos(),
-            'cantidad_items_totales': self.obtener_cantidad_items(),
-            'valor_total_inventario': self.obtener_valor_total_inventario(),
+            'cantidad_productos': cantidad_productos,
+            'cantidad_items_totales': self._total_items,
+            'valor_total_inventario': self._valor_total,
             'precio_promedio': (
-                sum(p.precio for p in productos) / len(productos)
-                if productos else 0
+                self._suma_precios / cantidad_productos
+                if cantidad_productos else 0
             )
         }
     
+    def verificar_estadisticas(self, corregir: bool = False) -> bool:
+        """
+        Compara los totales acumulados con un recálculo completo (O(n)).
+        
+        Args:
+            corregir (bool): Si es True, reemplaza los totales acumulados por
+                los recalculados (útil para eliminar el error de redondeo)
+            
+        Returns:
+            bool: True si los totales acumulados son correctos
+        """
+        total_items, valor_total, suma_precios = self._recalcular_agregados()
+        correcto = (
+            total_items == self._total_items
+            and math.isclose(valor_total, self._valor_total, rel_tol=1e-9, abs_tol=1e-6)
+            and math.isclose(suma_precios, self._suma_precios, rel_tol=1e-9, abs_tol=1e-6)
+        )
+        if corregir:
+            self._total_items = total_items
+            self._valor_total = valor_total
+            self._suma_precios = suma_precios
+        return correcto
+    
     def guardar_en_archivo(self) -> None:
         """Guarda el inventario en un archivo JSON."""
         datos = {
@@ -207,23 +478,225 @@ class Inventario:
         except IOError as e:
             print(f"✗ Error al guardar el inventario: {e}")
     
-    def cargar_desde_archivo(self) -> None:
-        """Carga el inventario desde un archivo JSON."""
+    def guardar_snapshot_binario(self, ruta: Optional[str] = None) -> None:
+        """
+        Guarda el inventario en el formato binario compacto de snapshot_binario.
+        
+        Args:
+            ruta (str, opcional): Ruta del snapshot; por defecto la del archivo
+                JSON con extensión '.bin'
+        """
+        ruta = ruta or self._ruta_snapshot_binario()
         try:
-            with open(self._ruta_archivo, 'r', encoding='utf-8') as archivo:
-                datos = json.load(archivo)
-            
-            self._productos.clear()
-            for datos_producto in datos.get('productos', []):
+            guardar_snapshot(self._productos.values(), self._siguiente_id, ruta)
+            print(f"✓ Snapshot binario guardado en '{ruta}'")
+        except (IOError, struct.error) as e:
+            print(f"✗ Error al guardar el snapshot binario: {e}")
+    
+    def cargar_snapshot_binario(self, ruta: Optional[str] = None) -> None:
+        """
+        Carga el inventario desde un snapshot binario (leído con mmap).
+        
+        Args:
+            ruta (str, opcional): Ruta del snapshot; por defecto la del archivo
+                JSON con extensión '.bin'
+        """
+        ruta = ruta or self._ruta_snapshot_binario()
+        try:
+            with SnapshotBinario(ruta) as snapshot:
+                productos = [
+                    Producto(id_producto, nombre, cantidad, precio)
+                    for id_producto, nombre, cantidad, precio in snapshot
+                ]
+                siguiente_id = snapshot.siguiente_id
+            self._vaciar()
+            self._siguiente_id = 1
+            self._indexar_lote(productos)
+            self._siguiente_id = max(self._siguiente_id, siguiente_id)
+            print(f"✓ Snapshot binario cargado desde '{ruta}'")
+        except IOError as e:
+            print(f"✗ Error al cargar el snapshot binario: {e}")
+        except ValueError as e:
+            print(f"✗ Snapshot binario inválido: {e}")
+    
+    def _ruta_snapshot_binario(self) -> str:
+        """Retorna la ruta por defecto del snapshot binario."""
+        return os.path.splitext(self._ruta_archivo)[0] + '.bin'
+    
+    def cargar_desde_archivo(self, progreso: Optional[Callable[[int, int, int], None]] = None,
+                             intervalo_progreso: int = 10_000) -> None:
+        """
+        Carga el inventario desde un archivo JSON.
+        
+        El archivo se lee con LectorJSONIncremental.valores(): los archivos
+        grandes se leen por bloques y cada producto se construye en cuanto se
+        decodifica, sin materializar antes todo el documento; los pequeños se
+        decodifican de una vez con json.load, que es más rápido. Si el archivo
+        es inválido el inventario no cambia.
+        
+        Args:
+            progreso (Callable, opcional): Función llamada como
+                progreso(bytes_leidos, bytes_totales, productos_cargados)
+                cada `intervalo_progreso` productos y al terminar
+            intervalo_progreso (int): Productos entre avisos de progreso
+        """
+        try:
+            lector = LectorJSONIncremental(self._ruta_archivo)
+            productos: Dict[int, Producto] = {}
+            for datos_producto in lector.valores():
                 producto = Producto.desde_diccionario(datos_producto)
-                self._productos[producto.id] = producto
+                productos[producto.id] = producto
+                if progreso is not None and len(productos) % intervalo_progreso == 0:
+                    progreso(lector.bytes_leidos, lector.bytes_totales, len(productos))
             
-            self._siguiente_id = datos.get('siguiente_id', 1)
+            self._vaciar()
+            self._siguiente_id = 1
+            self._indexar_lote(list(productos.values()))
+            # _indexar_lote ya dejó _siguiente_id por encima del mayor ID cargado.
+            self._siguiente_id = max(self._siguiente_id, lector.metadatos.get('siguiente_id', 1))
+            if progreso is not None:
+                progreso(lector.bytes_leidos, lector.bytes_totales, len(productos))
             print(f"✓ Inventario cargado exitosamente desde '{self._ruta_archivo}'")
         except IOError as e:
             print(f"✗ Error al cargar el inventario: {e}")
         except json.JSONDecodeError as e:
             print(f"✗ Error al decodificar JSON: {e}")
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"✗ Producto inválido en el archivo: {e!r}")
+    
+    def _indice_ordenado(self, campo: str) -> IndiceOrdenado:
+        """Retorna el índice ordenado de `campo`, construyéndolo si todavía no existe."""
+        indice = self._indices_ordenados.get(campo)
+        if indice is None:
+            indice = IndiceOrdenado()
+            indice.agregar_varios(
+                (producto.id, getattr(producto, campo)) for producto in self._productos.values()
+            )
+            self._indices_ordenados[campo] = indice
+        return indice
+    
+    def _productos_por_id(self, ids: Iterable[int]) -> List[Producto]:
+        """Retorna los productos de una serie de IDs, en el mismo orden."""
+        return [self._productos[id_producto] for id_producto in ids]
+    
+    def _recalcular_agregados(self):
+        """Recorre todos los productos y retorna (items, valor total, suma de precios)."""
+        total_items = 0
+        valor_total = 0.0
+        suma_precios = 0.0
+        for producto in self._productos.values():
+            total_items += producto.cantidad
+            valor_total += producto.obtener_valor_total()
+            suma_precios += producto.precio
+        return total_items, valor_total, suma_precios
+    
+    def _validar_cantidad(self, cantidad) -> None:
+        """
+        Comprueba que el inventario pueda guardar la cantidad; aquí acepta cualquiera.
+        
+        Las subclases que almacenan la cantidad en un formato más estricto la
+        redefinen y lanzan ValueError, para que los lotes se rechacen antes de
+        aplicar ningún cambio.
+        """
+    
+    def _indexar(self, producto: Producto) -> None:
+        """
+        Registra un producto en los índices derivados y en el diccionario.
+        
+        El producto entra al diccionario al final, cuando todos los índices
+        ya lo aceptaron. Si algún índice falla, el producto se quita de los
+        índices y el error se propaga con el inventario como estaba.
+        """
+        try:
+            self._indice_nombres.agregar(producto.id, producto.nombre)
+            self._ids_ordenados.agregar(producto.id)
+            for campo, indice in self._indices_ordenados.items():
+                indice.agregar(producto.id, getattr(producto, campo))
+        except BaseException:
+            self._indice_nombres.quitar(producto.id)
+            self._ids_ordenados.quitar(producto.id)
+            for indice in self._indices_ordenados.values():
+                indice.quitar(producto.id)
+            raise
+        if producto.id >= self._siguiente_id:
+            self._siguiente_id = producto.id + 1
+        self._total_items += producto.cantidad
+        self._valor_total += producto.obtener_valor_total()
+        self._suma_precios += producto.precio
+        self._productos[producto.id] = producto
+        producto.suscribir(self._observador)
+    
+    def _indexar_lote(self, productos: List[Producto]) -> None:
+        """
+        Registra varios productos nuevos y ya validados, actualizando índices en bloque.
+        
+        Como en _indexar, el diccionario se actualiza al final. Si algún índice
+        falla, los productos del lote se quitan de los índices y el error se
+        propaga con el inventario como estaba.
+        """
+        try:
+            self._indice_nombres.agregar_varios(
+                (producto.id, producto.nombre) for producto in productos
+            )
+            self._ids_ordenados.agregar_varios(producto.id for producto in productos)
+            for campo, indice in self._indices_ordenados.items():
+                indice.agregar_varios((producto.id, getattr(producto, campo)) for producto in productos)
+        except BaseException:
+            for producto in productos:
+                self._indice_nombres.quitar(producto.id)
+                self._ids_ordenados.quitar(producto.id)
+                for indice in self._indices_ordenados.values():
+                    indice.quitar(producto.id)
+            raise
+        self._productos.update((producto.id, producto) for producto in productos)
+        for producto in productos:
+            self._total_items += producto.cantidad
+            self._valor_total += producto.obtener_valor_total()
+            self._suma_precios += producto.precio
+            producto.suscribir(self._observador)
+        if productos:
+            self._siguiente_id = max(self._siguiente_id, max(p.id for p in productos) + 1)
+    
+    def _desindexar(self, producto: Producto) -> None:
+        """Quita un producto del diccionario y de los índices derivados."""
+        producto.desuscribir(self._observador)
+        self._indice_nombres.quitar(producto.id)
+        self._ids_ordenados.quitar(producto.id)
+        for indice in self._indices_ordenados.values():
+            indice.quitar(producto.id)
+        self._total_items -= producto.cantidad
+        self._valor_total -= producto.obtener_valor_total()
+        self._suma_precios -= producto.precio
+        del self._productos[producto.id]
+    
+    def _vaciar(self) -> None:
+        """Elimina todos los productos y reinicia los índices."""
+        for producto in self._productos.values():
+            producto.desuscribir(self._observador)
+        self._productos.clear()
+        self._indice_nombres.limpiar()
+        self._ids_ordenados.limpiar()
+        self._indices_ordenados.clear()
+        self._total_items = 0
+        self._valor_total = 0.0
+        self._suma_precios = 0.0
+    
+    def _al_cambiar_producto(self, producto: Producto, atributo: str,
+                             valor_anterior, valor_nuevo) -> None:
+        """Mantiene los índices y los totales al día cuando un producto cambia."""
+        if atributo == 'nombre':
+            self._indice_nombres.actualizar(producto.id, valor_nuevo)
+        elif atributo == 'cantidad':
+            diferencia = valor_nuevo - valor_anterior
+            self._total_items += diferencia
+            self._valor_total += diferencia * producto.precio
+        elif atributo == 'precio':
+            diferencia = valor_nuevo - valor_anterior
+            self._suma_precios += diferencia
+            self._valor_total += producto.cantidad * diferencia
+        indice = self._indices_ordenados.get(atributo)
+        if indice is not None:
+            indice.actualizar(producto.id, valor_nuevo)
     
     def __str__(self) -> str:
         """Retorna una representación en string del inventario."""
@@ -0,0 +1,371 @@
+"""
+Módulo InventarioAlmacenado: Inventario que delega sus datos en un almacenamiento.
+
+Este módulo contiene la clase InventarioAlmacenado, que ofrece la misma
+interfaz pública que Inventario pero no guarda los productos en memoria: cada
+consulta y cada cambio se resuelve en un AlmacenamientoInventario (por
+ejemplo AlmacenamientoSQLite). Así el tiempo de inicio no depende del tamaño
+del inventario y los cambios quedan guardados al terminar cada operación.
+"""
+
+import json
+import math
+import struct
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from almacenamiento import AlmacenamientoInventario, AlmacenamientoSQLite, lotes_desde_json
+from lector_json import LectorJSONIncremental
+from producto import Producto
+from snapshot_binario import guardar_snapshot
+
+
+class InventarioAlmacenado:
+    """
+    Inventario cuyos productos viven en un AlmacenamientoInventario.
+
+    Los productos retornados son copias enlazadas al inventario: si se les
+    cambia el nombre, la cantidad o el precio directamente, el cambio se
+    escribe en el almacenamiento.
+
+    Atributos:
+        almacenamiento (AlmacenamientoInventario): Donde se guardan los productos
+    """
+
+    def __init__(self, almacenamiento: Optional[AlmacenamientoInventario] = None,
+                 ruta_archivo: str = "inventario.json",
+                 verificar_agregados: bool = False):
+        """
+        Inicializa el inventario sobre un almacenamiento.
+
+        Args:
+            almacenamiento (AlmacenamientoInventario, opcional): Por defecto
+                AlmacenamientoSQLite("inventario.db")
+            ruta_archivo (str): Archivo JSON usado por guardar_en_archivo
+                (exportar) y cargar_desde_archivo (importar)
+            verificar_agregados (bool): Igual que en Inventario
+        """
+        self.almacenamiento = almacenamiento if almacenamiento is not None else AlmacenamientoSQLite()
+        self._ruta_archivo = ruta_archivo
+        self._verificar_agregados = verificar_agregados
+        self._observador = self._al_cambiar_producto
+
+    def __enter__(self) -> 'InventarioAlmacenado':
+        """Permite usar el inventario con la sentencia with."""
+        return self
+
+    def __exit__(self, *excepcion) -> None:
+        """Cierra el almacenamiento al salir del bloque with."""
+        self.cerrar()
+
+    def cerrar(self) -> None:
+        """Cierra el almacenamiento."""
+        self.almacenamiento.cerrar()
+
+    # ==================== OPERACIONES ====================
+
+    def obtener_siguiente_id(self) -> int:
+        """Obtiene el siguiente ID disponible para un nuevo producto."""
+        return self.almacenamiento.leer_siguiente_id()
+
+    def reservar_ids(self, cantidad: int) -> range:
+        """
+        Reserva un bloque de IDs consecutivos.
+
+        Raises:
+            ValueError: Si la cantidad es negativa
+        """
+        if cantidad < 0:
+            raise ValueError("La cantidad de IDs a reservar no puede ser negativa")
+        inicio = self.almacenamiento.leer_siguiente_id()
+        self.almacenamiento.escribir_siguiente_id(inicio + cantidad)
+        return range(inicio, inicio + cantidad)
+
+    def añadir_producto(self, nombre: str, cantidad: int, precio: float,
+                        id_producto: Optional[int] = None) -> int:
+        """
+        Añade un nuevo producto al inventario.
+
+        Returns:
+            int: ID del producto creado
+
+        Raises:
+            ValueError: Si los parámetros no son válidos o el ID ya existe
+        """
+        if id_producto is None:
+            id_producto = self.almacenamiento.leer_siguiente_id()
+        elif self.almacenamiento.existe(id_producto):
+            raise ValueError(f"Ya existe un producto con ID {id_producto}")
+        self.almacenamiento.insertar([Producto(id_producto, nombre, cantidad, precio)])
+        return id_producto
+
+    def eliminar_producto(self, id_producto: int) -> bool:
+        """Elimina un producto por su ID; retorna False si no existía."""
+        return self.almacenamiento.eliminar(id_producto)
+
+    def actualizar_cantidad(self, id_producto: int, nueva_cantidad: int) -> bool:
+        """
+        Actualiza la cantidad de un producto.
+
+        Raises:
+            ValueError: Si la cantidad es negativa
+        """
+        if nueva_cantidad < 0:
+            raise ValueError("La cantidad no puede ser negativa")
+        return self.almacenamiento.actualizar([(id_producto, None, nueva_cantidad, None)]) > 0
+
+    def actualizar_precio(self, id_producto: int, nuevo_precio: float) -> bool:
+        """
+        Actualiza el precio de un producto.
+
+        Raises:
+            ValueError: Si el precio es negativo
+        """
+        if nuevo_precio < 0:
+            raise ValueError("El precio no puede ser negativo")
+        return self.almacenamiento.actualizar([(id_producto, None, None, nuevo_precio)]) > 0
+
+    def añadir_productos(self, filas: Iterable) -> List[int]:
+        """
+        Añade varios productos en una sola transacción (todo o nada).
+
+        Args:
+            filas (Iterable): Tuplas (nombre, cantidad, precio) o diccionarios
+                con las claves 'nombre', 'cantidad' y 'precio'
+
+        Returns:
+            List[int]: IDs asignados, en el mismo orden que las filas
+
+        Raises:
+            ValueError: Si alguna fila es inválida (se indica su posición)
+        """
+        primer_id = self.almacenamiento.leer_siguiente_id()
+        productos = []
+        for posicion, fila in enumerate(filas):
+            try:
+                if isinstance(fila, dict):
+                    nombre, cantidad, precio = fila['nombre'], fila['cantidad'], fila['precio']
+                else:
+                    nombre, cantidad, precio = fila
+                productos.append(Producto(primer_id + posicion, nombre, cantidad, precio))
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"Fila {posicion} inválida: {e!r}") from e
+        self.almacenamiento.insertar(productos)
+        return [producto.id for producto in productos]
+
+    def actualizar_productos(self, cambios: Iterable) -> int:
+        """
+        Actualiza cantidad y/o precio de varios productos en una transacción.
+
+        Args:
+            cambios (Iterable): Tuplas (id, cantidad, precio) o diccionarios
+                con la clave 'id' y, opcionalmente, 'cantidad' y 'precio'
+
+        Returns:
+            int: Número de cambios aplicados
+
+        Raises:
+            ValueError: Si algún ID no existe o algún valor es negativo; en
+                ese caso no se aplica ningún cambio
+        """
+        validados = []
+        for posicion, cambio in enumerate(cambios):
+            try:
+                if isinstance(cambio, dict):
+                    id_producto = cambio['id']
+                    cantidad = cambio.get('cantidad')
+                    precio = cambio.get('precio')
+                else:
+                    id_producto, cantidad, precio = cambio
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"Cambio {posicion} inválido: {e!r}") from e
+            if not self.almacenamiento.existe(id_producto):
+                raise ValueError(f"Cambio {posicion}: no existe un producto con ID {id_producto}")
+            if (cantidad is not None and cantidad < 0) or (precio is not None and precio < 0):
+                raise ValueError(f"Cambio {posicion}: la cantidad y el precio no pueden ser negativos")
+            validados.append((id_producto, None, cantidad, precio))
+        self.almacenamiento.actualizar(validados)
+        return len(validados)
+
+    # ==================== CONSULTAS ====================
+
+    def buscar_por_id(self, id_producto: int) -> Optional[Producto]:
+        """Busca un producto por su ID."""
+        return self._enlazar(self.almacenamiento.obtener(id_producto))
+
+    def buscar_por_nombre(self, nombre: str) -> List[Producto]:
+        """Busca productos por nombre (búsqueda parcial, sin importar mayúsculas)."""
+        return self._enlazar_todos(self.almacenamiento.buscar_por_nombre(nombre))
+
+    def obtener_todos_productos(self) -> List[Producto]:
+        """Obtiene todos los productos, en el orden del almacenamiento."""
+        return self._enlazar_todos(self.almacenamiento.todos())
+
+    def obtener_pagina(self, tamano: int = 20,
+                       cursor: Optional[int] = None) -> Tuple[List[Producto], Optional[int]]:
+        """
+        Obtiene una página de productos ordenados por ID, igual que en Inventario.
+
+        Raises:
+            ValueError: Si el tamaño no es positivo
+        """
+        if tamano <= 0:
+            raise ValueError("El tamaño de página debe ser positivo")
+        productos, hay_mas = self.almacenamiento.pagina(cursor, tamano)
+        return self._enlazar_todos(productos), (productos[-1].id if hay_mas else None)
+
+    def iterar_productos(self, tamano_pagina: int = 1000) -> Iterator[Producto]:
+        """Recorre todos los productos por ID, de a una página por vez."""
+        cursor = None
+        while True:
+            productos, cursor = self.obtener_pagina(tamano_pagina, cursor)
+            yield from productos
+            if cursor is None:
+                return
+
+    def obtener_cantidad_productos(self) -> int:
+        """Retorna la cantidad de productos diferentes."""
+        return self.almacenamiento.contar()
+
+    def obtener_cantidad_items(self) -> int:
+        """Retorna la suma de todas las cantidades."""
+        return self.almacenamiento.totales()[0]
+
+    def obtener_valor_total_inventario(self) -> float:
+        """Retorna el valor total del inventario."""
+        return self.almacenamiento.totales()[1]
+
+    def productos_con_cantidad_menor(self, umbral: int) -> List[Producto]:
+        """Obtiene los productos con cantidad < umbral, ordenados por ID."""
+        return self._enlazar_todos(self.almacenamiento.con_cantidad_menor(umbral))
+
+    def productos_mayor_valor(self, k: int) -> List[Producto]:
+        """Obtiene los k productos con mayor valor total, de mayor a menor."""
+        return self._enlazar_todos(self.almacenamiento.mayor_valor(k))
+
+    def productos_en_rango_precio(self, minimo: Optional[float] = None,
+                                  maximo: Optional[float] = None) -> List[Producto]:
+        """Obtiene los productos con precio entre `minimo` y `maximo`, por precio."""
+        return self._enlazar_todos(self.almacenamiento.en_rango('precio', minimo, maximo))
+
+    def productos_en_rango_cantidad(self, minimo: Optional[int] = None,
+                                    maximo: Optional[int] = None) -> List[Producto]:
+        """Obtiene los productos con cantidad entre `minimo` y `maximo`, por cantidad."""
+        return self._enlazar_todos(self.almacenamiento.en_rango('cantidad', minimo, maximo))
+
+    def productos_mayor_precio(self, k: int) -> List[Producto]:
+        """Obtiene los k productos más caros, de mayor a menor precio."""
+        return self._enlazar_todos(self.almacenamiento.extremos('precio', k, mayores=True))
+
+    def productos_menor_cantidad(self, k: int) -> List[Producto]:
+        """Obtiene los k productos con menos stock, de menor a mayor cantidad."""
+        return self._enlazar_todos(self.almacenamiento.extremos('cantidad', k, mayores=False))
+
+    def producto_existe(self, id_producto: int) -> bool:
+        """Verifica si un producto existe en el inventario."""
+        return self.almacenamiento.existe(id_producto)
+
+    def obtener_estadisticas(self) -> Dict:
+        """
+        Obtiene estadísticas del inventario a partir de los totales guardados.
+
+        Raises:
+            RuntimeError: Si está activa la verificación y los totales no
+                coinciden con un recálculo completo
+        """
+        if self._verificar_agregados and not self.verificar_estadisticas():
+            raise RuntimeError(
+                "Los totales acumulados del inventario no coinciden con el recálculo"
+            )
+        cantidad_productos = self.almacenamiento.contar()
+        total_items, valor_total, suma_precios = self.almacenamiento.totales()
+        return {
+            'cantidad_productos': cantidad_productos,
+            'cantidad_items_totales': total_items,
+            'valor_total_inventario': valor_total,
+            'precio_promedio': suma_precios / cantidad_productos if cantidad_productos else 0
+        }
+
+    def verificar_estadisticas(self, corregir: bool = False) -> bool:
+        """Compara los totales guardados con un recálculo completo."""
+        total_items, valor_total, suma_precios = self.almacenamiento.totales()
+        items, valor, precios = self.almacenamiento.recalcular_totales(corregir)
+        return (
+            items == total_items
+            and math.isclose(valor, valor_total, rel_tol=1e-9, abs_tol=1e-6)
+            and math.isclose(precios, suma_precios, rel_tol=1e-9, abs_tol=1e-6)
+        )
+
+    # ==================== IMPORTAR / EXPORTAR ====================
+
+    def guardar_en_archivo(self) -> None:
+        """Exporta el inventario al archivo JSON (los datos ya están guardados)."""
+        datos = {
+            'productos': [producto.a_diccionario() for producto in self.almacenamiento.todos()],
+            'siguiente_id': self.almacenamiento.leer_siguiente_id()
+        }
+        try:
+            with open(self._ruta_archivo, 'w', encoding='utf-8') as archivo:
+                json.dump(datos, archivo, indent=4, ensure_ascii=False)
+            print(f"✓ Inventario exportado exitosamente a '{self._ruta_archivo}'")
+        except IOError as e:
+            print(f"✗ Error al exportar el inventario: {e}")
+
+    def cargar_desde_archivo(self) -> None:
+        """
+        Reemplaza el contenido del almacenamiento por el del archivo JSON.
+        
+        El archivo se lee con LectorJSONIncremental y los productos pasan por
+        lotes a `almacenamiento.reemplazar`, que borra el contenido anterior
+        e inserta el nuevo en una sola operación: si el archivo es inválido,
+        el almacenamiento queda como estaba.
+        """
+        try:
+            lector = LectorJSONIncremental(self._ruta_archivo)
+            self.almacenamiento.reemplazar(lotes_desde_json(lector))
+            self.almacenamiento.escribir_siguiente_id(
+                max(self.almacenamiento.leer_siguiente_id(), lector.metadatos.get('siguiente_id', 1))
+            )
+            print(f"✓ Inventario importado exitosamente desde '{self._ruta_archivo}'")
+        except IOError as e:
+            print(f"✗ Error al cargar el inventario: {e}")
+        except json.JSONDecodeError as e:
+            print(f"✗ Error al decodificar JSON: {e}")
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"✗ Producto inválido en el archivo: {e!r}")
+
+    def guardar_snapshot_binario(self, ruta: str) -> None:
+        """Guarda el inventario en el formato binario de snapshot_binario."""
+        try:
+            guardar_snapshot(self.almacenamiento.todos(), self.almacenamiento.leer_siguiente_id(), ruta)
+            print(f"✓ Snapshot binario guardado en '{ruta}'")
+        except (IOError, struct.error) as e:
+            print(f"✗ Error al guardar el snapshot binario: {e}")
+
+    # ==================== ENLACE CON LOS PRODUCTOS ====================
+
+    def _enlazar(self, producto: Optional[Producto]) -> Optional[Producto]:
+        """Suscribe el inventario al producto para guardar sus cambios directos."""
+        if producto is not None:
+            producto.suscribir(self._observador)
+        return producto
+
+    def _enlazar_todos(self, productos: Iterable[Producto]) -> List[Producto]:
+        """Enlaza una serie de productos y los retorna en una lista."""
+        return [self._enlazar(producto) for producto in productos]
+
+    def _al_cambiar_producto(self, producto: Producto, atributo: str,
+                             valor_anterior, valor_nuevo) -> None:
+        """Escribe en el almacenamiento el atributo modificado del producto."""
+        cambio = {'nombre': None, 'cantidad': None, 'precio': None}
+        cambio[atributo] = valor_nuevo
+        self.almacenamiento.actualizar(
+            [(producto.id, cambio['nombre'], cambio['cantidad'], cambio['precio'])]
+        )
+
+    def __str__(self) -> str:
+        """Retorna una representación en string del inventario."""
+        return f"Inventario con {self.obtener_cantidad_productos()} productos diferentes"
+
+    def __repr__(self) -> str:
+        """Retorna una representación técnica del inventario."""
+        return f"InventarioAlmacenado({type(self.almacenamiento).__name__})"
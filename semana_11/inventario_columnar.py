@@ -0,0 +1,223 @@
+"""
+Módulo InventarioColumnar: Inventario con almacenamiento columnar en NumPy.
+
+Este módulo contiene la clase InventarioColumnar, que ofrece la misma interfaz
+pública que Inventario pero además guarda los IDs, cantidades y precios en
+arreglos NumPy contiguos (una columna por atributo) y los nombres en una lista
+paralela. Los totales, promedios, filtros por cantidad y el top-k por valor se
+calculan de forma vectorizada sobre esas columnas.
+
+Requiere NumPy (`pip install numpy`).
+"""
+
+from typing import Dict, List
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es una dependencia opcional
+    np = None
+
+from inventario import Inventario
+from producto import Producto
+
+
+def _a_entero(cantidad) -> int:
+    """
+    Convierte una cantidad al entero que se guarda en la columna int64.
+
+    Args:
+        cantidad: Cantidad a convertir (int, o float sin parte decimal)
+
+    Returns:
+        int: La misma cantidad como entero
+
+    Raises:
+        ValueError: Si la cantidad no es un número entero
+    """
+    try:
+        entera = int(cantidad)
+    except (TypeError, ValueError, OverflowError):
+        entera = None
+    if entera is None or entera != cantidad:
+        raise ValueError(f"La cantidad debe ser un número entero: {cantidad!r}")
+    return entera
+
+
+class InventarioColumnar(Inventario):
+    """
+    Inventario que mantiene columnas NumPy sincronizadas con sus productos.
+
+    Cada producto ocupa una fila de las columnas. Al eliminar un producto la
+    última fila ocupa su lugar, de modo que las columnas siempre son
+    contiguas y las operaciones siguen siendo O(1).
+
+    La columna de cantidades es int64: una cantidad con parte decimal se
+    rechaza con ValueError en lugar de truncarse, y un float entero (5.0) se
+    guarda como 5.
+
+    Atributos:
+        _ids (np.ndarray): Columna de IDs (int64)
+        _cantidades (np.ndarray): Columna de cantidades (int64)
+        _precios (np.ndarray): Columna de precios (float64)
+        _nombres (List[str]): Columna de nombres
+        _filas (Dict[int, int]): ID -> número de fila
+        _num_filas (int): Filas ocupadas (el resto es capacidad libre)
+    """
+
+    def __init__(self, ruta_archivo: str = "inventario.json",
+                 verificar_agregados: bool = False, capacidad_inicial: int = 1024):
+        """
+        Inicializa el inventario columnar.
+
+        Args:
+            ruta_archivo (str): Ruta del archivo JSON para almacenar/cargar el inventario
+            verificar_agregados (bool): Igual que en Inventario
+            capacidad_inicial (int): Filas reservadas inicialmente en las columnas
+
+        Raises:
+            ImportError: Si NumPy no está instalado
+        """
+        if np is None:
+            raise ImportError("InventarioColumnar requiere NumPy: pip install numpy")
+        capacidad = max(1, capacidad_inicial)
+        self._ids = np.empty(capacidad, dtype=np.int64)
+        self._cantidades = np.empty(capacidad, dtype=np.int64)
+        self._precios = np.empty(capacidad, dtype=np.float64)
+        self._nombres: List[str] = []
+        self._filas: Dict[int, int] = {}
+        self._num_filas = 0
+        # Las columnas deben existir antes de que Inventario cargue el archivo.
+        super().__init__(ruta_archivo, verificar_agregados)
+
+    # ==================== CONSULTAS VECTORIZADAS ====================
+
+    def productos_con_cantidad_menor(self, umbral: int) -> List[Producto]:
+        """Obtiene los productos con cantidad < umbral, ordenados por ID."""
+        n = self._num_filas
+        ids = np.sort(self._ids[:n][self._cantidades[:n] < umbral])
+        return [self._productos[id_producto] for id_producto in ids.tolist()]
+
+    def productos_mayor_valor(self, k: int) -> List[Producto]:
+        """Obtiene los k productos con mayor valor total, de mayor a menor."""
+        n = self._num_filas
+        k = min(k, n)
+        if k <= 0:
+            return []
+        valores = self._cantidades[:n] * self._precios[:n]
+        # argpartition separa los k mayores en O(n); solo esos se ordenan.
+        filas = np.argpartition(valores, n - k)[n - k:]
+        filas = filas[np.argsort(valores[filas])[::-1]]
+        return [self._productos[id_producto] for id_producto in self._ids[filas].tolist()]
+
+    def obtener_valores_totales(self) -> "np.ndarray":
+        """Retorna un arreglo con cantidad * precio de cada fila."""
+        n = self._num_filas
+        return self._cantidades[:n] * self._precios[:n]
+
+    def _recalcular_agregados(self):
+        """Recalcula (items, valor total, suma de precios) sobre las columnas."""
+        n = self._num_filas
+        cantidades = self._cantidades[:n]
+        precios = self._precios[:n]
+        return (
+            int(cantidades.sum()),
+            float(np.dot(cantidades, precios)),
+            float(precios.sum()),
+        )
+
+    # ==================== MANTENIMIENTO DE COLUMNAS ====================
+
+    def _asegurar_capacidad(self, filas_necesarias: int) -> None:
+        """Amplía las columnas (al menos al doble) si no hay capacidad suficiente."""
+        capacidad = len(self._ids)
+        if filas_necesarias <= capacidad:
+            return
+        nueva_capacidad = max(filas_necesarias, capacidad * 2)
+        for atributo in ('_ids', '_cantidades', '_precios'):
+            columna = getattr(self, atributo)
+            ampliada = np.empty(nueva_capacidad, dtype=columna.dtype)
+            ampliada[:self._num_filas] = columna[:self._num_filas]
+            setattr(self, atributo, ampliada)
+
+    def _validar_cantidad(self, cantidad) -> None:
+        """Rechaza las cantidades que la columna int64 no puede guardar sin perder datos."""
+        _a_entero(cantidad)
+
+    def _indexar(self, producto: Producto) -> None:
+        """Registra el producto y agrega su fila al final de las columnas."""
+        cantidad = _a_entero(producto.cantidad)
+        super()._indexar(producto)
+        self._asegurar_capacidad(self._num_filas + 1)
+        fila = self._num_filas
+        self._ids[fila] = producto.id
+        self._cantidades[fila] = cantidad
+        self._precios[fila] = producto.precio
+        self._nombres.append(producto.nombre)
+        self._filas[producto.id] = fila
+        self._num_filas += 1
+
+    def _indexar_lote(self, productos: List[Producto]) -> None:
+        """Registra varios productos copiando sus valores a las columnas en bloque."""
+        # Se convierten antes de registrar nada: un lote con una cantidad inválida no entra.
+        cantidades = [_a_entero(producto.cantidad) for producto in productos]
+        super()._indexar_lote(productos)
+        inicio = self._num_filas
+        fin = inicio + len(productos)
+        self._asegurar_capacidad(fin)
+        self._ids[inicio:fin] = [producto.id for producto in productos]
+        self._cantidades[inicio:fin] = cantidades
+        self._precios[inicio:fin] = [producto.precio for producto in productos]
+        self._nombres.extend(producto.nombre for producto in productos)
+        self._filas.update((producto.id, inicio + i) for i, producto in enumerate(productos))
+        self._num_filas = fin
+
+    def _desindexar(self, producto: Producto) -> None:
+        """Quita el producto moviendo la última fila al hueco que deja."""
+        super()._desindexar(producto)
+        fila = self._filas.pop(producto.id)
+        ultima = self._num_filas - 1
+        if fila != ultima:
+            id_movido = int(self._ids[ultima])
+            self._ids[fila] = self._ids[ultima]
+            self._cantidades[fila] = self._cantidades[ultima]
+            self._precios[fila] = self._precios[ultima]
+            self._nombres[fila] = self._nombres[ultima]
+            self._filas[id_movido] = fila
+        self._nombres.pop()
+        self._num_filas = ultima
+
+    def _vaciar(self) -> None:
+        """Elimina todos los productos y deja las columnas vacías."""
+        super()._vaciar()
+        self._nombres.clear()
+        self._filas.clear()
+        self._num_filas = 0
+
+    def _al_cambiar_producto(self, producto: Producto, atributo: str,
+                             valor_anterior, valor_nuevo) -> None:
+        """
+        Mantiene las columnas al día con los cambios directos del producto.
+
+        Raises:
+            ValueError: Si la nueva cantidad no es entera; el producto
+                recupera su cantidad anterior y el inventario no cambia
+        """
+        if atributo == 'cantidad':
+            try:
+                valor_nuevo = _a_entero(valor_nuevo)
+            except ValueError:
+                # El setter ya asignó el valor: se restaura sin volver a avisar.
+                producto._cantidad = valor_anterior
+                raise
+        super()._al_cambiar_producto(producto, atributo, valor_anterior, valor_nuevo)
+        fila = self._filas[producto.id]
+        if atributo == 'nombre':
+            self._nombres[fila] = valor_nuevo
+        elif atributo == 'cantidad':
+            self._cantidades[fila] = valor_nuevo
+        elif atributo == 'precio':
+            self._precios[fila] = valor_nuevo
+
+    def __repr__(self) -> str:
+        """Retorna una representación técnica del inventario."""
+        return f"InventarioColumnar(productos={len(self._productos)})"
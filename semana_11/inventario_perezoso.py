@@ -0,0 +1,436 @@
+"""
+Módulo InventarioPerezoso: Inventario que carga los productos a medida que se usan.
+
+Este módulo contiene AlmacenamientoJSONPerezoso, un AlmacenamientoInventario
+sobre el mismo archivo JSON que usa Inventario, e InventarioPerezoso, que lo
+combina con InventarioAlmacenado. Al abrir el archivo solo se construye un
+índice con la posición en bytes de cada producto; el Producto se decodifica
+la primera vez que se pide y queda en una caché LRU de productos recientes.
+Los cambios se guardan en memoria hasta llamar a guardar_en_archivo, que
+reescribe el archivo copiando tal cual los productos que no cambiaron.
+"""
+
+import heapq
+import json
+import os
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from almacenamiento import CAMPOS_ORDENABLES, AlmacenamientoInventario, Cambio, Totales
+from indices import IdsOrdenados
+from inventario_almacenado import InventarioAlmacenado
+from lector_json import LectorJSONIncremental
+from producto import Producto
+
+
+# (posición en el arreglo, byte de inicio, byte de fin) de un producto en el archivo.
+Ubicacion = Tuple[int, int, int]
+
+
+class AlmacenamientoJSONPerezoso(AlmacenamientoInventario):
+    """
+    Almacenamiento sobre un archivo JSON de Inventario, leído bajo demanda.
+
+    Los productos modificados o nuevos se mantienen en memoria (nunca salen
+    de la caché) hasta que `guardar` los escribe. Las consultas que necesitan
+    todos los productos (búsqueda por nombre, stock bajo, mayor valor) leen el
+    archivo completo una vez por consulta, sin guardar los productos en la
+    caché. Los totales y la lista ordenada de IDs que usa `pagina` se
+    calculan en la primera consulta que los pide y desde ahí se mantienen
+    con cada cambio.
+
+    Atributos:
+        capacidad_cache (int): Máximo de productos sin cambios en la caché
+        aciertos (int): Productos encontrados en la caché
+        fallos (int): Productos que hubo que leer del archivo
+    """
+
+    def __init__(self, ruta: str = "inventario.json", capacidad_cache: int = 10_000):
+        """
+        Prepara el almacenamiento; el índice se construye con `indexar`.
+
+        Args:
+            ruta (str): Archivo JSON del inventario
+            capacidad_cache (int): Máximo de productos sin cambios en la caché
+
+        Raises:
+            ValueError: Si la capacidad de la caché no es positiva
+        """
+        if capacidad_cache <= 0:
+            raise ValueError("La capacidad de la caché debe ser positiva")
+        self._ruta = ruta
+        self.capacidad_cache = capacidad_cache
+        self.aciertos = 0
+        self.fallos = 0
+        self._archivo = None
+        # ID -> ubicación en el archivo, o None si el producto solo está en memoria.
+        self._ubicaciones: Dict[int, Optional[Ubicacion]] = {}
+        self._cache: 'OrderedDict[int, Producto]' = OrderedDict()
+        self._modificados: Dict[int, Producto] = {}
+        self._totales: Optional[Totales] = (0, 0.0, 0.0)
+        self._ids_ordenados: Optional[IdsOrdenados] = None
+        self._siguiente_id = 1
+
+    def indexar(self) -> None:
+        """
+        Construye el índice de posiciones del archivo, descartando los cambios.
+
+        El archivo se recorre con LectorJSONIncremental en 'latin-1' para que
+        las posiciones sean desplazamientos en bytes. Si un ID se repite
+        prevalece la última aparición, igual que en Inventario.
+
+        Raises:
+            IOError: Si el archivo no se puede leer
+            json.JSONDecodeError: Si el archivo no tiene la estructura esperada
+        """
+        lector = LectorJSONIncremental(self._ruta, codificacion='latin-1')
+        ubicaciones: Dict[int, Optional[Ubicacion]] = {}
+        siguiente_id = 1
+        for posicion, (datos, inicio, fin) in enumerate(lector.elementos()):
+            ubicaciones[datos['id']] = (posicion, inicio, fin)
+            siguiente_id = max(siguiente_id, datos['id'] + 1)
+        self._cerrar_archivo()
+        self._archivo = open(self._ruta, 'rb')
+        self._ubicaciones = ubicaciones
+        self._cache.clear()
+        self._modificados.clear()
+        self._totales = None
+        self._ids_ordenados = None
+        self._siguiente_id = max(siguiente_id, lector.metadatos.get('siguiente_id', 1))
+
+    def guardar(self) -> None:
+        """
+        Escribe el inventario en el archivo y deja los cambios confirmados.
+
+        Los productos sin cambios se copian byte a byte desde el archivo
+        anterior; solo se serializan los modificados y los nuevos. Se escribe
+        en un archivo temporal que luego reemplaza al original, de modo que
+        un error a mitad de camino no lo deja a medio escribir.
+
+        Raises:
+            IOError: Si el archivo no se puede escribir
+        """
+        temporal = self._ruta + '.tmp'
+        nuevas: Dict[int, Optional[Ubicacion]] = {}
+        with open(temporal, 'wb') as destino:
+            destino.write(b'{\n    "productos": [')
+            for posicion, (id_producto, ubicacion) in enumerate(self._ubicaciones.items()):
+                if id_producto in self._modificados:
+                    datos = json.dumps(self._modificados[id_producto].a_diccionario(),
+                                       indent=4, ensure_ascii=False)
+                    contenido = datos.replace('\n', '\n        ').encode('utf-8')
+                else:
+                    contenido = self._leer(ubicacion)
+                destino.write(b',\n        ' if posicion else b'\n        ')
+                inicio = destino.tell()
+                destino.write(contenido)
+                nuevas[id_producto] = (posicion, inicio, destino.tell())
+            destino.write(b'\n    ],\n' if nuevas else b'],\n')
+            destino.write(f'    "siguiente_id": {self._siguiente_id}\n}}'.encode('utf-8'))
+        self._cerrar_archivo()
+        os.replace(temporal, self._ruta)
+        self._archivo = open(self._ruta, 'rb')
+        self._ubicaciones = nuevas
+        for id_producto, producto in self._modificados.items():
+            self._guardar_en_cache(id_producto, producto)
+        self._modificados.clear()
+
+    # ==================== ACCESO A LOS PRODUCTOS ====================
+
+    def _leer(self, ubicacion: Ubicacion) -> bytes:
+        """Lee del archivo los bytes de un producto."""
+        _, inicio, fin = ubicacion
+        self._archivo.seek(inicio)
+        return self._archivo.read(fin - inicio)
+
+    def _cargar(self, id_producto: int) -> Optional[Producto]:
+        """Retorna el producto guardado (no una copia), leyéndolo si hace falta."""
+        if id_producto in self._modificados:
+            return self._modificados[id_producto]
+        producto = self._cache.get(id_producto)
+        if producto is not None:
+            self.aciertos += 1
+            self._cache.move_to_end(id_producto)
+            return producto
+        ubicacion = self._ubicaciones.get(id_producto)
+        if ubicacion is None:
+            return None
+        self.fallos += 1
+        producto = Producto.desde_diccionario(json.loads(self._leer(ubicacion).decode('utf-8')))
+        self._guardar_en_cache(id_producto, producto)
+        return producto
+
+    def _guardar_en_cache(self, id_producto: int, producto: Producto) -> None:
+        """Agrega un producto a la caché, descartando el usado hace más tiempo."""
+        self._cache[id_producto] = producto
+        self._cache.move_to_end(id_producto)
+        if len(self._cache) > self.capacidad_cache:
+            self._cache.popitem(last=False)
+
+    def _marcar_modificado(self, producto: Producto) -> None:
+        """Pasa el producto de la caché a los modificados, que no se descartan."""
+        self._cache.pop(producto.id, None)
+        self._modificados[producto.id] = producto
+
+    def _recorrer(self) -> Iterator[Producto]:
+        """
+        Recorre todos los productos leyendo el archivo por bloques.
+
+        Los productos del archivo que fueron modificados se reemplazan por su
+        versión en memoria y al final se agregan los nuevos. Los productos
+        retornados no se agregan a la caché.
+        """
+        if self._archivo is not None:
+            lector = LectorJSONIncremental(self._ruta)
+            for posicion, datos in enumerate(lector.valores()):
+                id_producto = datos['id']
+                ubicacion = self._ubicaciones.get(id_producto)
+                if ubicacion is None or ubicacion[0] != posicion:
+                    # Eliminado, reemplazado por uno nuevo o repetido más adelante.
+                    continue
+                modificado = self._modificados.get(id_producto)
+                yield modificado if modificado is not None else Producto.desde_diccionario(datos)
+        for id_producto, ubicacion in self._ubicaciones.items():
+            if ubicacion is None:
+                yield self._modificados[id_producto]
+
+    def _ajustar_totales(self, producto: Producto, signo: int) -> None:
+        """Suma (signo=1) o resta (signo=-1) un producto a los totales, si ya se conocen."""
+        if self._totales is None:
+            return
+        items, valor, suma_precios = self._totales
+        self._totales = (
+            items + signo * producto.cantidad,
+            valor + signo * producto.obtener_valor_total(),
+            suma_precios + signo * producto.precio,
+        )
+
+    # ==================== AlmacenamientoInventario ====================
+
+    def obtener(self, id_producto: int) -> Optional[Producto]:
+        """Retorna una copia del producto con ese ID o None."""
+        producto = self._cargar(id_producto)
+        return _copiar(producto) if producto is not None else None
+
+    def existe(self, id_producto: int) -> bool:
+        """Indica si hay un producto con ese ID, sin leer el archivo."""
+        return id_producto in self._ubicaciones
+
+    def insertar(self, productos: List[Producto]) -> None:
+        """
+        Inserta productos nuevos en memoria y ajusta el siguiente ID.
+
+        Raises:
+            ValueError: Si algún ID ya existe (no se inserta ninguno)
+        """
+        ids = set()
+        for producto in productos:
+            if producto.id in self._ubicaciones or producto.id in ids:
+                raise ValueError(f"Ya existe un producto con ID {producto.id}")
+            ids.add(producto.id)
+        for producto in productos:
+            copia = _copiar(producto)
+            self._ubicaciones[copia.id] = None
+            self._modificados[copia.id] = copia
+            self._ajustar_totales(copia, 1)
+            if self._ids_ordenados is not None:
+                self._ids_ordenados.agregar(copia.id)
+            self._siguiente_id = max(self._siguiente_id, copia.id + 1)
+
+    def eliminar(self, id_producto: int) -> bool:
+        """Elimina un producto; retorna False si no existía."""
+        if id_producto not in self._ubicaciones:
+            return False
+        if self._totales is not None:
+            self._ajustar_totales(self._cargar(id_producto), -1)
+        del self._ubicaciones[id_producto]
+        if self._ids_ordenados is not None:
+            self._ids_ordenados.quitar(id_producto)
+        self._cache.pop(id_producto, None)
+        self._modificados.pop(id_producto, None)
+        return True
+
+    def actualizar(self, cambios: Iterable[Cambio]) -> int:
+        """
+        Aplica cambios (id, nombre, cantidad, precio); None deja el campo igual.
+
+        Los cambios se validan todos antes de aplicar el primero.
+
+        Returns:
+            int: Número de productos modificados
+        """
+        nuevos = []
+        for id_producto, nombre, cantidad, precio in cambios:
+            actual = self._cargar(id_producto)
+            if actual is None:
+                continue
+            nuevos.append(Producto(
+                id_producto,
+                actual.nombre if nombre is None else nombre,
+                actual.cantidad if cantidad is None else cantidad,
+                actual.precio if precio is None else precio,
+            ))
+        for producto in nuevos:
+            self._ajustar_totales(self._cargar(producto.id), -1)
+            self._ajustar_totales(producto, 1)
+            self._marcar_modificado(producto)
+        return len(nuevos)
+
+    def buscar_por_nombre(self, texto: str) -> List[Producto]:
+        """Productos cuyo nombre contiene `texto` (sin distinguir mayúsculas), por ID."""
+        texto = texto.lower()
+        encontrados = [_copiar(p) for p in self._recorrer() if texto in p.nombre.lower()]
+        return sorted(encontrados, key=lambda producto: producto.id)
+
+    def todos(self) -> Iterator[Producto]:
+        """Recorre todos los productos en el orden del archivo y luego los nuevos."""
+        for producto in self._recorrer():
+            yield _copiar(producto)
+
+    def pagina(self, despues_de: Optional[int], tamano: int) -> Tuple[List[Producto], bool]:
+        """Página por ID; solo se leen del archivo (y pasan a la caché) sus productos."""
+        if self._ids_ordenados is None:
+            self._ids_ordenados = IdsOrdenados(self._ubicaciones)
+        ids, hay_mas = self._ids_ordenados.pagina(despues_de, tamano)
+        return [_copiar(self._cargar(id_producto)) for id_producto in ids], hay_mas
+
+    def con_cantidad_menor(self, umbral: int) -> List[Producto]:
+        """Productos con cantidad < umbral, ordenados por ID."""
+        encontrados = [_copiar(p) for p in self._recorrer() if p.cantidad < umbral]
+        return sorted(encontrados, key=lambda producto: producto.id)
+
+    def mayor_valor(self, k: int) -> List[Producto]:
+        """Los k productos de mayor cantidad * precio, de mayor a menor."""
+        mayores = heapq.nlargest(k, self._recorrer(), key=lambda p: p.obtener_valor_total())
+        return [_copiar(producto) for producto in mayores]
+
+    def en_rango(self, campo: str, minimo: Optional[float],
+                 maximo: Optional[float]) -> List[Producto]:
+        """Productos con `campo` entre `minimo` y `maximo`; recorre el archivo."""
+        valor = _lector_de(campo)
+        encontrados = [
+            _copiar(p) for p in self._recorrer()
+            if (minimo is None or valor(p) >= minimo) and (maximo is None or valor(p) <= maximo)
+        ]
+        return sorted(encontrados, key=lambda p: (valor(p), p.id))
+
+    def extremos(self, campo: str, k: int, mayores: bool = True) -> List[Producto]:
+        """Los k productos con mayor (o menor) `campo`; recorre el archivo."""
+        valor = _lector_de(campo)
+        elegir = heapq.nlargest if mayores else heapq.nsmallest
+        return [_copiar(p) for p in elegir(k, self._recorrer(), key=lambda p: (valor(p), p.id))]
+
+    def contar(self) -> int:
+        """Número de productos."""
+        return len(self._ubicaciones)
+
+    def totales(self) -> Totales:
+        """Retorna (items, valor total, suma de precios); la primera vez lee el archivo."""
+        if self._totales is None:
+            self._totales = self.recalcular_totales()
+        return self._totales
+
+    def recalcular_totales(self, corregir: bool = False) -> Totales:
+        """Recalcula los totales recorriendo los productos; opcionalmente los guarda."""
+        items = 0
+        valor = 0.0
+        suma_precios = 0.0
+        for producto in self._recorrer():
+            items += producto.cantidad
+            valor += producto.obtener_valor_total()
+            suma_precios += producto.precio
+        if corregir:
+            self._totales = (items, valor, suma_precios)
+        return items, valor, suma_precios
+
+    def leer_siguiente_id(self) -> int:
+        """Retorna el siguiente ID disponible."""
+        return self._siguiente_id
+
+    def escribir_siguiente_id(self, siguiente_id: int) -> None:
+        """Guarda en memoria el siguiente ID disponible."""
+        self._siguiente_id = siguiente_id
+
+    def vaciar(self) -> None:
+        """Elimina todos los productos y reinicia el siguiente ID."""
+        self._ubicaciones.clear()
+        self._cache.clear()
+        self._modificados.clear()
+        self._totales = (0, 0.0, 0.0)
+        self._ids_ordenados = IdsOrdenados()
+        self._siguiente_id = 1
+
+    def cerrar(self) -> None:
+        """Cierra el archivo; los cambios sin guardar se pierden."""
+        self._cerrar_archivo()
+
+    def _cerrar_archivo(self) -> None:
+        """Cierra el archivo abierto para lecturas, si lo hay."""
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+
+
+def _lector_de(campo: str):
+    """Retorna una función que lee `campo` ('precio' o 'cantidad') de un producto."""
+    if campo not in CAMPOS_ORDENABLES:
+        raise ValueError(f"Campo no ordenable: {campo!r}")
+    return lambda producto: getattr(producto, campo)
+
+
+def _copiar(producto: Producto) -> Producto:
+    """Crea una copia independiente de un producto."""
+    return Producto(producto.id, producto.nombre, producto.cantidad, producto.precio)
+
+
+class InventarioPerezoso(InventarioAlmacenado):
+    """
+    Inventario sobre un archivo JSON que solo decodifica los productos que se usan.
+
+    Abrirlo solo recorre el archivo para indexar posiciones, sin crear
+    productos ni índices de búsqueda, por lo que el menú aparece antes que
+    con Inventario en archivos grandes. Igual que Inventario, los cambios
+    quedan en memoria hasta llamar a guardar_en_archivo.
+
+    Atributos:
+        almacenamiento (AlmacenamientoJSONPerezoso): Índice, caché y cambios
+    """
+
+    def __init__(self, ruta_archivo: str = "inventario.json",
+                 capacidad_cache: int = 10_000,
+                 verificar_agregados: bool = False):
+        """
+        Inicializa el inventario e indexa el archivo si existe.
+
+        Args:
+            ruta_archivo (str): Ruta del archivo JSON del inventario
+            capacidad_cache (int): Máximo de productos sin cambios en memoria
+            verificar_agregados (bool): Igual que en Inventario
+        """
+        super().__init__(AlmacenamientoJSONPerezoso(ruta_archivo, capacidad_cache),
+                         ruta_archivo, verificar_agregados)
+        if os.path.exists(ruta_archivo):
+            self.cargar_desde_archivo()
+
+    def guardar_en_archivo(self) -> None:
+        """Guarda los cambios en el archivo JSON, reescribiéndolo."""
+        try:
+            self.almacenamiento.guardar()
+            print(f"✓ Inventario guardado exitosamente en '{self._ruta_archivo}'")
+        except IOError as e:
+            print(f"✗ Error al guardar el inventario: {e}")
+
+    def cargar_desde_archivo(self) -> None:
+        """Vuelve a indexar el archivo JSON, descartando los cambios sin guardar."""
+        try:
+            self.almacenamiento.indexar()
+            print(f"✓ Inventario indexado exitosamente desde '{self._ruta_archivo}'")
+        except IOError as e:
+            print(f"✗ Error al cargar el inventario: {e}")
+        except json.JSONDecodeError as e:
+            print(f"✗ Error al decodificar JSON: {e}")
+
+    def __repr__(self) -> str:
+        """Retorna una representación técnica del inventario."""
+        return (f"InventarioPerezoso(productos={self.almacenamiento.contar()}, "
+                f"en_cache={len(self.almacenamiento._cache)})")
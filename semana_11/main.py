@@ -5,16 +5,69 @@ Este módulo proporciona un menú interactivo que permite al usuario realizar op
 sobre el inventario como añadir, eliminar, actualizar, buscar y mostrar productos.
 """
 
+import argparse
+import os
+from typing import TYPE_CHECKING, Optional, Union
+
 from inventario import Inventario
 from producto import Producto
 
+if TYPE_CHECKING:
+    from inventario_almacenado import InventarioAlmacenado
+
+
+MOTORES = ('diccionario', 'columnar', 'sqlite', 'perezoso')
+TAMANO_PAGINA = 20
+
+# Cualquier motor que puede retornar crear_inventario: Inventario y sus
+# subclases (InventarioColumnar, InventarioConcurrente) o InventarioAlmacenado
+# y las suyas (InventarioPerezoso), que tienen la misma interfaz pública.
+MotorInventario = Union[Inventario, 'InventarioAlmacenado']
+
+
+def crear_inventario(motor: str = 'diccionario',
+                     ruta_archivo: str = "inventario.json") -> MotorInventario:
+    """
+    Crea el inventario con el motor de almacenamiento indicado.
+    
+    Args:
+        motor (str): 'diccionario' (por defecto), 'columnar' (requiere NumPy),
+            'sqlite' (base de datos junto al JSON, con extensión '.db';
+            si todavía no existe se migra el JSON la primera vez) o
+            'perezoso' (el mismo JSON, leyendo cada producto al usarlo)
+        ruta_archivo (str): Ruta del archivo JSON del inventario
+        
+    Returns:
+        MotorInventario: Instancia con la interfaz pública de Inventario
+    """
+    if motor == 'columnar':
+        from inventario_columnar import InventarioColumnar
+        return InventarioColumnar(ruta_archivo)
+    if motor == 'sqlite':
+        from almacenamiento import AlmacenamientoSQLite, migrar_json_a_sqlite
+        from inventario_almacenado import InventarioAlmacenado
+        ruta_db = os.path.splitext(ruta_archivo)[0] + '.db'
+        if not os.path.exists(ruta_db) and os.path.exists(ruta_archivo):
+            migrar_json_a_sqlite(ruta_archivo, ruta_db)
+        return InventarioAlmacenado(AlmacenamientoSQLite(ruta_db), ruta_archivo)
+    if motor == 'perezoso':
+        from inventario_perezoso import InventarioPerezoso
+        return InventarioPerezoso(ruta_archivo)
+    return Inventario(ruta_archivo)
+
 
 class GestorInventarioUI:
     """Clase que proporciona la interfaz de usuario para el gestor de inventario."""
     
-    def __init__(self):
-        """Inicializa el gestor de inventario con la UI."""
-        self.inventario = Inventario("inventario.json")
+    def __init__(self, inventario: Optional[MotorInventario] = None):
+        """
+        Inicializa el gestor de inventario con la UI.
+        
+        Args:
+            inventario (MotorInventario, opcional): Inventario a gestionar; por
+                defecto se usa Inventario("inventario.json")
+        """
+        self.inventario = inventario if inventario is not None else Inventario("inventario.json")
     
     def limpiar_pantalla(self) -> None:
         """Limpia la pantalla de la consola."""
@@ -187,15 +240,23 @@ class GestorInventarioUI:
         print("INVENTARIO COMPLETO")
         print("-"*60)
         
-        productos = self.inventario.obtener_todos_productos()
+        productos, cursor = self.inventario.obtener_pagina(TAMANO_PAGINA)
         
         if not productos:
             print("✗ El inventario está vacío")
             return
         
         print(f"\nTotal de productos: {self.inventario.obtener_cantidad_productos()}\n")
-        for i, producto in enumerate(productos, 1):
-            print(f"{i}. {producto}")
+        numero = 1
+        while True:
+            for producto in productos:
+                print(f"{numero}. {producto}")
+                numero += 1
+            if cursor is None:
+                return
+            if input("\nEnter para ver más, 'q' para volver: ").strip().lower() == 'q':
+                return
+            productos, cursor = self.inventario.obtener_pagina(TAMANO_PAGINA, cursor)
     
     def mostrar_estadisticas(self) -> None:
         """Muestra las estadísticas del inventario."""
@@ -271,7 +332,11 @@ class GestorInventarioUI:
 
 def main():
     """Función principal del programa."""
-    gestor = GestorInventarioUI()
+    parser = argparse.ArgumentParser(description="Sistema de gestión de inventario")
+    parser.add_argument('--motor', choices=MOTORES, default='diccionario',
+                        help="Motor de almacenamiento del inventario")
+    argumentos = parser.parse_args()
+    gestor = GestorInventarioUI(crear_inventario(argumentos.motor))
     gestor.ejecutar()
 
 
@@ -16,8 +16,20 @@ class Producto:
         nombre (str): Nombre del producto
         cantidad (int): Cantidad disponible del producto en el inventario
         precio (float): Precio unitario del producto
+    
+    Los objetos interesados (por ejemplo, los índices del Inventario)
+    pueden suscribirse para ser avisados cuando cambia el nombre, la
+    cantidad o el precio. Un producto sin observadores solo paga una
+    comprobación de tupla vacía en cada setter; con observadores, los avisos
+    se hacen directamente desde el setter sin llamadas intermedias.
+    
+    La clase declara `__slots__`, por lo que cada instancia guarda sus
+    atributos en posiciones fijas en lugar de un `__dict__` propio; esto
+    reduce notablemente la memoria usada por producto.
     """
     
+    __slots__ = ('_id', '_nombre', '_cantidad', '_precio', '_observadores')
+    
     def __init__(self, id_producto: int, nombre: str, cantidad: int, precio: float):
         """
         Inicializa un nuevo producto.
@@ -29,8 +41,11 @@ class Producto:
             precio (float): Precio unitario
             
         Raises:
-            ValueError: Si la cantidad o precio son negativos
+            ValueError: Si el nombre no es una cadena no vacía, o si la
+                cantidad o precio son negativos
         """
+        if not nombre or not isinstance(nombre, str):
+            raise ValueError("El nombre debe ser una cadena de texto válida")
         if cantidad < 0 or precio < 0:
             raise ValueError("La cantidad y el precio no pueden ser negativos")
         
@@ -38,6 +53,8 @@ class Producto:
         self._nombre = nombre
         self._cantidad = cantidad
         self._precio = precio
+        # Tupla vacía compartida: un producto sin observadores no ocupa memoria extra.
+        self._observadores = ()
     
     # Getters
     @property
@@ -66,7 +83,11 @@ class Producto:
         """Establece un nuevo nombre al producto."""
         if not nuevo_nombre or not isinstance(nuevo_nombre, str):
             raise ValueError("El nombre debe ser una cadena de texto válida")
+        nombre_anterior = self._nombre
         self._nombre = nuevo_nombre
+        if self._observadores and nombre_anterior != nuevo_nombre:
+            for observador in self._observadores:
+                observador(self, 'nombre', nombre_anterior, nuevo_nombre)
     
     @cantidad.setter
     def cantidad(self, nueva_cantidad: int) -> None:
@@ -81,7 +102,11 @@ class Producto:
         """
         if nueva_cantidad < 0:
             raise ValueError("La cantidad no puede ser negativa")
+        cantidad_anterior = self._cantidad
         self._cantidad = nueva_cantidad
+        if self._observadores and cantidad_anterior != nueva_cantidad:
+            for observador in self._observadores:
+                observador(self, 'cantidad', cantidad_anterior, nueva_cantidad)
     
     @precio.setter
     def precio(self, nuevo_precio: float) -> None:
@@ -96,7 +121,35 @@ class Producto:
         """
         if nuevo_precio < 0:
             raise ValueError("El precio no puede ser negativo")
+        precio_anterior = self._precio
         self._precio = nuevo_precio
+        if self._observadores and precio_anterior != nuevo_precio:
+            for observador in self._observadores:
+                observador(self, 'precio', precio_anterior, nuevo_precio)
+    
+    # Notificación de cambios
+    def suscribir(self, observador) -> None:
+        """
+        Registra un observador que será llamado al cambiar el producto.
+        
+        El observador se llama después de asignar el valor y solo si este
+        cambió de verdad. Registrar dos veces el mismo observador no tiene
+        efecto, para que no reciba cada aviso duplicado.
+        
+        Args:
+            observador: Invocable con la firma
+                observador(producto, atributo, valor_anterior, valor_nuevo),
+                donde atributo es 'nombre', 'cantidad' o 'precio'
+        """
+        if observador not in self._observadores:
+            self._observadores = self._observadores + (observador,)
+    
+    def desuscribir(self, observador) -> None:
+        """Elimina un observador previamente registrado, si existe."""
+        if observador in self._observadores:
+            observadores = list(self._observadores)
+            observadores.remove(observador)
+            self._observadores = tuple(observadores)
     
     def obtener_valor_total(self) -> float:
         """Calcula el valor total del producto (cantidad * precio)."""
@@ -0,0 +1,204 @@
+"""
+Módulo SnapshotBinario: Formato binario compacto para guardar el inventario.
+
+El archivo tiene tres partes:
+
+1. Cabecera: firma b'INVB', versión, cantidad de productos y siguiente_id.
+2. Registros de ancho fijo, ordenados por ID: id (int64), cantidad (int64),
+   precio (float64), desplazamiento y longitud del nombre en la tabla de textos.
+3. Tabla de textos: los nombres codificados en UTF-8, uno tras otro.
+
+Al tener ancho fijo, el registro i está en una posición conocida y el archivo
+puede abrirse con mmap y leerse sin decodificar todo su contenido.
+Incluye conversores desde y hacia el formato JSON de `Inventario`.
+"""
+
+import bisect
+import json
+import mmap
+import os
+import struct
+from typing import Iterable, Iterator, Optional, Tuple
+
+from producto import Producto
+from lector_json import LectorJSONIncremental
+
+
+FIRMA = b'INVB'
+VERSION = 1
+_CABECERA = struct.Struct('<4sHHqq')   # firma, versión, reservado, cantidad, siguiente_id
+_REGISTRO = struct.Struct('<qqdQI')    # id, cantidad, precio, desplazamiento, longitud
+
+Registro = Tuple[int, str, int, float]
+
+
+def guardar_snapshot(productos: Iterable[Producto], siguiente_id: int, ruta: str) -> None:
+    """
+    Escribe un snapshot binario con los productos indicados.
+
+    Args:
+        productos (Iterable[Producto]): Productos a guardar
+        siguiente_id (int): Siguiente ID disponible del inventario
+        ruta (str): Ruta del archivo a crear
+    """
+    ordenados = sorted(productos, key=lambda producto: producto.id)
+    registros = bytearray(_REGISTRO.size * len(ordenados))
+    textos = bytearray()
+    for i, producto in enumerate(ordenados):
+        nombre = producto.nombre.encode('utf-8')
+        _REGISTRO.pack_into(registros, i * _REGISTRO.size, producto.id,
+                            producto.cantidad, producto.precio, len(textos), len(nombre))
+        textos += nombre
+
+    ruta_temporal = f"{ruta}.tmp"
+    with open(ruta_temporal, 'wb') as archivo:
+        archivo.write(_CABECERA.pack(FIRMA, VERSION, 0, len(ordenados), siguiente_id))
+        archivo.write(registros)
+        archivo.write(textos)
+    os.replace(ruta_temporal, ruta)
+
+
+class SnapshotBinario:
+    """
+    Lector de un snapshot binario abierto con mmap.
+
+    Permite recorrer los registros, acceder al i-ésimo en O(1) y buscar por
+    ID con búsqueda binaria, sin cargar el archivo completo en memoria.
+
+    Atributos:
+        cantidad (int): Número de productos del snapshot
+        siguiente_id (int): Siguiente ID guardado en la cabecera
+    """
+
+    def __init__(self, ruta: str):
+        """
+        Abre el snapshot y valida su cabecera.
+
+        Raises:
+            ValueError: Si el archivo no es un snapshot válido
+        """
+        with open(ruta, 'rb') as archivo:
+            tamano = os.fstat(archivo.fileno()).st_size
+            if tamano < _CABECERA.size:
+                raise ValueError(f"'{ruta}' no es un snapshot binario de inventario")
+            self._mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        firma, version, _, self.cantidad, self.siguiente_id = _CABECERA.unpack_from(self._mapa, 0)
+        if firma != FIRMA or version != VERSION:
+            self.cerrar()
+            raise ValueError(f"'{ruta}' no es un snapshot binario de inventario (v{VERSION})")
+        self._inicio_textos = _CABECERA.size + self.cantidad * _REGISTRO.size
+        if tamano < self._inicio_textos:
+            self.cerrar()
+            raise ValueError(f"El snapshot '{ruta}' está truncado")
+
+    def __len__(self) -> int:
+        """Retorna la cantidad de productos del snapshot."""
+        return self.cantidad
+
+    def __enter__(self) -> 'SnapshotBinario':
+        """Permite usar el snapshot con la sentencia with."""
+        return self
+
+    def __exit__(self, *excepcion) -> None:
+        """Cierra el snapshot al salir del bloque with."""
+        self.cerrar()
+
+    def cerrar(self) -> None:
+        """Libera el mapeo de memoria del archivo."""
+        self._mapa.close()
+
+    def registro(self, indice: int) -> Registro:
+        """Retorna el registro i como (id, nombre, cantidad, precio)."""
+        if not 0 <= indice < self.cantidad:
+            raise IndexError(indice)
+        id_producto, cantidad, precio, desplazamiento, longitud = _REGISTRO.unpack_from(
+            self._mapa, _CABECERA.size + indice * _REGISTRO.size
+        )
+        inicio = self._inicio_textos + desplazamiento
+        nombre = self._mapa[inicio:inicio + longitud].decode('utf-8')
+        return id_producto, nombre, cantidad, precio
+
+    def id_en(self, indice: int) -> int:
+        """Retorna solo el ID del registro i (sin decodificar el nombre)."""
+        return struct.unpack_from('<q', self._mapa, _CABECERA.size + indice * _REGISTRO.size)[0]
+
+    def buscar(self, id_producto: int) -> Optional[Registro]:
+        """Busca un registro por ID con búsqueda binaria (O(log n))."""
+        indice = bisect.bisect_left(_VistaIds(self), id_producto)
+        if indice < self.cantidad and self.id_en(indice) == id_producto:
+            return self.registro(indice)
+        return None
+
+    def __iter__(self) -> Iterator[Registro]:
+        """Recorre todos los registros en orden de ID."""
+        vista = memoryview(self._mapa)[_CABECERA.size:self._inicio_textos]
+        try:
+            for id_producto, cantidad, precio, desplazamiento, longitud in _REGISTRO.iter_unpack(vista):
+                inicio = self._inicio_textos + desplazamiento
+                yield id_producto, self._mapa[inicio:inicio + longitud].decode('utf-8'), cantidad, precio
+        finally:
+            vista.release()
+
+
+class _VistaIds:
+    """Secuencia de solo lectura con los IDs del snapshot, para usar con bisect."""
+
+    def __init__(self, snapshot: SnapshotBinario):
+        """Envuelve el snapshot cuyos IDs se consultarán."""
+        self._snapshot = snapshot
+
+    def __len__(self) -> int:
+        """Retorna la cantidad de registros."""
+        return len(self._snapshot)
+
+    def __getitem__(self, indice: int) -> int:
+        """Retorna el ID del registro i."""
+        return self._snapshot.id_en(indice)
+
+
+def json_a_binario(ruta_json: str, ruta_binaria: str) -> int:
+    """
+    Convierte un archivo JSON del inventario al formato binario.
+
+    Returns:
+        int: Cantidad de productos convertidos
+    """
+    lector = LectorJSONIncremental(ruta_json)
+    productos = [Producto.desde_diccionario(datos) for datos in lector.valores()]
+    siguiente_id = max([lector.metadatos.get('siguiente_id', 1)] + [p.id + 1 for p in productos])
+    guardar_snapshot(productos, siguiente_id, ruta_binaria)
+    return len(productos)
+
+
+def binario_a_json(ruta_binaria: str, ruta_json: str) -> int:
+    """
+    Convierte un snapshot binario al formato JSON de `Inventario.guardar_en_archivo`.
+
+    Returns:
+        int: Cantidad de productos convertidos
+    """
+    with SnapshotBinario(ruta_binaria) as snapshot:
+        datos = {
+            'productos': [
+                {'id': id_producto, 'nombre': nombre, 'cantidad': cantidad, 'precio': precio}
+                for id_producto, nombre, cantidad, precio in snapshot
+            ],
+            'siguiente_id': snapshot.siguiente_id
+        }
+    with open(ruta_json, 'w', encoding='utf-8') as archivo:
+        json.dump(datos, archivo, indent=4, ensure_ascii=False)
+    return len(datos['productos'])
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convierte inventarios entre JSON y binario")
+    parser.add_argument('origen')
+    parser.add_argument('destino')
+    argumentos = parser.parse_args()
+    if argumentos.origen.endswith('.json'):
+        total = json_a_binario(argumentos.origen, argumentos.destino)
+    else:
+        total = binario_a_json(argumentos.origen, argumentos.destino)
+    print(f"✓ {total} productos convertidos a '{argumentos.destino}'")
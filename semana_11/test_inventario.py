@@ -6,8 +6,10 @@ del sistema de gestión de inventario funcionan correctamente.
 """
 
 import os
+import io
 import json
 import tempfile
+import contextlib
 from producto import Producto
 from inventario import Inventario
 
@@ -59,6 +61,10 @@ def test_producto():
     assert producto2.nombre == producto.nombre
     print("✓ Creación desde diccionario funciona")
     
+    # Prubar representación compacta con __slots__
+    assert not hasattr(producto, '__dict__')
+    print("✓ Producto no tiene __dict__ por instancia")
+    
     # Prubar validaciones
     try:
         producto_invalido = Producto(2, "Test", -5, 100)
@@ -159,6 +165,20 @@ def test_busqueda_productos():
     resultados = inv.buscar_por_nombre("Inexistente")
     assert len(resultados) == 0
     print("✓ Búsqueda sin resultados retorna lista vacía")
+    
+    # Prueba búsqueda con consultas cortas y subcadenas no contiguas
+    assert len(inv.buscar_por_nombre("hp")) == 1
+    assert inv.buscar_por_nombre("Laptop Mouse") == []
+    print("✓ Búsqueda por trigramas respeta coincidencias parciales")
+    
+    # Prueba que el índice sigue los cambios de nombre y eliminaciones
+    producto = inv.buscar_por_nombre("Lenovo")[0]
+    producto.nombre = "Tablet Lenovo"
+    assert len(inv.buscar_por_nombre("laptop")) == 2
+    assert inv.buscar_por_nombre("tablet") == [producto]
+    inv.eliminar_producto(producto.id)
+    assert inv.buscar_por_nombre("lenovo") == []
+    print("✓ El índice de nombres se actualiza con cambios y eliminaciones")
 
 
 def test_estadisticas():
@@ -192,6 +212,481 @@ def test_estadisticas():
     print(f"✓ Precio promedio: ${stats['precio_promedio']:.2f}")
 
 
+def test_estadisticas_incrementales():
+    """Prueba que los totales acumulados coinciden con un recálculo completo."""
+    print("\n" + "="*60)
+    print("PRUEBAS - ESTADÍSTICAS INCREMENTALES")
+    print("="*60)
+    
+    inv = Inventario(":memory:", verificar_agregados=True)
+    id1 = inv.añadir_producto("Producto A", 10, 100)
+    id2 = inv.añadir_producto("Producto B", 20, 50)
+    id3 = inv.añadir_producto("Producto C", 5, 200)
+    
+    inv.actualizar_cantidad(id1, 4)
+    inv.actualizar_precio(id2, 25)
+    inv.eliminar_producto(id3)
+    
+    stats = inv.obtener_estadisticas()
+    assert stats['cantidad_items_totales'] == 24
+    assert stats['valor_total_inventario'] == 4 * 100 + 20 * 25
+    assert stats['precio_promedio'] == (100 + 25) / 2
+    assert inv.verificar_estadisticas()
+    print("✓ Totales acumulados correctos tras actualizar y eliminar")
+    
+    # Un valor inválido no debe alterar los totales
+    try:
+        inv.actualizar_cantidad(id1, -1)
+    except ValueError:
+        pass
+    assert inv.obtener_cantidad_items() == 24
+    print("✓ Los totales no cambian si la actualización es rechazada")
+    
+    # Cambios directos sobre los productos, sin pasar por el inventario
+    producto = inv.buscar_por_id(id1)
+    producto.cantidad = 6
+    producto.precio = 110
+    stats = inv.obtener_estadisticas()
+    assert stats['cantidad_items_totales'] == 26
+    assert stats['valor_total_inventario'] == 6 * 110 + 20 * 25
+    print("✓ Asignar cantidad o precio al producto actualiza los totales")
+    
+    # Suscribirse dos veces no duplica los avisos
+    avisos = []
+    observador = lambda *cambio: avisos.append(cambio[1:])
+    producto.suscribir(observador)
+    producto.suscribir(observador)
+    producto.cantidad = 7
+    producto.cantidad = 7
+    assert avisos == [('cantidad', 6, 7)]
+    producto.desuscribir(observador)
+    print("✓ Un observador recibe un solo aviso y solo si el valor cambia")
+    
+    # Un producto eliminado deja de afectar al inventario
+    inv.eliminar_producto(id1)
+    producto.cantidad = 1000
+    assert inv.obtener_cantidad_items() == 20
+    assert inv.verificar_estadisticas()
+    print("✓ Un producto eliminado ya no modifica los totales")
+
+
+def test_listado_por_paginas():
+    """Prueba las páginas por ID con cursor en los distintos inventarios."""
+    from almacenamiento import AlmacenamientoSQLite
+    from inventario_almacenado import InventarioAlmacenado
+    from inventario_perezoso import InventarioPerezoso
+    
+    print("\n" + "="*60)
+    print("PRUEBAS - LISTADO POR PÁGINAS")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "inventario.json")
+        base = Inventario(ruta)
+        for id_producto in (5, 1, 4, 2, 3):
+            base.añadir_producto(f"Producto {id_producto}", id_producto, 1.0, id_producto=id_producto)
+        base.guardar_en_archivo()
+        
+        inventarios = [
+            Inventario(ruta),
+            InventarioAlmacenado(AlmacenamientoSQLite(":memory:")),
+            InventarioPerezoso(ruta, capacidad_cache=2),
+        ]
+        for id_producto in (5, 1, 4, 2, 3):
+            inventarios[1].añadir_producto(f"Producto {id_producto}", id_producto, 1.0,
+                                           id_producto=id_producto)
+        
+        for inv in inventarios:
+            productos, cursor = inv.obtener_pagina(2)
+            assert [p.id for p in productos] == [1, 2] and cursor == 2
+            inv.eliminar_producto(3)
+            inv.añadir_producto("Nuevo", 1, 1.0, id_producto=0)
+            inv.añadir_producto("Último", 1, 1.0)
+            productos, cursor = inv.obtener_pagina(2, cursor)
+            assert [p.id for p in productos] == [4, 5] and cursor == 5
+            productos, cursor = inv.obtener_pagina(2, cursor)
+            assert [p.id for p in productos] == [6] and cursor is None
+            assert [p.id for p in inv.iterar_productos(tamano_pagina=4)] == [0, 1, 2, 4, 5, 6]
+        inventarios[2].cerrar()
+        print("✓ Las páginas siguen el orden por ID aunque cambie el inventario")
+    
+    try:
+        Inventario(":memory:").obtener_pagina(0)
+        assert False, "Debería rechazar un tamaño de página no positivo"
+    except ValueError:
+        print("✓ Tamaño de página inválido rechazado")
+
+
+def test_consultas_por_rango():
+    """Prueba los índices ordenados de precio y cantidad, también ante setters directos."""
+    from almacenamiento import AlmacenamientoSQLite
+    from inventario_almacenado import InventarioAlmacenado
+    from inventario_perezoso import InventarioPerezoso
+    
+    print("\n" + "="*60)
+    print("PRUEBAS - CONSULTAS POR RANGO DE PRECIO Y CANTIDAD")
+    print("="*60)
+    
+    filas = [("Lápiz", 100, 1.5), ("Cuaderno", 4, 3.0), ("Mochila", 2, 40.0),
+             ("Regla", 4, 1.5), ("Calculadora", 10, 25.0)]
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "inventario.json")
+        inv = Inventario(ruta, verificar_agregados=True)
+        inv.añadir_productos(filas)
+        inv.guardar_en_archivo()
+        inventarios = [inv, InventarioAlmacenado(AlmacenamientoSQLite(":memory:")),
+                       InventarioPerezoso(ruta)]
+        inventarios[1].añadir_productos(filas)
+        
+        for motor in inventarios:
+            assert [p.id for p in motor.productos_en_rango_precio(1.5, 25.0)] == [1, 4, 2, 5]
+            assert [p.id for p in motor.productos_en_rango_precio(minimo=30)] == [3]
+            assert [p.id for p in motor.productos_en_rango_cantidad(maximo=4)] == [3, 2, 4]
+            assert [p.id for p in motor.productos_mayor_precio(2)] == [3, 5]
+            assert [p.id for p in motor.productos_menor_cantidad(2)] == [3, 2]
+            assert [p.id for p in motor.productos_con_cantidad_menor(5)] == [2, 3, 4]
+        print("✓ Rangos, top-k y stock bajo coinciden en todos los motores")
+        
+        for motor in inventarios:
+            motor.buscar_por_id(1).cantidad = 0
+            motor.buscar_por_id(3).precio = 2.0
+            motor.actualizar_precio(5, 0.5)
+            motor.añadir_producto("Goma", 3, 0.25)
+            assert [p.id for p in motor.productos_menor_cantidad(1)] == [1]
+            assert [p.id for p in motor.productos_en_rango_precio(maximo=2.0)] == [6, 5, 1, 4, 3]
+            assert [p.id for p in motor.productos_mayor_precio(1)] == [2]
+        assert inv.obtener_estadisticas()['cantidad_items_totales'] == 23
+        assert inventarios[1].obtener_estadisticas() == inv.obtener_estadisticas()
+        inventarios[2].cerrar()
+        print("✓ Los índices y totales siguen al día al asignar cantidad y precio directamente")
+
+
+def test_operaciones_por_lote():
+    """Prueba las operaciones de inserción y actualización por lote."""
+    print("\n" + "="*60)
+    print("PRUEBAS - OPERACIONES POR LOTE")
+    print("="*60)
+    
+    inv = Inventario(":memory:", verificar_agregados=True)
+    ids = inv.añadir_productos([
+        ("Lápiz", 10, 0.5),
+        {'nombre': "Cuaderno", 'cantidad': 4, 'precio': 2.0},
+    ])
+    assert ids == [1, 2]
+    assert inv.buscar_por_id(2).nombre == "Cuaderno"
+    assert inv.obtener_siguiente_id() == 3
+    print("✓ Inserción por lote con tuplas y diccionarios")
+    
+    # Una fila inválida impide añadir todo el lote
+    try:
+        inv.añadir_productos([("Borrador", 1, 1.0), ("Regla", -1, 1.0)])
+        assert False, "Se aceptó una fila inválida"
+    except ValueError as e:
+        assert "Fila 1" in str(e)
+    assert inv.obtener_cantidad_productos() == 2
+    assert inv.obtener_siguiente_id() == 3
+    
+    # Un nombre que no es texto también se rechaza antes de tocar el inventario
+    try:
+        inv.añadir_productos([("Borrador", 1, 1.0), (123, 1, 1.0)])
+        assert False, "Se aceptó un nombre inválido"
+    except ValueError as e:
+        assert "Fila 1" in str(e)
+    assert inv.obtener_cantidad_productos() == 2
+    assert [p.id for p in inv.iterar_productos()] == [1, 2]
+    assert inv.buscar_por_nombre("Borrador") == []
+    print("✓ Inserción por lote es todo o nada")
+    
+    aplicados = inv.actualizar_productos([(1, 20, None), {'id': 2, 'precio': 3.0}])
+    assert aplicados == 2
+    assert inv.buscar_por_id(1).cantidad == 20
+    assert inv.buscar_por_id(1).precio == 0.5
+    assert inv.buscar_por_id(2).precio == 3.0
+    print("✓ Actualización por lote aplica solo los campos indicados")
+    
+    try:
+        inv.actualizar_productos([(1, 0, None), (99, 1, 1.0)])
+        assert False, "Se aceptó un ID inexistente"
+    except ValueError:
+        pass
+    assert inv.buscar_por_id(1).cantidad == 20
+    stats = inv.obtener_estadisticas()
+    assert stats['valor_total_inventario'] == 20 * 0.5 + 4 * 3.0
+    print("✓ Actualización por lote es todo o nada")
+
+
+def test_inventario_columnar():
+    """Prueba que el motor columnar coincide con el inventario por diccionario."""
+    print("\n" + "="*60)
+    print("PRUEBAS - INVENTARIO COLUMNAR")
+    print("="*60)
+    
+    try:
+        from inventario_columnar import InventarioColumnar
+        inv_col = InventarioColumnar(":memory:", verificar_agregados=True, capacidad_inicial=2)
+    except ImportError:
+        print("- NumPy no está instalado; se omite la prueba")
+        return
+    inv = Inventario(":memory:")
+    filas = [("Mouse", 50, 25.0), ("Teclado", 3, 50.0), ("Monitor", 10, 300.0), ("Cable", 1, 2.0)]
+    for motor in (inv, inv_col):
+        motor.añadir_productos(filas)
+        motor.eliminar_producto(1)
+        motor.actualizar_cantidad(3, 2)
+        motor.actualizar_precio(4, 5.0)
+        motor.buscar_por_id(2).nombre = "Teclado mecánico"
+    
+    assert inv_col._num_filas == 3
+    assert inv_col.verificar_estadisticas()
+    assert inv_col.obtener_estadisticas() == inv.obtener_estadisticas()
+    print("✓ Columnas sincronizadas tras añadir, eliminar y actualizar")
+    
+    assert [p.id for p in inv_col.productos_con_cantidad_menor(3)] == [3, 4]
+    assert [p.id for p in inv.productos_con_cantidad_menor(3)] == [3, 4]
+    assert [p.id for p in inv_col.productos_mayor_valor(2)] == [3, 2]
+    assert [p.id for p in inv.productos_mayor_valor(2)] == [3, 2]
+    assert inv_col._nombres[inv_col._filas[2]] == "Teclado mecánico"
+    print("✓ Filtros y top-k vectorizados coinciden con la versión por diccionario")
+    
+    estadisticas = inv_col.obtener_estadisticas()
+    for cambio in (lambda: inv_col.actualizar_cantidad(3, 2.5),
+                   lambda: inv_col.actualizar_productos([(4, 3, None), (2, 1.5, None)]),
+                   lambda: inv_col.añadir_productos([("Hub", 1, 9.0), ("Pila", 0.5, 1.0)]),
+                   lambda: inv_col.añadir_producto("Pila", 0.5, 1.0)):
+        try:
+            cambio()
+            assert False, "Debería rechazar una cantidad con decimales"
+        except ValueError:
+            pass
+    assert inv_col.buscar_por_id(3).cantidad == 2
+    assert inv_col.buscar_por_id(4).cantidad == 1
+    assert inv_col._num_filas == 3
+    assert inv_col.obtener_estadisticas() == estadisticas
+    assert inv_col.verificar_estadisticas()
+    inv_col.actualizar_cantidad(3, 4.0)
+    assert inv_col._cantidades[inv_col._filas[3]] == 4
+    assert inv_col.verificar_estadisticas()
+    print("✓ Cantidades con decimales rechazadas sin truncarse en la columna int64")
+
+
+def test_inventario_concurrente():
+    """Prueba altas y guardados simultáneos desde varios hilos."""
+    import threading
+    from concurrencia import InventarioConcurrente
+    
+    print("\n" + "="*60)
+    print("PRUEBAS - INVENTARIO CONCURRENTE")
+    print("="*60)
+    
+    inv = InventarioConcurrente(":memory:", verificar_agregados=True)
+    errores = []
+    
+    def añadir_varios():
+        try:
+            for i in range(200):
+                inv.añadir_producto(f"Item {i}", 1, 2.0)
+        except Exception as e:  # se informa en el hilo principal
+            errores.append(e)
+    
+    def consultar_varias_veces():
+        try:
+            for _ in range(50):
+                inv.obtener_estadisticas()
+                inv.buscar_por_nombre("item 1")
+                inv.productos_mayor_valor(5)
+        except Exception as e:
+            errores.append(e)
+    
+    hilos = [threading.Thread(target=añadir_varios) for _ in range(8)]
+    hilos += [threading.Thread(target=consultar_varias_veces) for _ in range(4)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    
+    assert not errores, errores
+    assert inv.obtener_cantidad_productos() == 1600
+    assert sorted(p.id for p in inv.obtener_todos_productos()) == list(range(1, 1601))
+    assert inv.obtener_cantidad_items() == 1600
+    print("✓ Altas simultáneas reciben IDs distintos y los totales cuadran")
+    
+    cerrojo = inv._cerrojo
+    with cerrojo.lectura():
+        with cerrojo.lectura():
+            pass
+        try:
+            cerrojo.adquirir_escritura()
+            assert False, "Debería impedir pasar de lectura a escritura"
+        except RuntimeError:
+            pass
+    with cerrojo.escritura():
+        with cerrojo.lectura():
+            pass
+    print("✓ Cerrojo reentrante y sin paso de lectura a escritura")
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "concurrente.json")
+        salida = io.StringIO()
+        with contextlib.redirect_stdout(salida):
+            inv = InventarioConcurrente(ruta)
+            inv.añadir_productos([(f"Item {i}", i, 1.5) for i in range(1000)])
+            
+            def guardar_varias_veces():
+                try:
+                    for _ in range(5):
+                        inv.guardar_en_archivo()
+                        inv.guardar_snapshot_binario()
+                except Exception as e:
+                    errores.append(e)
+            
+            hilos = [threading.Thread(target=guardar_varias_veces) for _ in range(8)]
+            for hilo in hilos:
+                hilo.start()
+            for hilo in hilos:
+                hilo.join()
+            assert not errores, errores
+            assert "✗" not in salida.getvalue(), salida.getvalue()
+            with open(ruta, encoding='utf-8') as archivo:
+                assert len(json.load(archivo)['productos']) == 1000
+            recargado = Inventario(ruta)
+            assert recargado.obtener_cantidad_productos() == 1000
+            recargado.cargar_snapshot_binario()
+            assert recargado.obtener_cantidad_items() == inv.obtener_cantidad_items()
+    print("✓ Guardados simultáneos dejan archivos completos")
+
+
+def test_inventario_sqlite():
+    """Prueba que el inventario sobre SQLite coincide con el de diccionario."""
+    from almacenamiento import AlmacenamientoSQLite, migrar_json_a_sqlite
+    from inventario_almacenado import InventarioAlmacenado
+    
+    print("\n" + "="*60)
+    print("PRUEBAS - INVENTARIO SOBRE SQLITE")
+    print("="*60)
+    
+    inv = Inventario(":memory:")
+    inv_sql = InventarioAlmacenado(AlmacenamientoSQLite(":memory:"), verificar_agregados=True)
+    filas = [("Mouse óptico", 50, 25.0), ("Teclado", 3, 50.0), ("Monitor", 10, 300.0), ("Cable 100%", 1, 2.0)]
+    for motor in (inv, inv_sql):
+        motor.añadir_productos(filas)
+        motor.eliminar_producto(1)
+        motor.actualizar_cantidad(3, 2)
+        motor.actualizar_productos([(4, None, 5.0)])
+        motor.añadir_producto("Mouse inalámbrico", 7, 30.0)
+        motor.buscar_por_id(2).nombre = "Teclado mecánico"
+    
+    assert inv_sql.obtener_estadisticas() == inv.obtener_estadisticas()
+    assert inv_sql.verificar_estadisticas()
+    assert inv_sql.obtener_siguiente_id() == inv.obtener_siguiente_id() == 6
+    print("✓ Altas, bajas, actualizaciones y estadísticas coinciden")
+    
+    for consulta in ("MOUSE", "mecá", "0%", "te", "x", " ", " inal", "mouse ", ""):
+        assert ([p.id for p in inv_sql.buscar_por_nombre(consulta)]
+                == [p.id for p in inv.buscar_por_nombre(consulta)]), consulta
+    assert [p.id for p in inv_sql.productos_con_cantidad_menor(3)] == [3, 4]
+    assert [p.id for p in inv_sql.productos_mayor_valor(2)] == [3, 5]
+    print("✓ Búsquedas por nombre, stock bajo y top-k coinciden")
+    
+    try:
+        inv_sql.añadir_producto("Repetido", 1, 1.0, id_producto=2)
+        assert False, "Debería rechazar un ID repetido"
+    except ValueError:
+        pass
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta_json = os.path.join(directorio, "inventario.json")
+        ruta_db = os.path.join(directorio, "inventario.db")
+        inv._ruta_archivo = ruta_json
+        inv.guardar_en_archivo()
+        assert migrar_json_a_sqlite(ruta_json, ruta_db, tamano_lote=2) == 4
+        with InventarioAlmacenado(AlmacenamientoSQLite(ruta_db)) as migrado:
+            assert migrado.obtener_estadisticas() == inv.obtener_estadisticas()
+            assert migrado.obtener_siguiente_id() == 6
+        
+        # Una fila inválida no deja vacía la base de datos ni el inventario
+        ruta_invalido = os.path.join(directorio, "invalido.json")
+        with open(ruta_invalido, 'w', encoding='utf-8') as archivo:
+            json.dump({'productos': [{'id': 1, 'nombre': "A", 'cantidad': 1, 'precio': 1.0},
+                                     {'id': 2, 'nombre': "B", 'cantidad': -1, 'precio': 1.0}]}, archivo)
+        try:
+            migrar_json_a_sqlite(ruta_invalido, ruta_db)
+            assert False, "Se migró un archivo con una fila inválida"
+        except ValueError:
+            pass
+        with InventarioAlmacenado(AlmacenamientoSQLite(ruta_db), ruta_invalido) as migrado:
+            assert migrado.obtener_cantidad_productos() == 4
+            migrado.cargar_desde_archivo()
+            assert migrado.obtener_estadisticas() == inv.obtener_estadisticas()
+        
+        # Un ID repetido se queda con su última aparición, como en Inventario
+        with open(ruta_invalido, 'w', encoding='utf-8') as archivo:
+            json.dump({'productos': [{'id': 1, 'nombre': "A", 'cantidad': 1, 'precio': 1.0},
+                                     {'id': 1, 'nombre': "B", 'cantidad': 2, 'precio': 1.0}]}, archivo)
+        assert migrar_json_a_sqlite(ruta_invalido, ruta_db) == 1
+        with InventarioAlmacenado(AlmacenamientoSQLite(ruta_db)) as migrado:
+            assert migrado.buscar_por_id(1).nombre == "B"
+            assert [p.id for p in migrado.buscar_por_nombre("b")] == [1]
+            assert migrado.obtener_cantidad_items() == 2
+    print("✓ Migración desde JSON a SQLite")
+
+
+def test_inventario_perezoso():
+    """Prueba que el inventario perezoso lee, modifica y guarda igual que Inventario."""
+    from inventario_perezoso import InventarioPerezoso
+    
+    print("\n" + "="*60)
+    print("PRUEBAS - INVENTARIO PEREZOSO")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "inventario.json")
+        inv = Inventario(ruta)
+        inv.añadir_productos([("Mouse óptico", 50, 25.0), ("Teclado", 3, 50.0),
+                              ("Monitor", 10, 300.0), ("Cable 100%", 1, 2.0)])
+        inv.guardar_en_archivo()
+        
+        perezoso = InventarioPerezoso(ruta, capacidad_cache=2, verificar_agregados=True)
+        assert perezoso.obtener_cantidad_productos() == 4
+        assert not perezoso.almacenamiento._cache
+        assert perezoso.buscar_por_id(1).nombre == "Mouse óptico"
+        perezoso.buscar_por_id(2)
+        perezoso.buscar_por_id(3)
+        assert list(perezoso.almacenamiento._cache) == [2, 3]
+        perezoso.buscar_por_id(3)
+        assert perezoso.almacenamiento.aciertos == 1
+        print("✓ Los productos se leen al pedirlos y la caché descarta los menos usados")
+        
+        for motor in (inv, perezoso):
+            motor.eliminar_producto(1)
+            motor.actualizar_cantidad(3, 2)
+            motor.actualizar_productos([(4, None, 5.0)])
+            motor.añadir_producto("Mouse inalámbrico", 7, 30.0)
+            motor.buscar_por_id(2).nombre = "Teclado mecánico"
+        perezoso.buscar_por_id(5)
+        perezoso.buscar_por_id(2)
+        assert perezoso.buscar_por_id(3).cantidad == 2
+        assert perezoso.obtener_estadisticas() == inv.obtener_estadisticas()
+        for consulta in ("MOUSE", "mecá", "0%", "x"):
+            assert ([p.id for p in perezoso.buscar_por_nombre(consulta)]
+                    == [p.id for p in inv.buscar_por_nombre(consulta)]), consulta
+        assert [p.id for p in perezoso.productos_mayor_valor(2)] == [3, 5]
+        print("✓ Los cambios se mantienen aunque la caché se llene")
+        
+        perezoso.guardar_en_archivo()
+        with open(ruta, encoding='utf-8') as archivo:
+            datos = json.load(archivo)
+        assert [p['id'] for p in datos['productos']] == [2, 3, 4, 5]
+        assert datos['siguiente_id'] == 6
+        recargado = Inventario(ruta)
+        assert recargado.obtener_estadisticas() == inv.obtener_estadisticas()
+        with InventarioPerezoso(ruta) as otro:
+            assert otro.buscar_por_id(2).nombre == "Teclado mecánico"
+        perezoso.actualizar_precio(2, 60.0)
+        assert perezoso.buscar_por_id(2).precio == 60.0
+        perezoso.cerrar()
+        print("✓ Guardar reescribe el archivo en el formato de Inventario")
+
+
 def test_serializacion():
     """Prueba la serialización y deserialización."""
     print("\n" + "="*60)
@@ -230,6 +725,77 @@ def test_serializacion():
         assert 'productos' in datos
         assert 'siguiente_id' in datos
         print("✓ Formato JSON válido")
+        
+        # Un siguiente_id desactualizado no debe reutilizar IDs existentes
+        datos['siguiente_id'] = 1
+        with open(ruta_archivo, 'w') as f:
+            json.dump(datos, f)
+        inv3 = Inventario(ruta_archivo)
+        assert inv3.obtener_siguiente_id() == 3
+        print("✓ Se restaura la marca máxima de IDs al cargar")
+        
+        # Snapshot binario: ida y vuelta y conversión desde/hacia JSON
+        from snapshot_binario import SnapshotBinario, binario_a_json, json_a_binario
+        ruta_binaria = ruta_archivo + ".bin"
+        ruta_json_convertido = ruta_archivo + ".convertido.json"
+        try:
+            inv2.buscar_por_id(1).nombre = "Café ☕"
+            inv2.guardar_snapshot_binario(ruta_binaria)
+            inv_bin = Inventario(":memory:")
+            inv_bin.cargar_snapshot_binario(ruta_binaria)
+            assert [p.a_diccionario() for p in inv_bin.obtener_todos_productos()] == \
+                [p.a_diccionario() for p in inv2.obtener_todos_productos()]
+            assert inv_bin.obtener_siguiente_id() == inv2.obtener_siguiente_id()
+            with SnapshotBinario(ruta_binaria) as snapshot:
+                assert snapshot.buscar(2) == (2, "Producto 2", 20, 200.0)
+                assert snapshot.buscar(7) is None
+            
+            assert binario_a_json(ruta_binaria, ruta_json_convertido) == 2
+            assert json_a_binario(ruta_json_convertido, ruta_binaria) == 2
+            inv_convertido = Inventario(ruta_json_convertido)
+            assert inv_convertido.buscar_por_id(1).nombre == "Café ☕"
+            print("✓ Snapshot binario y conversores JSON funcionan")
+        finally:
+            for ruta in (ruta_binaria, ruta_json_convertido):
+                if os.path.exists(ruta):
+                    os.unlink(ruta)
+        
+        # Carga incremental con reporte de progreso
+        avisos = []
+        inv3.cargar_desde_archivo(
+            progreso=lambda leidos, totales, cargados: avisos.append((leidos, totales, cargados)),
+            intervalo_progreso=1,
+        )
+        assert [cargados for _, _, cargados in avisos] == [1, 2, 2]
+        assert avisos[-1][0] == avisos[-1][1] == os.path.getsize(ruta_archivo)
+        print("✓ Carga incremental reporta el progreso")
+        
+        # Lectura completa (archivo pequeño) y por bloques dan lo mismo
+        from lector_json import LectorJSONIncremental
+        completo = LectorJSONIncremental(ruta_archivo)
+        por_bloques = LectorJSONIncremental(ruta_archivo, tamano_bloque=16, umbral_carga_completa=0)
+        assert list(completo.valores()) == list(por_bloques.valores())
+        assert completo.metadatos == por_bloques.metadatos == {'siguiente_id': 1}
+        print("✓ Lectura completa y por bloques coinciden")
+        
+        # Un archivo truncado no debe alterar el inventario cargado
+        with open(ruta_archivo, 'w') as f:
+            f.write('{"productos": [{"id": 9, "nombre": "X", "cantidad": 1, "precio": 1}')
+        inv3.cargar_desde_archivo()
+        assert inv3.obtener_cantidad_productos() == 2
+        print("✓ Un archivo truncado no modifica el inventario")
+        
+        # Productos inválidos: se informa el error y no se interrumpe el inicio
+        for producto_invalido in ({"id": 9, "nombre": "", "cantidad": 1, "precio": 1},
+                                  {"id": 9, "nombre": "X", "cantidad": -1, "precio": 1},
+                                  {"id": 9, "nombre": "X", "precio": 1},
+                                  {"id": 9, "nombre": "X", "cantidad": None, "precio": 1}):
+            with open(ruta_archivo, 'w') as f:
+                json.dump({"productos": [producto_invalido], "siguiente_id": 10}, f)
+            inv3.cargar_desde_archivo()
+            assert inv3.obtener_cantidad_productos() == 2
+            assert Inventario(ruta_archivo).obtener_cantidad_productos() == 0
+        print("✓ Un producto inválido en el archivo no modifica el inventario")
     
     finally:
         # Limpiar archivo temporal
@@ -265,6 +831,21 @@ def test_casos_limite():
     assert id1 == 1 and id2 == 2 and id3 == 3
     print("✓ IDs asignados secuencialmente")
     
+    # Caso: Reserva de bloques de IDs
+    reservados = inv.reservar_ids(3)
+    assert list(reservados) == [4, 5, 6]
+    assert inv.obtener_siguiente_id() == 7
+    assert inv.añadir_producto("Reservado", 1, 1, id_producto=5) == 5
+    assert inv.añadir_producto("P7", 1, 1) == 7
+    try:
+        inv.añadir_producto("Repetido", 1, 1, id_producto=5)
+        assert False, "Se aceptó un ID duplicado"
+    except ValueError:
+        pass
+    inv.eliminar_producto(7)
+    assert inv.añadir_producto("P8", 1, 1) == 8
+    print("✓ Reserva de IDs y marca máxima funcionan")
+    
     # Caso: Cantidad y precio cero
     inv.actualizar_cantidad(id1, 0)
     inv.actualizar_precio(id2, 0)
@@ -277,6 +858,32 @@ def test_casos_limite():
     resultado = inv.buscar_por_nombre("!@#$%")
     assert len(resultado) == 1
     print("✓ Manejo de caracteres especiales en nombres")
+    
+    # Caso: Nombre inválido no deja el producto a medio registrar
+    cantidad_antes = inv.obtener_cantidad_productos()
+    for nombre_invalido in (None, "", 123):
+        try:
+            inv.añadir_producto(nombre_invalido, 1, 1.0)
+            assert False, f"Se aceptó el nombre {nombre_invalido!r}"
+        except ValueError:
+            pass
+    assert inv.obtener_cantidad_productos() == cantidad_antes
+    assert len(list(inv.iterar_productos())) == cantidad_antes
+    print("✓ Nombres inválidos se rechazan sin modificar el inventario")
+    
+    # Caso: Un índice ordenado que falla no deja el producto en los demás
+    inv.productos_en_rango_precio(0, 1)
+    from unittest import mock
+    with mock.patch.object(inv._indices_ordenados['precio'], 'agregar', side_effect=MemoryError):
+        try:
+            inv.añadir_producto("Fallido", 1, 1.0)
+            assert False, "Debería propagar el error del índice"
+        except MemoryError:
+            pass
+    assert inv.buscar_por_nombre("Fallido") == []
+    assert inv.obtener_cantidad_productos() == cantidad_antes
+    assert len(list(inv.iterar_productos())) == cantidad_antes
+    print("✓ Un error de índice al añadir deshace el registro del producto")
 
 
 def ejecutar_todas_pruebas():
@@ -291,6 +898,14 @@ def ejecutar_todas_pruebas():
         test_inventario_operaciones_basicas()
         test_busqueda_productos()
         test_estadisticas()
+        test_estadisticas_incrementales()
+        test_listado_por_paginas()
+        test_consultas_por_rango()
+        test_operaciones_por_lote()
+        test_inventario_columnar()
+        test_inventario_concurrente()
+        test_inventario_sqlite()
+        test_inventario_perezoso()
         test_serializacion()
         test_casos_limite()
         
@@ -0,0 +1,108 @@
+"""
+Benchmark de Préstamos y Devoluciones por Lote
+
+Compara prestar_libro/devolver_libro llamados uno por uno contra
+prestar_lote/devolver_lote con los mismos pares, en la Biblioteca en memoria
+y en la BibliotecaPersistente. Reporta operaciones por segundo; se toma la
+mejor de varias repeticiones para reducir el ruido.
+
+La salida de los métodos uno por uno se descarta con os.devnull, así que la
+medición incluye armar cada mensaje pero no el costo de la terminal.
+
+Uso:
+    python benchmark_biblioteca.py
+    python benchmark_biblioteca.py --libros 100000 --lote 500
+"""
+
+import argparse
+import contextlib
+import os
+import tempfile
+import time
+
+from biblioteca import Biblioteca
+from persistencia import BibliotecaPersistente
+
+
+REPETICIONES = 5
+
+
+def llenar(biblioteca, libros, usuarios):
+    """
+    Agrega libros y usuarios sintéticos, descartando los mensajes que imprimen.
+    
+    Args:
+        biblioteca (Biblioteca): Biblioteca vacía
+        libros (int): Cantidad de libros
+        usuarios (int): Cantidad de usuarios
+        
+    Returns:
+        list: Pares (id_usuario, isbn) que cubren todos los libros
+    """
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+        for i in range(libros):
+            biblioteca.agregar_libro(f"Libro {i}", f"Autor {i % 1000}", f"Categoría {i % 20}", f"978-{i:010d}")
+        for i in range(usuarios):
+            biblioteca.registrar_usuario(f"U{i:06d}", f"Usuario {i}")
+    return [(f"U{i % usuarios:06d}", f"978-{i:010d}") for i in range(libros)]
+
+
+def medir_ciclo(biblioteca, pares, tamano_lote):
+    """
+    Presta y devuelve todos los pares, uno por uno o por lotes.
+    
+    Args:
+        biblioteca (Biblioteca): Biblioteca con los libros disponibles
+        pares (list): Pares (id_usuario, isbn)
+        tamano_lote (int): Pares por lote, o None para llamar uno por uno
+        
+    Returns:
+        tuple: Operaciones por segundo de (préstamos, devoluciones)
+    """
+    mejor = [None, None]
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+        for _ in range(REPETICIONES):
+            for posicion, (individual, por_lote) in enumerate((
+                (biblioteca.prestar_libro, biblioteca.prestar_lote),
+                (biblioteca.devolver_libro, biblioteca.devolver_lote),
+            )):
+                inicio = time.perf_counter()
+                if tamano_lote is None:
+                    for id_usuario, isbn in pares:
+                        individual(id_usuario, isbn)
+                else:
+                    for desde in range(0, len(pares), tamano_lote):
+                        por_lote(pares[desde:desde + tamano_lote])
+                transcurrido = time.perf_counter() - inicio
+                if mejor[posicion] is None or transcurrido < mejor[posicion]:
+                    mejor[posicion] = transcurrido
+    return len(pares) / mejor[0], len(pares) / mejor[1]
+
+
+def main():
+    """Ejecuta las mediciones según los argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Benchmark de préstamos por lote")
+    parser.add_argument("--libros", type=int, default=20000, help="Libros sintéticos (uno por préstamo)")
+    parser.add_argument("--usuarios", type=int, default=1000, help="Usuarios sintéticos")
+    parser.add_argument("--lote", type=int, default=500, help="Pares por lote")
+    argumentos = parser.parse_args()
+    
+    print(f"{argumentos.libros} préstamos y devoluciones, lotes de {argumentos.lote} pares")
+    print(f"{'Biblioteca':<24}{'Modo':<14}{'Préstamos/s':>14}{'Devoluciones/s':>16}")
+    for nombre in ("en memoria", "persistente"):
+        with tempfile.TemporaryDirectory() as directorio:
+            if nombre == "en memoria":
+                biblioteca = Biblioteca()
+            else:
+                # Sin compactaciones, para medir solo el anexado al registro.
+                biblioteca = BibliotecaPersistente(directorio, eventos_por_compactacion=10**9)
+            pares = llenar(biblioteca, argumentos.libros, argumentos.usuarios)
+            for modo, tamano_lote in (("uno por uno", None), ("por lote", argumentos.lote)):
+                prestamos, devoluciones = medir_ciclo(biblioteca, pares, tamano_lote)
+                print(f"{nombre:<24}{modo:<14}{prestamos:>14,.0f}{devoluciones:>16,.0f}")
+            if isinstance(biblioteca, BibliotecaPersistente):
+                biblioteca.cerrar()
+
+
+if __name__ == "__main__":
+    main()
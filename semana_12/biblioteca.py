@@ -7,9 +7,12 @@ incluyendo la administración de libros, usuarios y préstamos.
 Clases principales:
 - Libro: Representa un libro con atributos inmutables
 - Usuario: Representa un usuario de la biblioteca
+- IndiceTrigramas: Índice de trigramas para buscar por título y autor
 - Biblioteca: Gestiona la colección de libros, usuarios y préstamos
 """
 
+import bisect
+
 
 class Libro:
     """
@@ -68,7 +71,9 @@ class Usuario:
     Atributos:
         id_usuario (str): ID único del usuario
         nombre (str): Nombre del usuario
-        libros_prestados (list): Lista de ISBN de libros actualmente prestados
+        libros_prestados (dict): ISBN de los libros actualmente prestados, como
+            claves de un diccionario usado como conjunto que conserva el orden
+            de los préstamos (los valores son None)
     """
     
     def __init__(self, id_usuario, nombre):
@@ -81,7 +86,7 @@ class Usuario:
         """
         self.id_usuario = id_usuario
         self.nombre = nombre
-        self.libros_prestados = []  # Lista para almacenar ISBNs de libros prestados
+        self.libros_prestados = {}  # ISBN -> None: conjunto ordenado de préstamos
     
     def agregar_prestamo(self, isbn):
         """
@@ -90,20 +95,20 @@ class Usuario:
         Args:
             isbn (str): ISBN del libro prestado
         """
-        self.libros_prestados.append(isbn)
+        self.libros_prestados[isbn] = None
     
     def devolver_libro(self, isbn):
         """
-        Remove un libro de la lista de préstamos del usuario.
+        Quita un libro de los préstamos del usuario en O(1).
         
         Args:
             isbn (str): ISBN del libro a devolver
             
         Returns:
-            bool: True si se removió el libro, False si no estaba en la lista
+            bool: True si se quitó el libro, False si no estaba prestado al usuario
         """
         if isbn in self.libros_prestados:
-            self.libros_prestados.remove(isbn)
+            del self.libros_prestados[isbn]
             return True
         return False
     
@@ -126,6 +131,92 @@ class Usuario:
         return f"Usuario('{self.id_usuario}', '{self.nombre}')"
 
 
+class IndiceTrigramas:
+    """
+    Índice invertido de trigramas para búsquedas parciales en títulos y autores.
+    
+    Cada texto se normaliza a minúsculas y se descompone en todas
+    sus subcadenas de tres caracteres. Una consulta de tres o más caracteres
+    solo puede estar contenida en textos que tengan todos sus trigramas, así
+    que basta intersectar los conjuntos de ISBN de cada trigrama y verificar
+    los pocos candidatos que quedan.
+    
+    Atributos:
+        _isbns_por_trigrama (dict): Trigrama -> conjunto de ISBN
+        _textos (dict): ISBN -> texto normalizado
+    """
+    
+    TAMANO = 3
+    
+    def __init__(self):
+        """Inicializa un índice vacío."""
+        self._isbns_por_trigrama = {}
+        self._textos = {}
+    
+    @classmethod
+    def _trigramas(cls, texto):
+        """Retorna el conjunto de trigramas de un texto ya normalizado."""
+        return {texto[i:i + cls.TAMANO] for i in range(len(texto) - cls.TAMANO + 1)}
+    
+    def agregar(self, isbn, texto):
+        """
+        Indexa el texto de un ISBN.
+        
+        Args:
+            isbn (str): ISBN del libro
+            texto (str): Texto a indexar (título o autor)
+        """
+        texto = _normalizar(texto)
+        self._textos[isbn] = texto
+        for trigrama in self._trigramas(texto):
+            self._isbns_por_trigrama.setdefault(trigrama, set()).add(isbn)
+    
+    def quitar(self, isbn):
+        """
+        Quita un ISBN del índice, si estaba indexado.
+        
+        Args:
+            isbn (str): ISBN del libro
+        """
+        texto = self._textos.pop(isbn, None)
+        if texto is None:
+            return
+        for trigrama in self._trigramas(texto):
+            isbns = self._isbns_por_trigrama[trigrama]
+            isbns.discard(isbn)
+            if not isbns:
+                del self._isbns_por_trigrama[trigrama]
+    
+    def buscar(self, consulta):
+        """
+        Busca los ISBN cuyo texto contiene la consulta (sin distinguir
+        mayúsculas de minúsculas).
+        
+        Args:
+            consulta (str): Texto buscado, p. ej. "potter"
+            
+        Returns:
+            list: ISBN ordenados
+        """
+        consulta = _normalizar(consulta)
+        if len(consulta) < self.TAMANO:
+            # Las consultas cortas no tienen trigramas: se recorren los
+            # textos ya normalizados.
+            return sorted(isbn for isbn, texto in self._textos.items() if consulta in texto)
+        
+        grupos = []
+        for trigrama in self._trigramas(consulta):
+            isbns = self._isbns_por_trigrama.get(trigrama)
+            if not isbns:
+                return []
+            grupos.append(isbns)
+        
+        grupos.sort(key=len)
+        candidatos = grupos[0].intersection(*grupos[1:])
+        # Tener todos los trigramas no garantiza que aparezcan seguidos.
+        return sorted(isbn for isbn in candidatos if consulta in self._textos[isbn])
+
+
 class Biblioteca:
     """
     Gestiona la colección de libros, usuarios y préstamos de la biblioteca digital.
@@ -134,6 +225,13 @@ class Biblioteca:
     - Diccionario para libros (ISBN como clave para búsquedas rápidas)
     - Diccionario para usuarios (ID de usuario como clave)
     - Conjunto para garantizar IDs de usuario únicos
+    - Listas ordenadas de ISBN e IDs de usuario para listar por páginas
+    - Índices de trigramas de títulos y autores, y grupos de ISBN por
+      categoría, para que las búsquedas no recorran todo el catálogo
+    - Diccionario ISBN -> ID del usuario que lo tiene prestado
+    - Conjunto ordenado (diccionario) de ISBN disponibles, actualizado en cada
+      alta, baja, préstamo y devolución, para contar y listar los disponibles
+      sin recorrer el catálogo
     
     Atributos:
         libros (dict): Diccionario con ISBN como clave y objeto Libro como valor
@@ -148,6 +246,16 @@ class Biblioteca:
         self.usuarios = {}  # Diccionario: {id_usuario: Usuario}
         self.ids_usuarios = set()  # Conjunto para IDs únicos
         self.categorias = set()  # Conjunto de categorías
+        # Listas ordenadas para paginar; se arman al pedir la primera página
+        # (None mientras tanto), así las cargas masivas no las mantienen.
+        self._isbns_ordenados = None
+        self._isbns_disponibles_ordenados = None
+        self._ids_usuarios_ordenados = None
+        self._indice_titulos = IndiceTrigramas()
+        self._indice_autores = IndiceTrigramas()
+        self._isbns_por_categoria = {}  # Categoría normalizada -> conjunto de ISBN
+        self._isbns_disponibles = set()  # ISBN de los libros que no están prestados
+        self._prestatarios = {}  # ISBN prestado -> ID del usuario que lo tiene
     
     # ==================== GESTIÓN DE LIBROS ====================
     
@@ -168,9 +276,7 @@ class Biblioteca:
             print(f"❌ Error: El ISBN {isbn} ya existe en la biblioteca.")
             return False
         
-        libro = Libro(titulo, autor, categoria, isbn)
-        self.libros[isbn] = libro
-        self.categorias.add(categoria)
+        self._alta_libro(Libro(titulo, autor, categoria, isbn))
         print(f"✓ Libro '{titulo}' añadido exitosamente.")
         return True
     
@@ -193,7 +299,7 @@ class Biblioteca:
             print(f"❌ Error: El libro '{libro.titulo}' está actualmente prestado.")
             return False
         
-        del self.libros[isbn]
+        self._baja_libro(libro)
         print(f"✓ Libro '{libro.titulo}' removido de la biblioteca.")
         return True
     
@@ -226,9 +332,7 @@ class Biblioteca:
             print(f"❌ Error: El ID de usuario {id_usuario} ya está registrado.")
             return False
         
-        usuario = Usuario(id_usuario, nombre)
-        self.usuarios[id_usuario] = usuario
-        self.ids_usuarios.add(id_usuario)
+        self._alta_usuario(Usuario(id_usuario, nombre))
         print(f"✓ Usuario '{nombre}' registrado exitosamente con ID: {id_usuario}")
         return True
     
@@ -251,8 +355,7 @@ class Biblioteca:
             print(f"❌ Error: El usuario '{usuario.nombre}' tiene {len(usuario.libros_prestados)} libro(s) sin devolver.")
             return False
         
-        del self.usuarios[id_usuario]
-        self.ids_usuarios.remove(id_usuario)
+        self._baja_usuario(usuario)
         print(f"✓ Usuario '{usuario.nombre}' dado de baja exitosamente.")
         return True
     
@@ -281,27 +384,16 @@ class Biblioteca:
         Returns:
             bool: True si el préstamo fue exitoso, False en caso contrario
         """
-        # Validar que el usuario existe
-        if id_usuario not in self.ids_usuarios:
-            print(f"❌ Error: El usuario con ID {id_usuario} no existe.")
-            return False
-        
-        # Validar que el libro existe
-        if isbn not in self.libros:
-            print(f"❌ Error: No existe un libro con ISBN {isbn}.")
+        error = self._error_prestamo(id_usuario, isbn)
+        if error:
+            print(f"❌ Error: {error}.")
             return False
         
         usuario = self.usuarios[id_usuario]
         libro = self.libros[isbn]
         
-        # Validar que el libro está disponible
-        if not libro.disponible:
-            print(f"❌ Error: El libro '{libro.titulo}' no está disponible para préstamo.")
-            return False
-        
         # Realizar el préstamo
-        libro.disponible = False
-        usuario.agregar_prestamo(isbn)
+        self._registrar_prestamo(usuario, libro)
         print(f"✓ '{libro.titulo}' prestado a {usuario.nombre}")
         return True
     
@@ -316,29 +408,220 @@ class Biblioteca:
         Returns:
             bool: True si la devolución fue exitosa, False en caso contrario
         """
-        # Validar que el usuario existe
-        if id_usuario not in self.ids_usuarios:
-            print(f"❌ Error: El usuario con ID {id_usuario} no existe.")
-            return False
-        
-        # Validar que el libro existe
-        if isbn not in self.libros:
-            print(f"❌ Error: No existe un libro con ISBN {isbn}.")
+        error = self._error_devolucion(id_usuario, isbn)
+        if error:
+            print(f"❌ Error: {error}.")
             return False
         
         usuario = self.usuarios[id_usuario]
         libro = self.libros[isbn]
         
-        # Validar que el usuario tiene este libro prestado
-        if not usuario.devolver_libro(isbn):
-            print(f"❌ Error: El usuario '{usuario.nombre}' no tiene prestado el libro '{libro.titulo}'.")
-            return False
-        
         # Registrar la devolución
-        libro.disponible = True
+        self._registrar_devolucion(usuario, libro)
         print(f"✓ '{libro.titulo}' devuelto por {usuario.nombre}")
         return True
     
+    def obtener_prestatario(self, isbn):
+        """
+        Obtiene el usuario que tiene prestado un libro, en O(1).
+        
+        Args:
+            isbn (str): ISBN del libro
+            
+        Returns:
+            Usuario: El usuario que tiene el libro, None si no está prestado o no existe
+        """
+        id_usuario = self._prestatarios.get(isbn)
+        return self.usuarios[id_usuario] if id_usuario is not None else None
+    
+    def prestar_lote(self, prestamos, todo_o_nada=True):
+        """
+        Realiza varios préstamos, validándolos todos antes de aplicar alguno.
+        
+        Pensado para mostradores y kioscos que envían cientos de operaciones
+        juntas: en lugar de una línea por préstamo se imprime un resumen.
+        Si un ISBN se repite en el lote, solo puede prestarse la primera vez.
+        Por defecto el lote es una transacción: si algún préstamo no es
+        válido, no se aplica ninguno.
+        
+        Args:
+            prestamos (iterable): Pares (id_usuario, isbn)
+            todo_o_nada (bool): Si False, se aplican los préstamos válidos
+                aunque otros fallen
+                
+        Returns:
+            list: Un diccionario por par, en el mismo orden, con las claves
+                'id_usuario', 'isbn', 'exito' (bool) y 'error' (str o None)
+        """
+        return self._procesar_lote(
+            prestamos, self._error_prestamo, self._registrar_prestamo, todo_o_nada, "préstamos"
+        )
+    
+    def devolver_lote(self, devoluciones, todo_o_nada=True):
+        """
+        Registra varias devoluciones, validándolas todas antes de aplicar alguna.
+        
+        Funciona igual que prestar_lote: imprime solo un resumen y un ISBN
+        repetido en el lote solo puede devolverse la primera vez.
+        
+        Args:
+            devoluciones (iterable): Pares (id_usuario, isbn)
+            todo_o_nada (bool): Si False, se aplican las devoluciones válidas
+                aunque otras fallen
+                
+        Returns:
+            list: Un diccionario por par, igual que prestar_lote
+        """
+        return self._procesar_lote(
+            devoluciones, self._error_devolucion, self._registrar_devolucion, todo_o_nada, "devoluciones"
+        )
+    
+    def _procesar_lote(self, pares, validar, aplicar, todo_o_nada, nombre):
+        """
+        Valida un lote completo en una pasada y luego aplica los pares válidos.
+        
+        Como todo se valida antes de cambiar algo y los cambios internos no
+        fallan, con todo_o_nada el lote se aplica entero o no se aplica.
+        
+        Args:
+            pares (iterable): Pares (id_usuario, isbn)
+            validar (callable): Retorna el mensaje de error de un par o None
+            aplicar (callable): Cambio interno que recibe (usuario, libro)
+            todo_o_nada (bool): Si True, un error cancela todo el lote
+            nombre (str): Nombre de las operaciones para el resumen
+            
+        Returns:
+            list: Resultado de cada par, en el mismo orden
+        """
+        resultados = []
+        validos = []
+        isbns_en_lote = set()
+        for id_usuario, isbn in pares:
+            if isbn in isbns_en_lote:
+                error = f"El ISBN {isbn} ya aparece antes en el lote"
+            else:
+                error = validar(id_usuario, isbn)
+            if error is None:
+                isbns_en_lote.add(isbn)
+                validos.append(len(resultados))
+            resultados.append({"id_usuario": id_usuario, "isbn": isbn, "exito": error is None, "error": error})
+        
+        fallidos = len(resultados) - len(validos)
+        if todo_o_nada and fallidos:
+            for indice in validos:
+                resultados[indice]["exito"] = False
+                resultados[indice]["error"] = "No se aplicó porque el lote tiene errores"
+            print(f"❌ Error: Lote de {nombre} cancelado: {fallidos} de {len(resultados)} con error.")
+            return resultados
+        
+        usuarios = self.usuarios
+        libros = self.libros
+        for indice in validos:
+            resultado = resultados[indice]
+            aplicar(usuarios[resultado["id_usuario"]], libros[resultado["isbn"]])
+        print(f"✓ Lote de {nombre}: {len(validos)} aplicados, {fallidos} con error")
+        return resultados
+    
+    def _error_prestamo(self, id_usuario, isbn):
+        """Retorna por qué no se puede realizar un préstamo, o None si es válido."""
+        if id_usuario not in self.ids_usuarios:
+            return f"El usuario con ID {id_usuario} no existe"
+        libro = self.libros.get(isbn)
+        if libro is None:
+            return f"No existe un libro con ISBN {isbn}"
+        if not libro.disponible:
+            return f"El libro '{libro.titulo}' no está disponible para préstamo"
+        return None
+    
+    def _error_devolucion(self, id_usuario, isbn):
+        """Retorna por qué no se puede registrar una devolución, o None si es válida."""
+        if id_usuario not in self.ids_usuarios:
+            return f"El usuario con ID {id_usuario} no existe"
+        libro = self.libros.get(isbn)
+        if libro is None:
+            return f"No existe un libro con ISBN {isbn}"
+        if self._prestatarios.get(isbn) != id_usuario:
+            return f"El usuario '{self.usuarios[id_usuario].nombre}' no tiene prestado el libro '{libro.titulo}'"
+        return None
+    
+    # ==================== CAMBIOS INTERNOS ====================
+    # Aplican un cambio ya validado a todas las estructuras, sin imprimir.
+    # Los métodos públicos validan y luego llaman a estos; la persistencia
+    # los usa para reconstruir la biblioteca.
+    
+    def _alta_libro(self, libro):
+        """Incorpora un libro nuevo y disponible a la colección y a los índices."""
+        isbn = libro.isbn
+        self.libros[isbn] = libro
+        self._isbns_disponibles.add(isbn)
+        _agregar_ordenado(self._isbns_ordenados, isbn)
+        _agregar_ordenado(self._isbns_disponibles_ordenados, isbn)
+        self._indice_titulos.agregar(isbn, libro.titulo)
+        self._indice_autores.agregar(isbn, libro.autor)
+        self._isbns_por_categoria.setdefault(_normalizar(libro.categoria), set()).add(isbn)
+        self.categorias.add(libro.categoria)
+    
+    def _baja_libro(self, libro):
+        """Quita un libro disponible de la colección y de los índices."""
+        isbn = libro.isbn
+        del self.libros[isbn]
+        self._isbns_disponibles.remove(isbn)
+        _quitar_ordenado(self._isbns_ordenados, isbn)
+        _quitar_ordenado(self._isbns_disponibles_ordenados, isbn)
+        self._indice_titulos.quitar(isbn)
+        self._indice_autores.quitar(isbn)
+        clave_categoria = _normalizar(libro.categoria)
+        isbns_categoria = self._isbns_por_categoria[clave_categoria]
+        isbns_categoria.discard(isbn)
+        if not isbns_categoria:
+            del self._isbns_por_categoria[clave_categoria]
+    
+    def _alta_usuario(self, usuario):
+        """Registra un usuario nuevo."""
+        self.usuarios[usuario.id_usuario] = usuario
+        self.ids_usuarios.add(usuario.id_usuario)
+        _agregar_ordenado(self._ids_usuarios_ordenados, usuario.id_usuario)
+    
+    def _baja_usuario(self, usuario):
+        """Quita un usuario sin préstamos."""
+        del self.usuarios[usuario.id_usuario]
+        self.ids_usuarios.remove(usuario.id_usuario)
+        _quitar_ordenado(self._ids_usuarios_ordenados, usuario.id_usuario)
+    
+    def _isbns_en_orden(self):
+        """Retorna la lista ordenada de ISBN, armándola si todavía no existe."""
+        if self._isbns_ordenados is None:
+            self._isbns_ordenados = sorted(self.libros)
+        return self._isbns_ordenados
+    
+    def _isbns_disponibles_en_orden(self):
+        """Retorna la lista ordenada de ISBN disponibles, armándola si todavía no existe."""
+        if self._isbns_disponibles_ordenados is None:
+            self._isbns_disponibles_ordenados = sorted(self._isbns_disponibles)
+        return self._isbns_disponibles_ordenados
+    
+    def _ids_usuarios_en_orden(self):
+        """Retorna la lista ordenada de IDs de usuario, armándola si todavía no existe."""
+        if self._ids_usuarios_ordenados is None:
+            self._ids_usuarios_ordenados = sorted(self.usuarios)
+        return self._ids_usuarios_ordenados
+    
+    def _registrar_prestamo(self, usuario, libro):
+        """Marca un libro disponible como prestado al usuario."""
+        libro.disponible = False
+        self._isbns_disponibles.remove(libro.isbn)
+        _quitar_ordenado(self._isbns_disponibles_ordenados, libro.isbn)
+        self._prestatarios[libro.isbn] = usuario.id_usuario
+        usuario.agregar_prestamo(libro.isbn)
+    
+    def _registrar_devolucion(self, usuario, libro):
+        """Marca como disponible un libro que el usuario tenía prestado."""
+        usuario.devolver_libro(libro.isbn)
+        del self._prestatarios[libro.isbn]
+        libro.disponible = True
+        self._isbns_disponibles.add(libro.isbn)
+        _agregar_ordenado(self._isbns_disponibles_ordenados, libro.isbn)
+    
     # ==================== BÚSQUEDAS ====================
     
     def buscar_por_titulo(self, titulo):
@@ -349,12 +632,9 @@ class Biblioteca:
             titulo (str): Título o fragmento del título a buscar
             
         Returns:
-            list: Lista de libros que coinciden con la búsqueda
+            list: Lista de libros que coinciden, ordenados por ISBN
         """
-        titulo_lower = titulo.lower()
-        resultados = [libro for libro in self.libros.values() 
-                     if titulo_lower in libro.titulo.lower()]
-        return resultados
+        return self._buscar_en_indice(self._indice_titulos, titulo)
     
     def buscar_por_autor(self, autor):
         """
@@ -364,27 +644,36 @@ class Biblioteca:
             autor (str): Autor o fragmento del nombre del autor a buscar
             
         Returns:
-            list: Lista de libros que coinciden con la búsqueda
+            list: Lista de libros que coinciden, ordenados por ISBN
         """
-        autor_lower = autor.lower()
-        resultados = [libro for libro in self.libros.values() 
-                     if autor_lower in libro.autor.lower()]
-        return resultados
+        return self._buscar_en_indice(self._indice_autores, autor)
     
     def buscar_por_categoria(self, categoria):
         """
         Busca libros por categoría (búsqueda parcial, insensible a mayúsculas).
         
+        Solo se recorren los nombres de las categorías, no los libros: una
+        categoría exacta es un acceso directo a su grupo de ISBN.
+        
         Args:
             categoria (str): Categoría a buscar
             
         Returns:
-            list: Lista de libros que coinciden con la búsqueda
-        """
-        categoria_lower = categoria.lower()
-        resultados = [libro for libro in self.libros.values() 
-                     if categoria_lower in libro.categoria.lower()]
-        return resultados
+            list: Lista de libros que coinciden, ordenados por ISBN
+        """
+        clave = _normalizar(categoria)
+        if clave in self._isbns_por_categoria:
+            isbns = self._isbns_por_categoria[clave]
+        else:
+            isbns = set()
+            for nombre, isbns_categoria in self._isbns_por_categoria.items():
+                if clave in nombre:
+                    isbns |= isbns_categoria
+        return [self.libros[isbn] for isbn in sorted(isbns)]
+    
+    def _buscar_en_indice(self, indice, consulta):
+        """Resuelve una búsqueda parcial sobre un índice de títulos o autores."""
+        return [self.libros[isbn] for isbn in indice.buscar(consulta)]
     
     # ==================== LISTADOS ====================
     
@@ -402,14 +691,12 @@ class Biblioteca:
             print(f"❌ Error: El usuario con ID {id_usuario} no existe.")
             return None
         
-        usuario = self.usuarios[id_usuario]
-        libros = [self.libros[isbn] for isbn in usuario.libros_prestados 
-                 if isbn in self.libros]
-        return libros
+        # Un libro prestado no puede quitarse, así que todos siguen en el catálogo.
+        return [self.libros[isbn] for isbn in self.usuarios[id_usuario].libros_prestados]
     
     def listar_todos_libros(self, solo_disponibles=False):
         """
-        Lista todos los libros en la biblioteca.
+        Lista todos los libros en la biblioteca, en el orden del catálogo.
         
         Args:
             solo_disponibles (bool): Si True, solo lista libros disponibles
@@ -417,10 +704,9 @@ class Biblioteca:
         Returns:
             list: Lista de objetos Libro
         """
-        libros = list(self.libros.values())
-        if solo_disponibles:
-            libros = [libro for libro in libros if libro.disponible]
-        return libros
+        if solo_disponibles and len(self._isbns_disponibles) < len(self.libros):
+            return [libro for libro in self.libros.values() if libro.disponible]
+        return list(self.libros.values())
     
     def listar_usuarios(self):
         """
@@ -431,6 +717,75 @@ class Biblioteca:
         """
         return list(self.usuarios.values())
     
+    def obtener_pagina_libros(self, tamano=20, cursor=None, solo_disponibles=False):
+        """
+        Obtiene una página de libros ordenados por ISBN.
+        
+        El cursor es el último ISBN entregado, por lo que la página siguiente
+        es correcta aunque entre tanto se agreguen o quiten libros. Con
+        solo_disponibles se usa una lista ordenada que contiene únicamente
+        los disponibles, así que una página no recorre los libros prestados.
+        
+        Args:
+            tamano (int): Cantidad máxima de libros de la página
+            cursor (str): Cursor retornado por la página anterior (None para la primera)
+            solo_disponibles (bool): Si True, solo incluye libros disponibles
+            
+        Returns:
+            tuple: (lista de objetos Libro, cursor de la página siguiente o
+            None si es la última)
+        """
+        claves = self._isbns_disponibles_en_orden() if solo_disponibles else self._isbns_en_orden()
+        isbns, siguiente = _pagina_ordenada(claves, tamano, cursor)
+        return [self.libros[isbn] for isbn in isbns], siguiente
+    
+    def obtener_pagina_usuarios(self, tamano=20, cursor=None):
+        """
+        Obtiene una página de usuarios ordenados por ID.
+        
+        Args:
+            tamano (int): Cantidad máxima de usuarios de la página
+            cursor (str): Cursor retornado por la página anterior (None para la primera)
+            
+        Returns:
+            tuple: (lista de objetos Usuario, cursor de la página siguiente o
+            None si es la última)
+        """
+        ids, siguiente = _pagina_ordenada(self._ids_usuarios_en_orden(), tamano, cursor)
+        return [self.usuarios[id_usuario] for id_usuario in ids], siguiente
+    
+    def iterar_libros(self, solo_disponibles=False, tamano_pagina=100):
+        """
+        Recorre los libros por ISBN de a una página, sin copiar la colección.
+        
+        Args:
+            solo_disponibles (bool): Si True, solo recorre libros disponibles
+            tamano_pagina (int): Libros leídos en cada página
+            
+        Yields:
+            Libro: Cada libro, en orden de ISBN
+        """
+        cursor = None
+        while True:
+            libros, cursor = self.obtener_pagina_libros(tamano_pagina, cursor, solo_disponibles)
+            yield from libros
+            if cursor is None:
+                return
+    
+    def iterar_usuarios(self, tamano_pagina=100):
+        """
+        Recorre los usuarios por ID de a una página, sin copiar la colección.
+        
+        Yields:
+            Usuario: Cada usuario, en orden de ID
+        """
+        cursor = None
+        while True:
+            usuarios, cursor = self.obtener_pagina_usuarios(tamano_pagina, cursor)
+            yield from usuarios
+            if cursor is None:
+                return
+    
     def listar_categorias(self):
         """
         Lista todas las categorías disponibles.
@@ -446,11 +801,14 @@ class Biblioteca:
         """
         Obtiene estadísticas generales de la biblioteca.
         
+        Todos los valores son tamaños de colecciones mantenidas al día, por lo
+        que la consulta cuesta O(1).
+        
         Returns:
             dict: Diccionario con estadísticas
         """
         total_libros = len(self.libros)
-        libros_disponibles = sum(1 for libro in self.libros.values() if libro.disponible)
+        libros_disponibles = len(self._isbns_disponibles)
         libros_prestados = total_libros - libros_disponibles
         total_usuarios = len(self.ids_usuarios)
         
@@ -461,3 +819,50 @@ class Biblioteca:
             'total_usuarios': total_usuarios,
             'categorias': len(self.categorias)
         }
+
+
+def _agregar_ordenado(claves, clave):
+    """Inserta una clave en una lista ordenada, si ya fue construida."""
+    if claves is None:
+        return
+    if not claves or clave > claves[-1]:
+        # Caso habitual: las claves nuevas suelen ser mayores que las existentes.
+        claves.append(clave)
+    else:
+        bisect.insort(claves, clave)
+
+
+def _quitar_ordenado(claves, clave):
+    """Quita una clave de una lista ordenada, si ya fue construida."""
+    if claves is None:
+        return
+    posicion = bisect.bisect_left(claves, clave)
+    if posicion < len(claves) and claves[posicion] == clave:
+        del claves[posicion]
+
+
+def _normalizar(texto):
+    """Pasa un texto a minúsculas, la única normalización de las búsquedas."""
+    return texto.lower()
+
+
+def _pagina_ordenada(claves, tamano, cursor=None):
+    """
+    Obtiene las claves de una página a partir de una lista ordenada.
+    
+    Args:
+        claves (list): Claves ordenadas
+        tamano (int): Cantidad máxima de claves de la página
+        cursor: Última clave de la página anterior (None para empezar)
+        
+    Returns:
+        tuple: (claves de la página, cursor siguiente o None si no quedan más)
+        
+    Raises:
+        ValueError: Si el tamaño no es positivo
+    """
+    if tamano <= 0:
+        raise ValueError("El tamaño de página debe ser positivo")
+    inicio = 0 if cursor is None else bisect.bisect_right(claves, cursor)
+    pagina = claves[inicio:inicio + tamano]
+    return pagina, (pagina[-1] if inicio + tamano < len(claves) else None)
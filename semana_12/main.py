@@ -3,7 +3,10 @@ Programa principal - Sistema de Gestión de Biblioteca Digital
 Demostración completa del funcionamiento del sistema
 """
 
+import argparse
+
 from biblioteca import Libro, Usuario, Biblioteca
+from persistencia import BibliotecaPersistente
 
 
 def separador(titulo=""):
@@ -17,13 +20,23 @@ def separador(titulo=""):
 
 def main():
     """Función principal que ejecuta todas las pruebas del sistema."""
+    parser = argparse.ArgumentParser(description="Demostración de la biblioteca digital")
+    parser.add_argument("--datos", metavar="DIRECTORIO",
+                        help="Guarda la biblioteca en este directorio y la recupera al iniciar")
+    argumentos = parser.parse_args()
     
     # ==================== INICIALIZACIÓN ====================
     separador("SISTEMA DE GESTIÓN DE BIBLIOTECA DIGITAL")
     
     # Crear la biblioteca
-    biblioteca = Biblioteca()
-    print("✓ Biblioteca inicializada\n")
+    if argumentos.datos:
+        biblioteca = BibliotecaPersistente(argumentos.datos)
+        stats = biblioteca.obtener_estadisticas()
+        print(f"✓ Biblioteca recuperada de '{argumentos.datos}': "
+              f"{stats['total_libros']} libros, {stats['total_usuarios']} usuarios\n")
+    else:
+        biblioteca = Biblioteca()
+        print("✓ Biblioteca inicializada\n")
     
     # ==================== AGREGAR LIBROS ====================
     separador("1. AGREGANDO LIBROS A LA BIBLIOTECA")
@@ -140,13 +153,11 @@ def main():
     separador("9. CATÁLOGO COMPLETO DE LIBROS")
     
     print("Todos los libros en la biblioteca:")
-    todos_los_libros = biblioteca.listar_todos_libros()
-    for i, libro in enumerate(todos_los_libros, 1):
+    for i, libro in enumerate(biblioteca.iterar_libros(), 1):
         print(f"{i:2}. {libro}")
     
     print("\n\nSolo libros disponibles:")
-    libros_disponibles = biblioteca.listar_todos_libros(solo_disponibles=True)
-    for i, libro in enumerate(libros_disponibles, 1):
+    for i, libro in enumerate(biblioteca.iterar_libros(solo_disponibles=True), 1):
         print(f"{i:2}. {libro}")
     
     # ==================== LISTAR CATEGORÍAS ====================
@@ -170,8 +181,7 @@ def main():
     # ==================== LISTAR USUARIOS ====================
     separador("12. USUARIOS REGISTRADOS")
     
-    usuarios = biblioteca.listar_usuarios()
-    for i, usuario in enumerate(usuarios, 1):
+    for i, usuario in enumerate(biblioteca.iterar_usuarios(), 1):
         print(f"{i}. {usuario}")
     
     # ==================== INTENTO DE DAR DE BAJA CON ERROR ====================
@@ -232,12 +242,15 @@ def main():
     
     Estructuras de datos utilizadas:
     ✓ Tuplas (autor, título) - Atributos inmutables del libro
-    ✓ Listas - Libros prestados por usuario
     ✓ Diccionarios - Almacenamiento de libros y usuarios por clave
+    ✓ Diccionarios como conjuntos ordenados - Préstamos por usuario
     ✓ Conjuntos - IDs de usuario únicos y categorías
     """)
     
     print("=" * 70)
+    
+    if argumentos.datos:
+        biblioteca.cerrar()
 
 
 if __name__ == "__main__":
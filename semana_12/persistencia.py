@@ -0,0 +1,435 @@
+"""
+Persistencia de la Biblioteca Digital
+
+Este módulo guarda la biblioteca en disco para que el catálogo, los usuarios
+y los préstamos sobrevivan a un reinicio. Usa dos tipos de archivo:
+- Una instantánea JSON con el estado completo de la biblioteca
+- Registros de eventos de solo anexado, con una línea JSON por cada cambio
+
+Al iniciar se carga la instantánea y se reproducen los eventos posteriores.
+La instantánea se rehace (compactación) en un hilo en segundo plano, así que
+los préstamos y devoluciones solo pagan el anexado de una línea.
+
+Clases principales:
+- BibliotecaPersistente: Biblioteca que guarda cada cambio y se reconstruye al iniciar
+"""
+
+import json
+import os
+import re
+import threading
+
+from biblioteca import Biblioteca, Libro, Usuario
+
+
+_REGISTRO = re.compile(r'^eventos\.(\d+)\.log$')
+
+
+class BibliotecaPersistente(Biblioteca):
+    """
+    Biblioteca que conserva sus datos en un directorio entre ejecuciones.
+    
+    Cada cambio exitoso (agregar_libro, quitar_libro, registrar_usuario,
+    dar_baja_usuario, prestar_libro y devolver_libro) se anexa como una
+    línea JSON al registro de eventos de la generación actual,
+    `eventos.<generacion>.log`. Los préstamos y devoluciones aplicados por
+    prestar_lote y devolver_lote van juntos en una sola línea, así que un
+    lote interrumpido a mitad de escritura se descarta completo. La instantánea `biblioteca.json` guarda el
+    estado completo y el número de la primera generación que no incluye.
+    
+    Compactar abre un registro de una generación nueva y copia el estado de
+    la biblioteca, que es una copia de diccionarios y listas sin
+    serializar. Después, un hilo escribe la instantánea en un archivo
+    temporal, lo renombra sobre el anterior y borra los registros que ya
+    contiene. Si el programa se detiene a mitad de camino, la instantánea
+    anterior y los registros siguen en disco y al iniciar se recupera todo.
+    
+    Atributos:
+        directorio (str): Directorio donde se guardan los archivos
+        eventos_por_compactacion (int): Eventos del registro actual que
+            disparan una compactación
+    """
+    
+    ARCHIVO_INSTANTANEA = "biblioteca.json"
+    
+    def __init__(self, directorio, eventos_por_compactacion=10000, sincronizar=False,
+                 compactar_en_segundo_plano=True):
+        """
+        Abre (o crea) la biblioteca guardada en un directorio.
+        
+        Args:
+            directorio (str): Directorio de los datos; se crea si no existe
+            eventos_por_compactacion (int): Eventos que se acumulan en el
+                registro antes de rehacer la instantánea
+            sincronizar (bool): Si True, cada evento se confirma en disco con
+                fsync antes de retornar (más lento, resiste cortes de luz)
+            compactar_en_segundo_plano (bool): Si False, la compactación
+                automática escribe la instantánea antes de retornar
+        """
+        super().__init__()
+        self.directorio = directorio
+        self.eventos_por_compactacion = eventos_por_compactacion
+        self._sincronizar = sincronizar
+        self._compactar_en_segundo_plano = compactar_en_segundo_plano
+        self._hilo_compactacion = None
+        self.error_compactacion = None
+        os.makedirs(directorio, exist_ok=True)
+        self._generacion, self._eventos_en_registro = self._cargar()
+        self._abrir_registro()
+    
+    def __enter__(self):
+        """Permite usar la biblioteca con la sentencia with."""
+        return self
+    
+    def __exit__(self, *excepcion):
+        """Cierra la biblioteca al salir del bloque with."""
+        self.cerrar()
+    
+    def cerrar(self):
+        """Espera la compactación en curso y cierra el registro de eventos."""
+        if self._hilo_compactacion is not None:
+            self._hilo_compactacion.join()
+        self._registro.close()
+    
+    # ==================== CAMBIOS CON REGISTRO ====================
+    
+    def agregar_libro(self, titulo, autor, categoria, isbn):
+        """Añade un libro (ver Biblioteca.agregar_libro) y anota el evento."""
+        if not super().agregar_libro(titulo, autor, categoria, isbn):
+            return False
+        return self._anotar_o_deshacer(
+            lambda: self._baja_libro(self.libros[isbn]),
+            "agregar_libro", titulo, autor, categoria, isbn,
+        )
+    
+    def quitar_libro(self, isbn):
+        """Quita un libro (ver Biblioteca.quitar_libro) y anota el evento."""
+        libro = self.libros.get(isbn)
+        if not super().quitar_libro(isbn):
+            return False
+        return self._anotar_o_deshacer(lambda: self._alta_libro(libro), "quitar_libro", isbn)
+    
+    def registrar_usuario(self, id_usuario, nombre):
+        """Registra un usuario (ver Biblioteca.registrar_usuario) y anota el evento."""
+        if not super().registrar_usuario(id_usuario, nombre):
+            return False
+        return self._anotar_o_deshacer(
+            lambda: self._baja_usuario(self.usuarios[id_usuario]),
+            "registrar_usuario", id_usuario, nombre,
+        )
+    
+    def dar_baja_usuario(self, id_usuario):
+        """Da de baja un usuario (ver Biblioteca.dar_baja_usuario) y anota el evento."""
+        usuario = self.usuarios.get(id_usuario)
+        if not super().dar_baja_usuario(id_usuario):
+            return False
+        return self._anotar_o_deshacer(lambda: self._alta_usuario(usuario), "dar_baja_usuario", id_usuario)
+    
+    def prestar_libro(self, id_usuario, isbn):
+        """Presta un libro (ver Biblioteca.prestar_libro) y anota el evento."""
+        if not super().prestar_libro(id_usuario, isbn):
+            return False
+        return self._anotar_o_deshacer(
+            lambda: self._registrar_devolucion(self.usuarios[id_usuario], self.libros[isbn]),
+            "prestar_libro", id_usuario, isbn,
+        )
+    
+    def devolver_libro(self, id_usuario, isbn):
+        """Registra una devolución (ver Biblioteca.devolver_libro) y anota el evento."""
+        if not super().devolver_libro(id_usuario, isbn):
+            return False
+        return self._anotar_o_deshacer(
+            lambda: self._registrar_prestamo(self.usuarios[id_usuario], self.libros[isbn]),
+            "devolver_libro", id_usuario, isbn,
+        )
+    
+    def prestar_lote(self, prestamos, todo_o_nada=True):
+        """Presta un lote (ver Biblioteca.prestar_lote) y lo anota en una sola línea."""
+        resultados = super().prestar_lote(prestamos, todo_o_nada)
+        self._anotar_lote("prestar_lote", resultados, self._registrar_devolucion)
+        return resultados
+    
+    def devolver_lote(self, devoluciones, todo_o_nada=True):
+        """Devuelve un lote (ver Biblioteca.devolver_lote) y lo anota en una sola línea."""
+        resultados = super().devolver_lote(devoluciones, todo_o_nada)
+        self._anotar_lote("devolver_lote", resultados, self._registrar_prestamo)
+        return resultados
+    
+    def _anotar_lote(self, operacion, resultados, revertir):
+        """
+        Anota como un solo evento los pares de un lote que se aplicaron.
+        
+        Si no se puede anotar, revierte esos pares y los marca como fallidos.
+        
+        Args:
+            operacion (str): "prestar_lote" o "devolver_lote"
+            resultados (list): Resultados retornados por el lote
+            revertir (callable): Cambio interno inverso, recibe (usuario, libro)
+        """
+        aplicados = [r for r in resultados if r["exito"]]
+        if not aplicados:
+            return
+        
+        def deshacer():
+            for resultado in reversed(aplicados):
+                revertir(self.usuarios[resultado["id_usuario"]], self.libros[resultado["isbn"]])
+                resultado["exito"] = False
+                resultado["error"] = "No se pudo guardar el lote"
+        
+        pares = [[r["id_usuario"], r["isbn"]] for r in aplicados]
+        self._anotar_o_deshacer(deshacer, operacion, pares, cambios=len(pares))
+    
+    def _anotar_o_deshacer(self, deshacer, *evento, cambios=1):
+        """
+        Anota un cambio ya aplicado en memoria; si no se puede, lo deshace.
+        
+        Así la biblioteca en memoria nunca tiene cambios que no están en el
+        registro.
+        
+        Args:
+            deshacer (callable): Revierte el cambio en memoria
+            *evento: Nombre de la operación seguido de sus argumentos
+            cambios (int): Cambios que contiene el evento
+            
+        Returns:
+            bool: True si el evento quedó anotado, False si se deshizo
+        """
+        try:
+            self._anotar(*evento, cambios=cambios)
+        except OSError as error:
+            deshacer()
+            print(f"❌ Error: No se pudo guardar el cambio, se deshizo: {error}")
+            return False
+        if self._eventos_en_registro >= self.eventos_por_compactacion:
+            self.compactar(esperar=not self._compactar_en_segundo_plano)
+        return True
+    
+    def _anotar(self, *evento, cambios=1):
+        """
+        Anexa un evento al registro.
+        
+        Si la escritura falla, el registro se recorta al final del último
+        evento completo: una línea a medias quedaría pegada a la siguiente y
+        al reabrir se descartarían las dos junto con todo lo posterior.
+        
+        Args:
+            *evento: Nombre de la operación seguido de sus argumentos
+            cambios (int): Cambios que contiene el evento, para decidir
+                cuándo compactar
+                
+        Raises:
+            OSError: Si no se pudo escribir el evento
+        """
+        linea = (json.dumps(evento, ensure_ascii=False) + "\n").encode("utf-8")
+        try:
+            escritos = 0
+            while escritos < len(linea):
+                escritos += self._registro.write(linea[escritos:])
+            if self._sincronizar:
+                os.fsync(self._registro.fileno())
+        except OSError:
+            try:
+                self._registro.truncate(self._fin_registro)
+            except OSError:
+                # Al reabrir, _reproducir descarta la línea incompleta.
+                pass
+            raise
+        self._fin_registro += len(linea)
+        self._eventos_en_registro += cambios
+    
+    def _abrir_registro(self):
+        """Abre el registro de la generación actual para anexar, sin búfer."""
+        # Sin búfer, una escritura fallida no queda pendiente para la siguiente.
+        self._registro = open(self._ruta_registro(self._generacion), "ab", buffering=0)
+        self._fin_registro = os.fstat(self._registro.fileno()).st_size
+    
+    # ==================== COMPACTACIÓN ====================
+    
+    def compactar(self, esperar=True):
+        """
+        Rehace la instantánea con el estado actual y empieza un registro nuevo.
+        
+        Args:
+            esperar (bool): Si False, la instantánea se escribe en un hilo en
+                segundo plano; si ya hay una compactación en curso no se
+                inicia otra
+                
+        Returns:
+            bool: True si se inició la compactación, False si había otra en curso
+        """
+        if self._hilo_compactacion is not None and self._hilo_compactacion.is_alive():
+            if not esperar:
+                return False
+            self._hilo_compactacion.join()
+        
+        # Copias superficiales: los datos de libros y usuarios que se guardan
+        # no cambian, y así el hilo no lee colecciones que se están modificando.
+        estado = (
+            list(self._isbns_en_orden()),
+            dict(self.libros),
+            list(self._ids_usuarios_en_orden()),
+            dict(self.usuarios),
+            list(self._prestatarios.items()),
+        )
+        self._registro.close()
+        self._generacion += 1
+        self._abrir_registro()
+        self._eventos_en_registro = 0
+        
+        if esperar:
+            self._escribir_instantanea(estado, self._generacion)
+        else:
+            self._hilo_compactacion = threading.Thread(
+                target=self._escribir_instantanea,
+                args=(estado, self._generacion),
+                name="biblioteca-compactacion",
+                daemon=True,
+            )
+            self._hilo_compactacion.start()
+        return True
+    
+    def _escribir_instantanea(self, estado, generacion):
+        """
+        Escribe la instantánea de forma atómica y borra los registros que ya incluye.
+        
+        Args:
+            estado (tuple): Copia tomada por compactar
+            generacion (int): Primera generación de eventos que la instantánea no incluye
+        """
+        isbns, libros, ids_usuarios, usuarios, prestamos = estado
+        datos = {
+            "version": 1,
+            "generacion": generacion,
+            # En orden de ISBN e ID: al cargar, los diccionarios quedan en ese
+            # orden y armar las listas para paginar no tiene que reordenar.
+            "libros": [
+                [isbn, libros[isbn].titulo, libros[isbn].autor, libros[isbn].categoria]
+                for isbn in isbns
+            ],
+            "usuarios": [[id_usuario, usuarios[id_usuario].nombre] for id_usuario in ids_usuarios],
+            "prestamos": prestamos,
+        }
+        ruta = os.path.join(self.directorio, self.ARCHIVO_INSTANTANEA)
+        try:
+            with open(ruta + ".tmp", "w", encoding="utf-8") as archivo:
+                json.dump(datos, archivo, ensure_ascii=False)
+                archivo.flush()
+                os.fsync(archivo.fileno())
+            os.replace(ruta + ".tmp", ruta)
+            for anterior in self._generaciones_en_disco():
+                if anterior < generacion:
+                    os.remove(self._ruta_registro(anterior))
+        except OSError as error:
+            # Los registros siguen en disco: no se pierde ningún cambio.
+            self.error_compactacion = error
+            print(f"❌ Error: No se pudo compactar la biblioteca: {error}")
+    
+    # ==================== CARGA ====================
+    
+    def _cargar(self):
+        """
+        Reconstruye la biblioteca desde la instantánea y los registros de eventos.
+        
+        Returns:
+            tuple: (generación del registro actual, eventos que contiene)
+        """
+        generacion = 0
+        ruta = os.path.join(self.directorio, self.ARCHIVO_INSTANTANEA)
+        if os.path.exists(ruta):
+            with open(ruta, "r", encoding="utf-8") as archivo:
+                datos = json.load(archivo)
+            generacion = datos["generacion"]
+            for isbn, titulo, autor, categoria in datos["libros"]:
+                self._alta_libro(Libro(titulo, autor, categoria, isbn))
+            for id_usuario, nombre in datos["usuarios"]:
+                self._alta_usuario(Usuario(id_usuario, nombre))
+            for isbn, id_usuario in datos["prestamos"]:
+                self._registrar_prestamo(self.usuarios[id_usuario], self.libros[isbn])
+        
+        eventos = 0
+        for anterior in self._generaciones_en_disco():
+            if anterior < generacion:
+                # Quedó de una compactación interrumpida: ya está en la instantánea.
+                os.remove(self._ruta_registro(anterior))
+            else:
+                eventos = self._reproducir(anterior)
+                generacion = anterior
+        return generacion, eventos
+    
+    def _reproducir(self, generacion):
+        """
+        Aplica los eventos de un registro.
+        
+        Una última línea incompleta (escritura interrumpida) se descarta y se
+        recorta del archivo para que los eventos nuevos no queden detrás.
+        Cada evento termina en un salto de línea, así que una línea sin él
+        cuenta como incompleta aunque su JSON sea válido.
+        
+        Returns:
+            int: Cantidad de cambios aplicados (un lote cuenta cada par)
+        """
+        ruta = self._ruta_registro(generacion)
+        eventos = 0
+        valido_hasta = 0
+        with open(ruta, "rb") as archivo:
+            for linea in archivo:
+                if not linea.endswith(b"\n"):
+                    # Se cortó antes del salto de línea: no se sabe si terminó.
+                    break
+                try:
+                    evento = json.loads(linea)
+                except ValueError:
+                    break
+                eventos += self._aplicar_evento(evento)
+                valido_hasta += len(linea)
+        if valido_hasta < os.path.getsize(ruta):
+            with open(ruta, "r+b") as archivo:
+                archivo.truncate(valido_hasta)
+        return eventos
+    
+    def _aplicar_evento(self, evento):
+        """
+        Aplica un evento ya validado cuando ocurrió, sin volver a anotarlo.
+        
+        Returns:
+            int: Cantidad de cambios que contenía el evento
+        """
+        operacion, *argumentos = evento
+        if operacion == "agregar_libro":
+            titulo, autor, categoria, isbn = argumentos
+            self._alta_libro(Libro(titulo, autor, categoria, isbn))
+        elif operacion == "quitar_libro":
+            self._baja_libro(self.libros[argumentos[0]])
+        elif operacion == "registrar_usuario":
+            self._alta_usuario(Usuario(*argumentos))
+        elif operacion == "dar_baja_usuario":
+            self._baja_usuario(self.usuarios[argumentos[0]])
+        elif operacion == "prestar_libro":
+            id_usuario, isbn = argumentos
+            self._registrar_prestamo(self.usuarios[id_usuario], self.libros[isbn])
+        elif operacion == "devolver_libro":
+            id_usuario, isbn = argumentos
+            self._registrar_devolucion(self.usuarios[id_usuario], self.libros[isbn])
+        elif operacion == "prestar_lote":
+            for id_usuario, isbn in argumentos[0]:
+                self._registrar_prestamo(self.usuarios[id_usuario], self.libros[isbn])
+            return len(argumentos[0])
+        elif operacion == "devolver_lote":
+            for id_usuario, isbn in argumentos[0]:
+                self._registrar_devolucion(self.usuarios[id_usuario], self.libros[isbn])
+            return len(argumentos[0])
+        else:
+            raise ValueError(f"Evento desconocido en el registro: {operacion}")
+        return 1
+    
+    def _ruta_registro(self, generacion):
+        """Retorna la ruta del registro de eventos de una generación."""
+        return os.path.join(self.directorio, f"eventos.{generacion}.log")
+    
+    def _generaciones_en_disco(self):
+        """Retorna, en orden, las generaciones que tienen registro de eventos."""
+        return sorted(
+            int(coincidencia.group(1))
+            for coincidencia in map(_REGISTRO.match, os.listdir(self.directorio))
+            if coincidencia
+        )
@@ -2,8 +2,12 @@
 Pruebas unitarias para el Sistema de Gestión de Biblioteca Digital
 """
 
+import os
+import tempfile
 import unittest
+from unittest import mock
 from biblioteca import Libro, Usuario, Biblioteca
+from persistencia import BibliotecaPersistente
 
 
 class TestLibro(unittest.TestCase):
@@ -80,6 +84,13 @@ class TestUsuario(unittest.TestCase):
         self.usuario.agregar_prestamo("978-8498385762")
         self.usuario.agregar_prestamo("978-8445076330")
         self.assertEqual(len(self.usuario.libros_prestados), 3)
+    
+    def test_prestamos_conservan_orden(self):
+        """Prueba que los préstamos conservan su orden tras devolver uno."""
+        for isbn in ("978-8498385755", "978-8498385762", "978-8445076330"):
+            self.usuario.agregar_prestamo(isbn)
+        self.usuario.devolver_libro("978-8498385762")
+        self.assertEqual(list(self.usuario.libros_prestados), ["978-8498385755", "978-8445076330"])
 
 
 class TestBiblioteca(unittest.TestCase):
@@ -157,11 +168,61 @@ class TestBiblioteca(unittest.TestCase):
         self.assertTrue(self.biblioteca.libros["978-8498385755"].disponible)
         self.assertNotIn("978-8498385755", self.biblioteca.usuarios["U001"].libros_prestados)
     
+    def test_obtener_prestatario(self):
+        """Prueba el índice inverso ISBN -> usuario que tiene el libro."""
+        self.assertIsNone(self.biblioteca.obtener_prestatario("978-8498385755"))
+        self.biblioteca.prestar_libro("U001", "978-8498385755")
+        self.assertEqual(self.biblioteca.obtener_prestatario("978-8498385755").id_usuario, "U001")
+        # Otro usuario no puede devolver un libro que no tiene
+        self.assertFalse(self.biblioteca.devolver_libro("U002", "978-8498385755"))
+        self.assertTrue(self.biblioteca.devolver_libro("U001", "978-8498385755"))
+        self.assertIsNone(self.biblioteca.obtener_prestatario("978-8498385755"))
+        self.assertIsNone(self.biblioteca.obtener_prestatario("978-0000000000"))
+    
     def test_devolver_libro_no_prestado(self):
         """Prueba devolver un libro que el usuario no tiene prestado."""
         resultado = self.biblioteca.devolver_libro("U001", "978-8498385755")
         self.assertFalse(resultado)
     
+    def test_prestar_y_devolver_lote(self):
+        """Prueba que sin todo_o_nada un lote aplica los pares válidos y reporta cada error."""
+        resultados = self.biblioteca.prestar_lote([
+            ("U001", "978-8498385755"),
+            ("U002", "978-8498385755"),
+            ("U999", "978-8499896755"),
+            ("U002", "978-8499896755"),
+        ], todo_o_nada=False)
+        self.assertEqual([r["exito"] for r in resultados], [True, False, False, True])
+        self.assertIn("ya aparece antes en el lote", resultados[1]["error"])
+        self.assertIn("U999", resultados[2]["error"])
+        self.assertIsNone(resultados[3]["error"])
+        self.assertEqual(self.biblioteca.obtener_prestatario("978-8499896755").id_usuario, "U002")
+        self.assertEqual(self.biblioteca.obtener_estadisticas()['libros_disponibles'], 0)
+        
+        resultados = self.biblioteca.devolver_lote([
+            ("U002", "978-8498385755"),
+            ("U001", "978-8498385755"),
+            ("U002", "978-8499896755"),
+        ], todo_o_nada=False)
+        self.assertEqual([r["exito"] for r in resultados], [False, True, True])
+        self.assertEqual(self.biblioteca.obtener_estadisticas()['libros_disponibles'], 2)
+        self.assertFalse(self.biblioteca.usuarios["U001"].tiene_prestamos())
+    
+    def test_lote_todo_o_nada(self):
+        """Prueba que por defecto un solo error cancela el lote completo."""
+        resultados = self.biblioteca.prestar_lote(
+            [("U001", "978-8498385755"), ("U002", "978-9999999999")]
+        )
+        self.assertFalse(any(r["exito"] for r in resultados))
+        self.assertIn("lote tiene errores", resultados[0]["error"])
+        self.assertTrue(self.biblioteca.libros["978-8498385755"].disponible)
+        
+        resultados = self.biblioteca.prestar_lote(
+            [("U001", "978-8498385755"), ("U002", "978-8499896755")]
+        )
+        self.assertTrue(all(r["exito"] for r in resultados))
+        self.assertEqual(self.biblioteca.obtener_estadisticas()['libros_prestados'], 2)
+    
     def test_buscar_por_titulo(self):
         """Prueba buscar libros por título."""
         resultados = self.biblioteca.buscar_por_titulo("Harry")
@@ -180,6 +241,29 @@ class TestBiblioteca(unittest.TestCase):
         self.assertEqual(len(resultados), 1)
         self.assertEqual(resultados[0].titulo, "1984")
     
+    def test_buscar_parcial_sin_mayusculas(self):
+        """Prueba que las búsquedas encuentran fragmentos y solo ignoran mayúsculas."""
+        self.biblioteca.agregar_libro("Harry Potter y la cámara secreta", "J.K. Rowling", "Fantasía", "978-8498382679")
+        isbns = [libro.isbn for libro in self.biblioteca.buscar_por_titulo("OTTER")]
+        self.assertEqual(isbns, ["978-8498382679", "978-8498385755"])
+        self.assertEqual(len(self.biblioteca.buscar_por_titulo("CÁMARA sec")), 1)
+        self.assertEqual(self.biblioteca.buscar_por_titulo("camara sec"), [])
+        self.assertEqual(self.biblioteca.buscar_por_titulo("potter harry"), [])
+        self.assertEqual(len(self.biblioteca.buscar_por_titulo("98")), 1)
+        self.assertEqual(len(self.biblioteca.buscar_por_autor("k. row")), 2)
+        self.assertEqual(len(self.biblioteca.buscar_por_categoria("FANTASÍA")), 2)
+        self.assertEqual(self.biblioteca.buscar_por_categoria("fantasia"), [])
+        self.assertEqual(len(self.biblioteca.buscar_por_categoria("ficción")), 1)
+    
+    def test_buscar_tras_quitar_libro(self):
+        """Prueba que los índices de búsqueda se actualizan al quitar un libro."""
+        self.biblioteca.quitar_libro("978-8499896755")
+        self.assertEqual(self.biblioteca.buscar_por_titulo("1984"), [])
+        self.assertEqual(self.biblioteca.buscar_por_autor("Orwell"), [])
+        self.assertEqual(self.biblioteca.buscar_por_categoria("Ciencia Ficción"), [])
+        self.biblioteca.agregar_libro("Rebelión en la granja", "George Orwell", "Sátira", "978-8499890951")
+        self.assertEqual(len(self.biblioteca.buscar_por_autor("Orwell")), 1)
+    
     def test_buscar_sin_resultados(self):
         """Prueba buscar con criterios que no retornen resultados."""
         resultados = self.biblioteca.buscar_por_titulo("Inexistente")
@@ -199,6 +283,76 @@ class TestBiblioteca(unittest.TestCase):
         self.assertEqual(len(libros_disponibles), 1)
         self.assertEqual(libros_disponibles[0].isbn, "978-8499896755")
     
+    def test_disponibles_al_prestar_devolver_y_quitar(self):
+        """Prueba que el conjunto de disponibles sigue a préstamos, devoluciones y bajas."""
+        self.biblioteca.agregar_libro("Fundación", "Isaac Asimov", "Ciencia Ficción", "978-8435906228")
+        self.biblioteca.prestar_libro("U001", "978-8498385755")
+        self.biblioteca.prestar_libro("U002", "978-8499896755")
+        self.biblioteca.prestar_libro("U002", "978-8499896755")  # Ya prestado: no cambia nada
+        self.assertEqual(self.biblioteca.obtener_estadisticas()['libros_disponibles'], 1)
+        self.biblioteca.devolver_libro("U001", "978-8498385755")
+        self.biblioteca.quitar_libro("978-8435906228")
+        disponibles = [libro.isbn for libro in self.biblioteca.listar_todos_libros(solo_disponibles=True)]
+        self.assertEqual(disponibles, ["978-8498385755"])
+        esperados = sum(1 for libro in self.biblioteca.libros.values() if libro.disponible)
+        stats = self.biblioteca.obtener_estadisticas()
+        self.assertEqual(stats['libros_disponibles'], esperados)
+        self.assertEqual(stats['libros_prestados'], 1)
+    
+    def test_paginas_de_libros_por_isbn(self):
+        """Prueba que las páginas siguen el orden por ISBN aunque cambie la colección."""
+        self.biblioteca.agregar_libro("Fundación", "Isaac Asimov", "Ciencia Ficción", "978-8435906228")
+        libros, cursor = self.biblioteca.obtener_pagina_libros(tamano=2)
+        self.assertEqual([libro.isbn for libro in libros], ["978-8435906228", "978-8498385755"])
+        self.assertEqual(cursor, "978-8498385755")
+        self.biblioteca.quitar_libro("978-8499896755")
+        self.biblioteca.agregar_libro("Dune", "Frank Herbert", "Ciencia Ficción", "978-8499992921")
+        libros, cursor = self.biblioteca.obtener_pagina_libros(tamano=2, cursor=cursor)
+        self.assertEqual([libro.isbn for libro in libros], ["978-8499992921"])
+        self.assertIsNone(cursor)
+    
+    def test_paginas_tras_altas_desordenadas(self):
+        """Prueba que las altas antes y después de la primera página quedan en orden."""
+        for isbn in ("978-9000000003", "978-1000000001"):
+            self.biblioteca.agregar_libro("Libro", "Autor", "Varios", isbn)
+        self.biblioteca.obtener_pagina_libros(tamano=1)
+        for isbn in ("978-9000000009", "978-5000000005", "978-0000000000"):
+            self.biblioteca.agregar_libro("Libro", "Autor", "Varios", isbn)
+        isbns = [libro.isbn for libro in self.biblioteca.iterar_libros(tamano_pagina=2)]
+        self.assertEqual(isbns, sorted(self.biblioteca.libros))
+        self.assertEqual(len(isbns), 7)
+    
+    def test_paginas_de_libros_disponibles(self):
+        """Prueba que el filtro de disponibles no deja páginas vacías al final."""
+        self.biblioteca.prestar_libro("U001", "978-8499896755")
+        libros, cursor = self.biblioteca.obtener_pagina_libros(tamano=1, solo_disponibles=True)
+        self.assertEqual([libro.isbn for libro in libros], ["978-8498385755"])
+        self.assertIsNone(cursor)
+        self.assertEqual(len(list(self.biblioteca.iterar_libros(tamano_pagina=1))), 2)
+    
+    def test_disponibles_en_orden_de_catalogo_y_por_isbn(self):
+        """Prueba que el listado sigue el catálogo y las páginas solo ven disponibles."""
+        self.biblioteca.agregar_libro("Fundación", "Isaac Asimov", "Ciencia Ficción", "978-8435906228")
+        self.biblioteca.obtener_pagina_libros(tamano=1, solo_disponibles=True)
+        self.biblioteca.prestar_libro("U001", "978-8498385755")
+        self.biblioteca.prestar_libro("U002", "978-8435906228")
+        self.biblioteca.devolver_libro("U001", "978-8498385755")
+        disponibles = [libro.isbn for libro in self.biblioteca.listar_todos_libros(solo_disponibles=True)]
+        self.assertEqual(disponibles, ["978-8498385755", "978-8499896755"])
+        self.assertEqual(self.biblioteca._isbns_disponibles_ordenados, ["978-8498385755", "978-8499896755"])
+        isbns = [libro.isbn for libro in self.biblioteca.iterar_libros(solo_disponibles=True, tamano_pagina=1)]
+        self.assertEqual(isbns, ["978-8498385755", "978-8499896755"])
+
+    def test_iterar_usuarios(self):
+        """Prueba recorrer los usuarios por ID de a una página."""
+        self.biblioteca.registrar_usuario("U000", "Ana Pérez")
+        ids = [usuario.id_usuario for usuario in self.biblioteca.iterar_usuarios(tamano_pagina=2)]
+        self.assertEqual(ids, ["U000", "U001", "U002"])
+        self.biblioteca.dar_baja_usuario("U000")
+        usuarios, cursor = self.biblioteca.obtener_pagina_usuarios(tamano=5)
+        self.assertEqual([usuario.id_usuario for usuario in usuarios], ["U001", "U002"])
+        self.assertIsNone(cursor)
+    
     def test_dar_baja_usuario_exitoso(self):
         """Prueba dar de baja a un usuario sin préstamos."""
         resultado = self.biblioteca.dar_baja_usuario("U002")
@@ -222,5 +376,118 @@ class TestBiblioteca(unittest.TestCase):
         self.assertEqual(stats['total_usuarios'], 2)
 
 
+
+class TestBibliotecaPersistente(unittest.TestCase):
+    """Pruebas para la biblioteca guardada en disco."""
+    
+    def setUp(self):
+        """Crea un directorio temporal para los datos."""
+        self._temporal = tempfile.TemporaryDirectory()
+        self.directorio = self._temporal.name
+    
+    def tearDown(self):
+        """Borra el directorio temporal."""
+        self._temporal.cleanup()
+    
+    def _llenar(self, biblioteca):
+        """Agrega libros, usuarios y préstamos de ejemplo."""
+        biblioteca.agregar_libro("Harry Potter", "J.K. Rowling", "Fantasía", "978-8498385755")
+        biblioteca.agregar_libro("1984", "George Orwell", "Ciencia Ficción", "978-8499896755")
+        biblioteca.agregar_libro("Fundación", "Isaac Asimov", "Ciencia Ficción", "978-8435906228")
+        biblioteca.registrar_usuario("U001", "Juan García")
+        biblioteca.registrar_usuario("U002", "María López")
+        biblioteca.prestar_libro("U001", "978-8498385755")
+        biblioteca.prestar_libro("U002", "978-8499896755")
+        biblioteca.devolver_libro("U002", "978-8499896755")
+        biblioteca.quitar_libro("978-8435906228")
+        biblioteca.dar_baja_usuario("U002")
+    
+    def _comprobar(self, biblioteca):
+        """Verifica el estado que deja _llenar."""
+        self.assertEqual(sorted(biblioteca.libros), ["978-8498385755", "978-8499896755"])
+        self.assertEqual(list(biblioteca.usuarios), ["U001"])
+        self.assertEqual(biblioteca.obtener_prestatario("978-8498385755").id_usuario, "U001")
+        self.assertEqual(biblioteca.obtener_estadisticas()['libros_disponibles'], 1)
+        self.assertEqual(len(biblioteca.buscar_por_autor("orwell")), 1)
+    
+    def test_recupera_datos_desde_el_registro(self):
+        """Prueba que al reabrir se reproducen los eventos del registro."""
+        with BibliotecaPersistente(self.directorio) as biblioteca:
+            self._llenar(biblioteca)
+        with BibliotecaPersistente(self.directorio) as biblioteca:
+            self._comprobar(biblioteca)
+    
+    def test_compactacion_en_segundo_plano(self):
+        """Prueba que la instantánea reemplaza a los registros que ya contiene."""
+        with BibliotecaPersistente(self.directorio, eventos_por_compactacion=4) as biblioteca:
+            self._llenar(biblioteca)
+            biblioteca.compactar(esperar=False)
+            biblioteca.prestar_libro("U001", "978-8499896755")
+            biblioteca.devolver_libro("U001", "978-8499896755")
+        self.assertIn("biblioteca.json", os.listdir(self.directorio))
+        registros = [nombre for nombre in os.listdir(self.directorio) if nombre.endswith(".log")]
+        self.assertEqual(len(registros), 1)
+        with BibliotecaPersistente(self.directorio) as biblioteca:
+            self._comprobar(biblioteca)
+            self.assertIsNone(biblioteca.error_compactacion)
+    
+    def test_descarta_evento_incompleto(self):
+        """Prueba que una última línea cortada del registro se ignora."""
+        with BibliotecaPersistente(self.directorio) as biblioteca:
+            self._llenar(biblioteca)
+        with open(os.path.join(self.directorio, "eventos.0.log"), "a", encoding="utf-8") as registro:
+            registro.write('["prestar_libro", "U0')
+        with BibliotecaPersistente(self.directorio) as biblioteca:
+            self._comprobar(biblioteca)
+            biblioteca.registrar_usuario("U003", "Carlos Rodríguez")
+        with BibliotecaPersistente(self.directorio) as biblioteca:
+            self.assertIn("U003", biblioteca.usuarios)
+    
+    def test_descarta_evento_sin_salto_de_linea(self):
+        """Prueba que una última línea completa pero sin salto de línea se recorta."""
+        with BibliotecaPersistente(self.directorio) as biblioteca:
+            self._llenar(biblioteca)
+        with open(os.path.join(self.directorio, "eventos.0.log"), "a", encoding="utf-8") as registro:
+            registro.write('["registrar_usuario", "U004", "Ana Pérez"]')
+        with BibliotecaPersistente(self.directorio) as biblioteca:
+            self._comprobar(biblioteca)
+            biblioteca.registrar_usuario("U003", "Carlos Rodríguez")
+        with BibliotecaPersistente(self.directorio) as biblioteca:
+            self.assertEqual(list(biblioteca.usuarios), ["U001", "U003"])
+    
+    def test_escritura_fallida_no_deja_cambios(self):
+        """Prueba que un evento que no se pudo anotar se deshace y se recorta del registro."""
+        with BibliotecaPersistente(self.directorio, sincronizar=True) as biblioteca:
+            self._llenar(biblioteca)
+            with mock.patch("persistencia.os.fsync", side_effect=OSError("disco lleno")):
+                self.assertFalse(biblioteca.prestar_libro("U001", "978-8499896755"))
+                resultados = biblioteca.devolver_lote([("U001", "978-8498385755")])
+            self.assertFalse(resultados[0]["exito"])
+            self._comprobar(biblioteca)
+            biblioteca.registrar_usuario("U003", "Carlos Rodríguez")
+        with BibliotecaPersistente(self.directorio) as biblioteca:
+            self.assertEqual(list(biblioteca.usuarios), ["U001", "U003"])
+            self.assertTrue(biblioteca.libros["978-8499896755"].disponible)
+            self.assertEqual(biblioteca.obtener_prestatario("978-8498385755").id_usuario, "U001")
+    
+    def test_lote_en_una_linea(self):
+        """Prueba que un lote se anota en una sola línea y se recupera al reabrir."""
+        with BibliotecaPersistente(self.directorio) as biblioteca:
+            self._llenar(biblioteca)
+            biblioteca.registrar_usuario("U003", "Carlos Rodríguez")
+            biblioteca.devolver_lote([("U001", "978-8498385755")])
+            biblioteca.prestar_lote([
+                ("U003", "978-8498385755"),
+                ("U001", "978-8499896755"),
+                ("U003", "978-9999999999"),
+            ], todo_o_nada=False)
+        with open(os.path.join(self.directorio, "eventos.0.log"), encoding="utf-8") as registro:
+            self.assertIn("prestar_lote", registro.readlines()[-1])
+        with BibliotecaPersistente(self.directorio) as biblioteca:
+            self.assertEqual(biblioteca.obtener_prestatario("978-8498385755").id_usuario, "U003")
+            self.assertEqual(biblioteca.obtener_prestatario("978-8499896755").id_usuario, "U001")
+            self.assertEqual(biblioteca.obtener_estadisticas()['libros_disponibles'], 0)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -6,25 +6,29 @@ from producto import Producto
 
 
 class Inventario:
-    """Gestiona la lista de productos y las operaciones del inventario."""
+    """Gestiona la colección de productos y las operaciones del inventario.
+
+    Los productos se guardan en un diccionario ID -> producto, que conserva
+    el orden en que se agregaron, para que buscar, agregar y eliminar por ID
+    cuesten O(1) sin alterar el orden del listado.
+    """
 
     def __init__(self):
-        """Inicializa el inventario con una lista vacía de productos."""
-        self._productos = []
+        """Inicializa el inventario sin productos."""
+        self._productos = {}
 
     def agregar_producto(self, producto):
         """Agrega un producto si el ID es único. Devuelve True si agrega, False si existe."""
         if self._buscar_por_id(producto.get_id()) is not None:
             return False
-        self._productos.append(producto)
+        self._productos[producto.get_id()] = producto
         return True
 
     def eliminar_producto(self, producto_id):
         """Elimina un producto por ID. Devuelve True si elimina, False si no existe."""
-        producto = self._buscar_por_id(producto_id)
-        if producto is None:
+        if self._buscar_por_id(producto_id) is None:
             return False
-        self._productos.remove(producto)
+        del self._productos[producto_id]
         return True
 
     def actualizar_producto(self, producto_id, nueva_cantidad=None, nuevo_precio=None):
@@ -42,18 +46,15 @@ class Inventario:
         """Busca productos por nombre con coincidencia parcial e insensible a mayúsculas."""
         nombre_normalizado = nombre.strip().lower()
         resultados = []
-        for producto in self._productos:
+        for producto in self._productos.values():
             if nombre_normalizado in producto.get_nombre().lower():
                 resultados.append(producto)
         return resultados
 
     def mostrar_todos(self):
         """Devuelve una lista con todos los productos en el inventario."""
-        return list(self._productos)
+        return list(self._productos.values())
 
     def _buscar_por_id(self, producto_id):
         """Busca un producto por ID y lo devuelve o None si no existe."""
-        for producto in self._productos:
-            if producto.get_id() == producto_id:
-                return producto
-        return None
+        return self._productos.get(producto_id)